@@ -1,8 +1,15 @@
 """
 Async authentication utilities for HR Onboarding System
 """
+import asyncio
+import hashlib
+import multiprocessing
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
@@ -12,6 +19,9 @@ from sqlmodel import select
 from .database import get_async_session
 from .models import UserModel
 from .core.enums import UserRole
+from .core.cache import TTLCache
+from .core.executor import BoundedExecutor, ExecutorSaturatedError
+from .core.revocation import TokenRevocationList
 import os
 from dotenv import load_dotenv
 
@@ -21,13 +31,98 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+REVOCATION_SYNC_SECONDS = int(os.getenv("REVOCATION_SYNC_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "4096"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", "4"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+PASSWORD_HASH_RETRY_AFTER_SECONDS = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", "1"))
+PASSWORD_HASH_PROCESSES = int(os.getenv("PASSWORD_HASH_PROCESSES", str(os.cpu_count() or 2)))
+
+# Claims-only mode authorizes from verified token claims without loading the user row
+AUTH_CLAIMS_ONLY = os.getenv("AUTH_CLAIMS_ONLY", "false").lower() in ("1", "true", "yes")
+CLAIMS_ONLY_TOKEN_EXPIRE_MINUTES = int(os.getenv("CLAIMS_ONLY_TOKEN_EXPIRE_MINUTES", "5"))
+
+# Claims are trusted until expiry, so keep tokens short-lived in claims-only mode
+ACCESS_TOKEN_LIFETIME = timedelta(
+    minutes=CLAIMS_ONLY_TOKEN_EXPIRE_MINUTES if AUTH_CLAIMS_ONLY else ACCESS_TOKEN_EXPIRE_MINUTES
+)
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is CPU-bound (~250 ms per call) - keep it off the event loop
+password_executor = BoundedExecutor(
+    "password-hash",
+    max_workers=PASSWORD_HASH_CONCURRENCY,
+    max_queue=PASSWORD_HASH_MAX_QUEUE
+)
+
+# Process pool for bulk hashing (e.g. employee imports), created on first use
+_password_process_pool: Optional[ProcessPoolExecutor] = None
+
 # JWT Bearer token
 security = HTTPBearer()
 
+# Authenticated user snapshots keyed by the token subject - saves a DB round trip per request
+principal_cache = TTLCache(max_size=PRINCIPAL_CACHE_MAX_SIZE, ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS)
+
+# Verified token payloads keyed by a digest of the raw token. Only tokens that pass
+# signature verification are stored, so random garbage tokens cannot fill it.
+token_cache = TTLCache(max_size=TOKEN_CACHE_MAX_SIZE, ttl_seconds=TOKEN_CACHE_TTL_SECONDS)
+
+# Token types carried in the "type" claim
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+# Denylist rows of this type revoke every token issued to a user before `revoked_at`
+USER_REVOCATION_TYPE = "user"
+
+# Revoked token ids and users whose outstanding tokens were revoked
+revocation_list = TokenRevocationList(
+    max_token_lifetime_seconds=max(
+        ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        CLAIMS_ONLY_TOKEN_EXPIRE_MINUTES * 60,
+        REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    )
+)
+
+
+@dataclass(frozen=True)
+class TokenPrincipal:
+    """Identity and role of the caller, as needed for authorization"""
+    id: str
+    role: UserRole
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    Immutable snapshot of the authenticated user's row (without the password hash).
+    One instance is cached and shared by concurrent requests, so it must not change.
+    """
+    id: str
+    name: str
+    email: str
+    role: UserRole
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_model(cls, user: UserModel) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            updated_at=user.updated_at
+        )
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -39,23 +134,106 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_password_job(fn, *args):
+    """Run password work on the bounded executor, shedding load when saturated"""
+    try:
+        return await password_executor.run(fn, *args)
+    except ExecutorSaturatedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+        )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop"""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await _run_password_job(get_password_hash, password)
+
+
+def _hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords - runs inside a worker process"""
+    return [get_password_hash(password) for password in passwords]
+
+
+async def hash_passwords_bulk(passwords: List[str]) -> List[str]:
+    """Hash many passwords in parallel across a process pool, preserving order"""
+    global _password_process_pool
+    if not passwords:
+        return []
+    if _password_process_pool is None:
+        _password_process_pool = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    
+    chunk_size = -(-len(passwords) // PASSWORD_HASH_PROCESSES)
+    loop = asyncio.get_running_loop()
+    chunks = await asyncio.gather(*[
+        loop.run_in_executor(_password_process_pool, _hash_passwords, passwords[i:i + chunk_size])
+        for i in range(0, len(passwords), chunk_size)
+    ])
+    return [password_hash for chunk in chunks for password_hash in chunk]
+
+
+def shutdown_password_workers() -> None:
+    """Stop the password thread pool and bulk hashing processes"""
+    global _password_process_pool
+    password_executor.shutdown()
+    if _password_process_pool is not None:
+        _password_process_pool.shutdown(wait=True)
+        _password_process_pool = None
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
+    issued_at = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = issued_at + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = issued_at + ACCESS_TOKEN_LIFETIME
     
-    to_encode.update({"exp": expire})
+    to_encode.update({
+        "exp": expire,
+        "iat": issued_at,
+        "jti": uuid.uuid4().hex,
+        "type": ACCESS_TOKEN_TYPE
+    })
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def create_refresh_token(data: dict) -> str:
+    """Create long-lived JWT refresh token used to obtain new access tokens"""
+    to_encode = data.copy()
+    issued_at = datetime.utcnow()
+    to_encode.update({
+        "exp": issued_at + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        "iat": issued_at,
+        "jti": uuid.uuid4().hex,
+        "type": REFRESH_TOKEN_TYPE
+    })
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
 def verify_token(token: str) -> dict:
     """Verify JWT token and return payload"""
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(cache_key)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Never serve a cached payload past the token's own expiry
+        if "exp" in payload:
+            token_cache.set(cache_key, payload, ttl_seconds=payload["exp"] - time.time())
         return payload
     except JWTError:
         raise HTTPException(
@@ -65,13 +243,27 @@ def verify_token(token: str) -> dict:
         )
 
 
+def _get_token_subject(payload: dict, token_type: str = ACCESS_TOKEN_TYPE) -> str:
+    """Extract the subject from a verified payload, rejecting revoked tokens"""
+    user_id: str = payload.get("sub")
+    # Tokens issued before refresh support carry no type and are access tokens
+    if payload.get("type", ACCESS_TOKEN_TYPE) != token_type:
+        user_id = None
+    if user_id is None or revocation_list.is_revoked(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+    return user_id
+
+
 async def authenticate_user(session: AsyncSession, email: str, password: str) -> Optional[UserModel]:
     """Authenticate user with email and password"""
     statement = select(UserModel).where(UserModel.email == email, UserModel.is_active == True)
     result = await session.execute(statement)
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(password, user.password_hash):
+    if not user or not await verify_password_async(password, user.password_hash):
         return None
     return user
 
@@ -79,17 +271,15 @@ async def authenticate_user(session: AsyncSession, email: str, password: str) ->
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     session: AsyncSession = Depends(get_async_session)
-) -> UserModel:
-    """Get current authenticated user"""
+) -> CurrentUser:
+    """Get a snapshot of the current authenticated user"""
     token = credentials.credentials
     payload = verify_token(token)
+    user_id = _get_token_subject(payload)
     
-    user_id: str = payload.get("sub")
-    if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
-        )
+    user = principal_cache.get(user_id)
+    if user is not None:
+        return user
     
     statement = select(UserModel).where(UserModel.id == user_id, UserModel.is_active == True)
     result = await session.execute(statement)
@@ -101,16 +291,76 @@ async def get_current_user(
             detail="User not found"
         )
     
-    return user
+    # A frozen copy, not the ORM instance: it outlives this session and is shared
+    current_user = CurrentUser.from_model(user)
+    principal_cache.set(user_id, current_user)
+    return current_user
+
+
+def verify_refresh_token(token: str) -> dict:
+    """Verify a refresh token and return its payload"""
+    payload = verify_token(token)
+    _get_token_subject(payload, token_type=REFRESH_TOKEN_TYPE)
+    return payload
+
+
+async def get_token_payload(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> dict:
+    """Get the verified, unrevoked payload of the presented access token"""
+    payload = verify_token(credentials.credentials)
+    _get_token_subject(payload)
+    return payload
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+) -> TokenPrincipal:
+    """
+    Get the caller's identity and role.
+    In claims-only mode this comes straight from the verified token; otherwise
+    it is taken from the (cached) user row.
+    """
+    if not AUTH_CLAIMS_ONLY:
+        user = await get_current_user(credentials, session)
+        return TokenPrincipal(id=user.id, role=user.role)
+    
+    payload = verify_token(credentials.credentials)
+    user_id = _get_token_subject(payload)
+    try:
+        role = UserRole(payload.get("role"))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+    return TokenPrincipal(id=user_id, role=role)
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop a user from the principal cache after it has been modified"""
+    principal_cache.invalidate(user_id)
+
+
+def revoke_user_tokens(user_id: str) -> None:
+    """
+    Reject every token issued to a user so far and drop their cached record.
+    Other workers only learn of it from the row AuthService.record_user_revocations adds.
+    """
+    revocation_list.revoke_user(user_id)
+    principal_cache.invalidate(user_id)
 
 
 def require_role(required_role: UserRole):
     """Dependency to require specific user role"""
-    async def role_checker(current_user: UserModel = Depends(get_current_user)) -> UserModel:
-        if current_user.role != required_role:
+    async def role_checker(
+        principal: TokenPrincipal = Depends(get_current_principal)
+    ) -> TokenPrincipal:
+        if principal.role != required_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required role: {required_role.value}"
             )
-        return current_user
+        return principal
     return role_checker
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Content-addressed file storage keyed by SHA-256
+"""
+import asyncio
+import hashlib
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Set, Tuple
+
+import aiofiles
+import aiofiles.os
+
+# Bytes copied per read, which bounds the memory a write holds at once
+BLOB_READ_CHUNK_SIZE = 64 * 1024
+
+
+class BlobTooLargeError(Exception):
+    """Raised when a blob being written exceeds the allowed size"""
+
+
+class BlobStore:
+    """
+    Stores each distinct content once under `root/ab/cd/<sha256>`.
+
+    Two levels of 256-way fan-out keep directories small (a few dozen entries
+    per leaf with millions of blobs). Blobs are written to `root/tmp` first and
+    renamed into place, so a blob path either holds the complete content or
+    does not exist.
+
+    References live in the caller's database. A writer commits its row first and
+    only then moves the content into place (`commit`); `release` moves a blob out
+    of place before asking again whether it is referenced. Either the releaser sees
+    the writer's row and puts the blob back, or the writer's `commit` recreates it,
+    so a concurrent upload of the same bytes never ends up pointing at nothing.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.temp_dir = root / "tmp"
+
+    def path_for(self, digest: str) -> Path:
+        """Location of the blob with the given SHA-256 hex digest"""
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def new_temp_path(self) -> Path:
+        """Unique temporary path on the same filesystem as the blobs"""
+        return self.temp_dir / f"{uuid.uuid4().hex}.part"
+
+    async def save(
+        self,
+        read: Callable[[int], Awaitable[bytes]],
+        max_size: int
+    ) -> Tuple[str, int, Path]:
+        """
+        Stream content from `read` to a temp file and return its digest, size and path.
+        Raises BlobTooLargeError as soon as more than `max_size` bytes arrive. Pass the
+        temp file to `commit` once a row referencing the digest is committed, or to
+        `discard` if that fails.
+        """
+        await aiofiles.os.makedirs(self.temp_dir, exist_ok=True)
+        temp_path = self.new_temp_path()
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(temp_path, "wb") as f:
+                while chunk := await read(BLOB_READ_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_size:
+                        raise BlobTooLargeError(f"Content exceeds the {max_size} byte limit")
+                    digest.update(chunk)
+                    await f.write(chunk)
+        except BaseException:
+            await self.discard(temp_path)
+            raise
+
+        return digest.hexdigest(), size, temp_path
+
+    async def digest_file(self, path: Path) -> str:
+        """SHA-256 of a file written outside `save` (e.g. assembled from chunks)"""
+        return await asyncio.to_thread(self._digest_file, path)
+
+    @staticmethod
+    def _digest_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    async def commit(self, temp_path: Path, digest: str) -> Path:
+        """
+        Move a fully written temp file into place. Call it only after the row
+        referencing `digest` is committed. An existing blob is replaced with the
+        identical content, which also restores one a concurrent `release` removed.
+        """
+        blob_path = self.path_for(digest)
+        await aiofiles.os.makedirs(blob_path.parent, exist_ok=True)
+        await aiofiles.os.replace(temp_path, blob_path)
+        return blob_path
+
+    async def release(
+        self,
+        digests: Iterable[str],
+        referenced: Callable[[Set[str]], Awaitable[Set[str]]]
+    ) -> List[str]:
+        """
+        Delete the blobs that `referenced` (digests -> those still in use) reports
+        unused, and return their digests. Each blob is moved aside and checked again
+        before it is deleted, and put back if a reference was committed meanwhile.
+        """
+        candidates = set(digests)
+        if not candidates:
+            return []
+        candidates -= await referenced(candidates)
+
+        moved: Dict[str, Path] = {}
+        for digest in candidates:
+            released_path = self.temp_dir / f"{uuid.uuid4().hex}.released"
+            try:
+                await aiofiles.os.makedirs(self.temp_dir, exist_ok=True)
+                await aiofiles.os.rename(self.path_for(digest), released_path)
+            except FileNotFoundError:
+                continue
+            moved[digest] = released_path
+        if not moved:
+            return []
+
+        try:
+            still_referenced = await referenced(set(moved))
+        except BaseException:
+            # Without an answer, put everything back
+            for digest, released_path in moved.items():
+                await aiofiles.os.replace(released_path, self.path_for(digest))
+            raise
+
+        removed = []
+        for digest, released_path in moved.items():
+            if digest in still_referenced:
+                await aiofiles.os.replace(released_path, self.path_for(digest))
+            else:
+                await self.discard(released_path)
+                removed.append(digest)
+
+        return removed
+
+    async def discard(self, path: Path) -> None:
+        """Delete a temp file, ignoring one that is already gone"""
+        try:
+            await aiofiles.os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,19 +1,37 @@
 """
 Core Dependencies - Reusable dependency injection utilities
 """
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, AsyncGenerator
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_async_session
-from ..models.user import UserModel
-from ..auth import get_current_user
+from ..database import get_async_session, read_session_factory
+from ..auth import CurrentUser, get_current_user, get_current_principal, get_token_payload, TokenPrincipal
 from ..core.enums import UserRole
+from ..core.read_your_writes import get_last_write_at
 
 
 # Type aliases for cleaner dependency injection
 SessionDep = Annotated[AsyncSession, Depends(get_async_session)]
-CurrentUserDep = Annotated[UserModel, Depends(get_current_user)]
+CurrentUserDep = Annotated[CurrentUser, Depends(get_current_user)]
+PrincipalDep = Annotated[TokenPrincipal, Depends(get_current_principal)]
+TokenPayloadDep = Annotated[dict, Depends(get_token_payload)]
+
+
+async def get_read_session(
+    request: Request,
+    principal: PrincipalDep
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only endpoints (authenticated callers only) - served by the
+    replica, except for clients whose last-write cookie is a few seconds old at most
+    (read-your-writes)
+    """
+    async with read_session_factory(get_last_write_at(request))() as session:
+        yield session
+
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
 
 
 def require_role(*roles: UserRole):
@@ -21,11 +39,11 @@ def require_role(*roles: UserRole):
     Dependency factory to require specific roles
     Usage: dependencies=[Depends(require_role(UserRole.HR))]
     """
-    async def role_checker(current_user: CurrentUserDep) -> UserModel:
-        if current_user.role not in roles:
+    async def role_checker(principal: PrincipalDep) -> TokenPrincipal:
+        if principal.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required roles: {[role.value for role in roles]}"
             )
-        return current_user
+        return principal
     return role_checker
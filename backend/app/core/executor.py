@@ -0,0 +1,76 @@
+"""
+Bounded thread pool for CPU-heavy blocking work
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from .metrics import Histogram
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when a bounded executor has no room for more work"""
+
+
+class BoundedExecutor:
+    """
+    Runs blocking callables on a dedicated thread pool so they never block the
+    event loop. At most `max_workers` jobs run at once and at most `max_queue`
+    more may wait; anything beyond that is rejected immediately.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+        self.queue_wait = Histogram()
+        self.run_time = Histogram()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)` on the pool, raising ExecutorSaturatedError when full"""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturatedError(f"{self.name} executor is saturated")
+            self._pending += 1
+
+        enqueued_at = time.perf_counter()
+
+        def job():
+            started_at = time.perf_counter()
+            result = fn(*args)
+            return result, started_at - enqueued_at, time.perf_counter() - started_at
+
+        future = self._executor.submit(job)
+        # Release the slot when the job finishes or is cancelled before starting
+        future.add_done_callback(lambda _: self._release())
+
+        result, waited, elapsed = await asyncio.wrap_future(future)
+        self.queue_wait.observe(waited)
+        self.run_time.observe(elapsed)
+        return result
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running jobs"""
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return concurrency, rejection and timing metrics"""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "rejected": self.rejected,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+            "run_seconds": self.run_time.snapshot()
+        }
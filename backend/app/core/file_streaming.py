@@ -0,0 +1,171 @@
+"""
+File responses with HTTP Range support and zero-copy sending when the server offers it
+"""
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import aiofiles
+from fastapi import Request, Response
+from starlette.types import Receive, Scope, Send
+
+from .http_cache import REVALIDATE_CACHE_CONTROL, not_modified_response
+
+# Bytes read per chunk when the server cannot send the file itself
+FILE_READ_CHUNK_SIZE = 64 * 1024
+# ASGI extension letting the server send straight from the file descriptor (sendfile)
+ZERO_COPY_SEND_EXTENSION = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiableError(Exception):
+    """Raised when a requested byte range lies outside the file"""
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into inclusive (start, end) offsets.
+    Returns None when the whole file should be sent: no header, another unit,
+    several ranges or invalid syntax (all of which a server may ignore).
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, separator, end_text = spec.strip().partition("-")
+    if not separator:
+        return None
+
+    try:
+        start = int(start_text) if start_text else None
+        end = int(end_text) if end_text else None
+    except ValueError:
+        return None
+    if (start is None and end is None) or (start is not None and start < 0) or (end is not None and end < 0):
+        return None
+
+    if start is None:
+        # Suffix range: the last `end` bytes
+        if end == 0 or size == 0:
+            raise RangeNotSatisfiableError()
+        return max(size - end, 0), size - 1
+
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError()
+    return start, min(end if end is not None else size - 1, size - 1)
+
+
+def _not_modified_since(request: Request, modified_at: float) -> bool:
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return int(modified_at) <= since
+
+
+class FileRangeResponse(Response):
+    """Sends a whole file or one byte range of it"""
+
+    def __init__(
+        self,
+        path: str,
+        byte_range: Tuple[int, int],
+        status_code: int,
+        headers: dict,
+        media_type: Optional[str] = None
+    ):
+        self.path = path
+        self.offset, last = byte_range
+        self.count = last - self.offset + 1
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers({**headers, "Content-Length": str(self.count)})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers
+        })
+        if scope["method"] == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if ZERO_COPY_SEND_EXTENSION in scope.get("extensions", {}):
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": ZERO_COPY_SEND_EXTENSION,
+                    "file": f,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False
+                })
+            return
+
+        remaining = self.count
+        async with aiofiles.open(self.path, "rb") as f:
+            await f.seek(self.offset)
+            more_body = True
+            while more_body:
+                chunk = await f.read(min(FILE_READ_CHUNK_SIZE, remaining))
+                remaining -= len(chunk)
+                # A file that shrank underneath us ends the body early
+                more_body = bool(chunk) and remaining > 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+def file_response(
+    request: Request,
+    path: str,
+    stat_result: os.stat_result,
+    etag: str,
+    media_type: Optional[str] = None,
+    filename: Optional[str] = None,
+    cache_control: str = REVALIDATE_CACHE_CONTROL
+) -> Response:
+    """
+    Serve a file honouring If-Modified-Since, Range and If-Range.
+    If-None-Match should be checked by the caller before the file is stat'ed.
+    """
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+    if "if-none-match" not in request.headers and _not_modified_since(request, stat_result.st_mtime):
+        return not_modified_response(etag)
+
+    size = stat_result.st_size
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes"
+    }
+    if filename:
+        headers["Content-Disposition"] = f"inline; filename*=utf-8''{quote(filename)}"
+
+    # A stale If-Range means the client's partial copy is outdated: send everything
+    if_range = request.headers.get("if-range")
+    range_header = request.headers.get("range")
+    if if_range and if_range.strip() not in (etag, last_modified):
+        range_header = None
+
+    try:
+        byte_range = parse_byte_range(range_header, size)
+    except RangeNotSatisfiableError:
+        return Response(
+            status_code=416,
+            headers={**headers, "Content-Range": f"bytes */{size}"}
+        )
+
+    if byte_range is None:
+        return FileRangeResponse(path, (0, size - 1), 200, headers, media_type)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return FileRangeResponse(path, byte_range, 206, headers, media_type)
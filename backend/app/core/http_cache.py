@@ -0,0 +1,53 @@
+"""
+HTTP conditional request helpers (ETag / If-None-Match)
+"""
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+# Clients may keep a copy but must revalidate before using it
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(payload: Any) -> str:
+    """
+    Weak ETag over the JSON form of a response payload.
+    Weak because the hash is taken over a canonical encoding, not the exact bytes sent.
+    """
+    body = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return f'W/"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+
+
+def version_etag(*parts: Any) -> str:
+    """
+    Strong ETag from values that change whenever the resource does, e.g. (id, updated_at).
+    Lets a handler answer If-None-Match without loading the representation.
+    """
+    version = "|".join(str(part) for part in parts)
+    return f'"{hashlib.sha256(version.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match against an ETag using weak comparison (as RFC 9110 requires)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in header.split(",")
+    )
+
+
+def not_modified_response(etag: str) -> Response:
+    """Empty 304 response carrying the validator"""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    )
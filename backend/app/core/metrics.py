@@ -0,0 +1,46 @@
+"""
+Lightweight in-process metrics primitives
+"""
+from typing import Any, Dict, Sequence
+
+# Default latency buckets in seconds
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative bucketed histogram of observed values"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation"""
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self._counts[index] += 1
+                break
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return count, sum, mean, max and cumulative bucket counts"""
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets, self._counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count > 0 else 0.0,
+            "max": self.max,
+            "buckets": buckets
+        }
@@ -0,0 +1,187 @@
+"""
+Keyset (cursor) pagination helpers for list endpoints
+"""
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+from dotenv import load_dotenv
+
+from .cache import TTLCache
+
+load_dotenv()
+
+# Upper bound for page_size on every list endpoint
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "100"))
+# How stale an approximate total may be
+APPROXIMATE_COUNT_TTL_SECONDS = float(os.getenv("APPROXIMATE_COUNT_TTL_SECONDS", "60"))
+
+# Modifiers that would make ORDER BY disagree with the `>` seek in seek_after
+_ORDERING_MODIFIERS = (
+    operators.asc_op,
+    operators.desc_op,
+    operators.nulls_first_op,
+    operators.nulls_last_op
+)
+
+# Whole-table row counts keyed by table name
+approximate_counts = TTLCache(max_size=64, ttl_seconds=APPROXIMATE_COUNT_TTL_SECONDS)
+
+
+def clamp_page_size(page_size: int) -> int:
+    """Keep page_size between 1 and MAX_PAGE_SIZE"""
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque token"""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_length: int) -> List[Any]:
+    """Decode a cursor produced by encode_cursor, raising 400 when it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != key_length:
+            raise ValueError("cursor key length mismatch")
+        return [_decode_value(value) for value in values]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def seek_after(order_by: Sequence[Any], cursor: str):
+    """
+    Condition selecting rows whose `order_by` key sorts after the one in `cursor`.
+    Only ascending keys are supported: the row-value comparison is `>` on every
+    column, so `order_by` must be plain columns/expressions, not .desc() (or .asc(),
+    nulls_first() ...) clauses, and must not evaluate to NULL.
+    """
+    for expression in order_by:
+        if isinstance(expression, UnaryExpression) and expression.modifier in _ORDERING_MODIFIERS:
+            raise ValueError("seek_after only supports ascending keys without ordering modifiers")
+    values = decode_cursor(cursor, len(order_by))
+    return tuple_(*order_by) > tuple_(*[
+        bindparam(None, value, type_=column.type) for column, value in zip(order_by, values)
+    ])
+
+
+async def fetch_page(
+    session: AsyncSession,
+    stmt,
+    order_by: Sequence[Any],
+    key: Callable[[Any], Sequence[Any]],
+    page: int = 1,
+    page_size: int = 50,
+    cursor: Optional[str] = None,
+    scalars: bool = False,
+    with_total: bool = True,
+    count_stmt=None
+) -> Tuple[List[Any], Optional[str], Optional[int]]:
+    """
+    Fetch one page of `stmt` ordered by the unique, ascending key `order_by`.
+
+    With a cursor the page starts right after the encoded key (keyset seek on the
+    index); without one `page` is used as an offset for backwards compatibility.
+    `key` extracts the sort key values from a fetched row.
+
+    The total number of rows matching `stmt` (or `count_stmt`, when counting a
+    cheaper statement gives the same number) is returned from the same query.
+    Returns the rows, the cursor for the next page (None on the last page) and
+    the total (None when `with_total` is False).
+    """
+    page_size = clamp_page_size(page_size)
+    base_stmt = stmt
+    stmt = stmt.order_by(*order_by)
+
+    if with_total:
+        if cursor:
+            # The seek predicate would hide earlier rows from a window count, so count
+            # the unfiltered statement in an uncorrelated subquery (evaluated once)
+            total_column = select(func.count()).select_from(
+                (count_stmt if count_stmt is not None else base_stmt).subquery()
+            ).scalar_subquery()
+        else:
+            # Window aggregates run before OFFSET/LIMIT, so this counts every match
+            total_column = func.count().over()
+        stmt = stmt.add_columns(total_column.label("total_count"))
+
+    if cursor:
+        stmt = stmt.where(seek_after(order_by, cursor))
+    else:
+        stmt = stmt.offset((max(page, 1) - 1) * page_size)
+
+    # One extra row tells whether another page exists
+    result = await session.execute(stmt.limit(page_size + 1))
+    rows = result.all()
+
+    total = None
+    if with_total:
+        if rows:
+            total = rows[0].total_count
+        else:
+            # Past the last page there is no row to carry the count
+            total = await session.scalar(select(func.count()).select_from(
+                (count_stmt if count_stmt is not None else base_stmt).subquery()
+            ))
+
+    if scalars:
+        rows = [row[0] for row in rows]
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(key(rows[-1]))
+
+    return rows, next_cursor, total
+
+
+async def approximate_row_count(session: AsyncSession, model) -> int:
+    """
+    Row count of a whole table for approximate totals.
+    Uses the planner's estimate on PostgreSQL (an exact count until the table has
+    been analyzed) and caches it for at most APPROXIMATE_COUNT_TTL_SECONDS.
+    """
+    table_name = model.__tablename__
+    cached = approximate_counts.get(table_name)
+    if cached is not None:
+        return cached
+
+    estimate = None
+    if session.bind.dialect.name == "postgresql":
+        estimate = await session.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)"),
+            {"table_name": table_name}
+        )
+        # -1 (or 0 on older servers) means the table has never been analyzed
+        if estimate is not None and estimate <= 0:
+            estimate = None
+
+    if estimate is None:
+        estimate = await session.scalar(select(func.count()).select_from(model))
+
+    approximate_counts.set(table_name, estimate)
+    return estimate
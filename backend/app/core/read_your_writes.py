@@ -0,0 +1,59 @@
+"""
+Read-your-writes across workers - the time of a client's last write travels in a cookie
+"""
+import math
+import time
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LAST_WRITE_COOKIE = "last_write_at"
+
+
+def get_last_write_at(request: Request) -> Optional[float]:
+    """Time (epoch seconds) of the client's last committed write, as sent back in its cookie"""
+    try:
+        return float(request.cookies[LAST_WRITE_COOKIE])
+    except (KeyError, ValueError):
+        return None
+
+
+class LastWriteCookieMiddleware:
+    """
+    Sets the last-write cookie on responses to requests that committed a write.
+    Whichever worker serves the client's next read sees the cookie, so it does not
+    matter which process handled the write.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Written to request.state by the primary session when it commits
+                last_write_at = scope.get("state", {}).get("last_write_at")
+                if last_write_at is not None:
+                    MutableHeaders(scope=message).append("set-cookie", self._cookie(last_write_at))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+    def _cookie(self, last_write_at: float) -> str:
+        # last_write_at may lie ahead for writes that are buffered before they land
+        max_age = max(math.ceil(last_write_at + self.window_seconds - time.time()), 1)
+        cookie = SimpleCookie()
+        cookie[LAST_WRITE_COOKIE] = f"{last_write_at:.3f}"
+        cookie[LAST_WRITE_COOKIE]["max-age"] = max_age
+        cookie[LAST_WRITE_COOKIE]["path"] = "/"
+        cookie[LAST_WRITE_COOKIE]["httponly"] = True
+        cookie[LAST_WRITE_COOKIE]["samesite"] = "lax"
+        return cookie.output(header="").strip()
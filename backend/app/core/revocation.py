@@ -0,0 +1,131 @@
+"""
+Token revocation tracking
+"""
+import hashlib
+import math
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    A negative answer is definite, a positive answer may be a false positive.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: derive k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (first + i * second) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenRevocationList:
+    """
+    In-memory view of revoked tokens, checked on every request without a DB hit.
+
+    Two kinds of revocation are tracked:
+    - individual tokens by `jti` (logout, refresh rotation), mirrored from the
+      `revoked_tokens` table and fronted by a Bloom filter
+    - users whose previously issued tokens are all invalid (deactivated or deleted);
+      a token is revoked when it was issued before its subject's cutoff. These are
+      persisted as `revoked_tokens` rows of type "user", so every worker sees them
+
+    Entries are dropped once every token they could affect has expired.
+    """
+
+    def __init__(self, max_token_lifetime_seconds: float, expected_tokens: int = 100000):
+        self.max_token_lifetime_seconds = max_token_lifetime_seconds
+        self.expected_tokens = expected_tokens
+        self._user_cutoffs: Dict[str, float] = {}
+        self._revoked_jtis: Dict[str, float] = {}
+        self._bloom = BloomFilter(expected_tokens)
+
+    def revoke_user(self, user_id: str, revoked_at: Optional[float] = None) -> None:
+        """Invalidate every token issued to a user up to `revoked_at` (default: now)"""
+        cutoff = time.time() if revoked_at is None else revoked_at
+        self._user_cutoffs[user_id] = max(cutoff, self._user_cutoffs.get(user_id, cutoff))
+        self.prune()
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        """Invalidate a single token until its expiry (unix timestamp)"""
+        if expires_at <= time.time():
+            return
+        self._revoked_jtis[jti] = expires_at
+        self._bloom.add(jti)
+        if len(self._revoked_jtis) > self.expected_tokens:
+            self.prune()
+
+    def load(
+        self,
+        entries: Iterable[Tuple[str, float]],
+        replace: bool = False,
+        user_cutoffs: Iterable[Tuple[str, float]] = ()
+    ) -> None:
+        """Merge (jti, expires_at) and (user_id, revoked_at) pairs from the persistent store"""
+        if replace:
+            self._revoked_jtis.clear()
+            self._user_cutoffs.clear()
+            self._bloom = BloomFilter(self.expected_tokens)
+        for jti, expires_at in entries:
+            self.revoke_token(jti, expires_at)
+        for user_id, revoked_at in user_cutoffs:
+            self.revoke_user(user_id, revoked_at)
+
+    def is_token_revoked(self, jti: Optional[str]) -> bool:
+        """Check a single token id - the Bloom filter answers most lookups"""
+        if jti is None or jti not in self._bloom:
+            return False
+        expires_at = self._revoked_jtis.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def is_revoked(self, payload: dict) -> bool:
+        """Check whether a decoded token payload has been revoked"""
+        if self.is_token_revoked(payload.get("jti")):
+            return True
+
+        cutoff = self._user_cutoffs.get(payload.get("sub"))
+        if cutoff is None:
+            return False
+        issued_at = payload.get("iat")
+        # Tokens without an issue time predate revocation tracking
+        return issued_at is None or issued_at <= cutoff
+
+    def prune(self) -> None:
+        """Drop expired token ids and user cutoffs older than the longest token lifetime"""
+        now = time.time()
+        horizon = now - self.max_token_lifetime_seconds
+        expired_users = [user_id for user_id, cutoff in self._user_cutoffs.items() if cutoff < horizon]
+        for user_id in expired_users:
+            del self._user_cutoffs[user_id]
+
+        expired_jtis = [jti for jti, expires_at in self._revoked_jtis.items() if expires_at <= now]
+        if expired_jtis:
+            for jti in expired_jtis:
+                del self._revoked_jtis[jti]
+            # Bloom filters cannot forget - rebuild from the live entries
+            self._bloom = BloomFilter(max(self.expected_tokens, len(self._revoked_jtis)))
+            for jti in self._revoked_jtis:
+                self._bloom.add(jti)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of tracked revocations"""
+        return {
+            "revoked_tokens": len(self._revoked_jtis),
+            "revoked_users": len(self._user_cutoffs)
+        }
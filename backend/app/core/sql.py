@@ -0,0 +1,94 @@
+"""
+Dialect-specific SQL helpers
+"""
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import JSON, Integer, cast, func, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dialect_insert(session: AsyncSession, model):
+    """
+    Return an INSERT construct for the session's dialect, which exposes
+    ON CONFLICT (on_conflict_do_nothing / on_conflict_do_update)
+    """
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"ON CONFLICT inserts are not supported for {dialect}")
+
+
+# Rows per multi-row INSERT statement, well below the bind parameter limits
+BULK_INSERT_BATCH_SIZE = 1000
+
+
+async def insert_ignoring_conflicts(
+    session: AsyncSession,
+    model,
+    rows: List[Dict[str, Any]],
+    index_elements: Sequence[str],
+    returning: Sequence[Any],
+    batch_size: int = BULK_INSERT_BATCH_SIZE
+) -> List[Any]:
+    """
+    Insert rows with multi-row INSERT ... ON CONFLICT (index_elements) DO NOTHING,
+    batch by batch, and return the `returning` columns of the rows actually inserted.
+    Does not commit.
+    """
+    inserted = []
+    for start in range(0, len(rows), batch_size):
+        insert_stmt = dialect_insert(session, model).values(rows[start:start + batch_size])
+        insert_stmt = insert_stmt.on_conflict_do_nothing(
+            index_elements=list(index_elements)
+        ).returning(*returning)
+        inserted.extend((await session.execute(insert_stmt)).all())
+    return inserted
+
+
+def greatest(session: AsyncSession, *expressions):
+    """SQL expression for the largest of several values"""
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        return func.greatest(*expressions)
+    if dialect == "sqlite":
+        # max() with several arguments is a scalar function in SQLite
+        return func.max(*expressions)
+    raise NotImplementedError(f"greatest() is not supported for {dialect}")
+
+
+def days_between(session: AsyncSession, start, end):
+    """
+    SQL expression for the whole number of days from `start` to `end`,
+    matching Python's `(end - start).days` for non-negative intervals
+    """
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        return func.date_part("day", end - start)
+    if dialect == "sqlite":
+        return cast(func.julianday(end) - func.julianday(start), Integer)
+    raise NotImplementedError(f"Date arithmetic is not supported for {dialect}")
+
+
+def json_array_agg(session: AsyncSession, fields: Dict[str, Any], order_by: Sequence[Any] = ()):
+    """
+    Aggregate expression building a JSON array with one object per row, keyed by
+    the names in `fields`. Evaluates to NULL on PostgreSQL when there are no rows.
+    """
+    # Keys are fixed identifiers from our code, inlined so every dialect sees text
+    pairs = []
+    for name, column in fields.items():
+        pairs.extend((literal_column(f"'{name}'"), column))
+
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        row = func.json_build_object(*pairs)
+        if order_by:
+            row = postgresql.aggregate_order_by(row, *order_by)
+        return func.json_agg(row, type_=JSON)
+    if dialect == "sqlite":
+        # SQLite aggregates in the order rows arrive from the (ordered) source
+        return func.json_group_array(func.json_object(*pairs), type_=JSON)
+    raise NotImplementedError(f"JSON aggregation is not supported for {dialect}")
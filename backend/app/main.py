@@ -2,10 +2,13 @@
 FastAPI HR Onboarding System - Clean Architecture Main Application
 Refactored with Service Layer, Dependency Injection, and Router Separation
 """
+import asyncio
+from datetime import datetime, timedelta
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .database import create_db_and_tables
+from .core.read_your_writes import LastWriteCookieMiddleware
+from .database import READ_YOUR_WRITES_SECONDS, verify_schema_revision
 from .routers import (
     auth_router,
     dashboard_router,
@@ -13,7 +16,10 @@ from .routers import (
     tasks_router,
     documents_router,
     training_router,
-    performance_router
+    performance_router,
+    internal_router,
+    playbooks_router,
+    files_router
 )
 
 # Create FastAPI app
@@ -32,6 +38,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Keeps a client's reads on the primary for a few seconds after it writes, on every worker
+app.add_middleware(LastWriteCookieMiddleware, window_seconds=READ_YOUR_WRITES_SECONDS)
+
 # Register routers - Clean separation of concerns
 app.include_router(auth_router, prefix="/api")
 app.include_router(dashboard_router)
@@ -40,23 +49,49 @@ app.include_router(tasks_router)
 app.include_router(documents_router)
 app.include_router(training_router)
 app.include_router(performance_router)
+app.include_router(playbooks_router)
+app.include_router(files_router)
+app.include_router(internal_router)
+
+
+async def sync_revocations_periodically():
+    """
+    Keep the in-memory token denylist in step with revocations made by other
+    workers, and drop entries for tokens that have expired
+    """
+    from .auth import REVOCATION_SYNC_SECONDS
+    from .database import AsyncSessionLocal
+    from .services.auth_service import AuthService
+    
+    last_sync = datetime.utcnow()
+    while True:
+        await asyncio.sleep(REVOCATION_SYNC_SECONDS)
+        started_at = datetime.utcnow()
+        try:
+            async with AsyncSessionLocal() as session:
+                # Small overlap so rows committed around the last sync are not missed
+                await AuthService.sync_revoked_tokens(session, since=last_sync - timedelta(seconds=5))
+                await AuthService.purge_expired_revocations(session)
+            last_sync = started_at
+        except Exception as e:
+            print(f"⚠️  Token revocation sync failed: {e}")
 
 
 # Startup event - Database initialization
 @app.on_event("startup")
 async def on_startup():
     """
-    Initialize database tables and create default users
+    Verify the schema revision and create default users
     Separated startup logic for clarity
     """
     from .models.user import UserModel
     from .core.enums import UserRole
-    from .auth import get_password_hash
+    from .auth import get_password_hash_async
     from .database import AsyncSessionLocal
     from sqlmodel import select
     
-    # Create database tables
-    await create_db_and_tables()
+    # Schema is managed by Alembic - refuse to start against an outdated database
+    await verify_schema_revision()
     
     # Seed default users if not exists
     async with AsyncSessionLocal() as session:
@@ -69,30 +104,25 @@ async def on_startup():
             print("🔧 Creating default users...")
             print("="*50)
             
-            # Create HR user
-            hr_user = UserModel(
-                name="John HR",
-                email="john.hr@company.com",
-                password_hash=get_password_hash("password123"),
-                role=UserRole.HR
-            )
-            session.add(hr_user)
-            
-            # Create sample employees
-            employees = [
-                ("Jane Employee", "jane.employee@company.com"),
-                ("Bob Employee", "bob.employee@company.com"),
-                ("Alice Employee", "alice.employee@company.com")
+            default_users = [
+                ("John HR", "john.hr@company.com", UserRole.HR),
+                ("Jane Employee", "jane.employee@company.com", UserRole.EMPLOYEE),
+                ("Bob Employee", "bob.employee@company.com", UserRole.EMPLOYEE),
+                ("Alice Employee", "alice.employee@company.com", UserRole.EMPLOYEE)
             ]
             
-            for name, email in employees:
-                employee = UserModel(
+            # Hash passwords concurrently on the password executor
+            password_hashes = await asyncio.gather(*[
+                get_password_hash_async("password123") for _ in default_users
+            ])
+            
+            for (name, email, role), password_hash in zip(default_users, password_hashes):
+                session.add(UserModel(
                     name=name,
                     email=email,
-                    password_hash=get_password_hash("password123"),
-                    role=UserRole.EMPLOYEE
-                )
-                session.add(employee)
+                    password_hash=password_hash,
+                    role=role
+                ))
             
             await session.commit()
             print("\n✅ Default users created successfully!")
@@ -107,6 +137,35 @@ async def on_startup():
             print("="*50 + "\n")
         else:
             print("✓ Default users already exist, skipping creation.")
+    
+    # Load revoked tokens so verification never needs the database
+    from .services.auth_service import AuthService
+    async with AsyncSessionLocal() as session:
+        await AuthService.sync_revoked_tokens(session)
+    app.state.revocation_sync_task = asyncio.create_task(sync_revocations_periodically())
+    
+    # Batch training progress heartbeats
+    from .services.training_progress_buffer import training_progress_buffer
+    training_progress_buffer.start()
+
+
+# Shutdown event - Release worker pools
+@app.on_event("shutdown")
+async def on_shutdown():
+    """
+    Stop background tasks, write buffered training progress, wait for in-flight
+    password hashing jobs and stop the workers
+    """
+    from .auth import shutdown_password_workers
+    from .services.training_progress_buffer import training_progress_buffer
+    
+    revocation_sync_task = getattr(app.state, "revocation_sync_task", None)
+    if revocation_sync_task:
+        revocation_sync_task.cancel()
+    
+    await training_progress_buffer.stop()
+    
+    shutdown_password_workers()
 
 
 # Health check endpoint
@@ -3,8 +3,10 @@ Database models for HR Onboarding System
 """
 from .user import UserModel
 from .task import TaskModel, EmployeeTaskModel
-from .document import DocumentModel
+from .document import DocumentModel, UploadSessionModel
 from .training import TrainingModuleModel, EmployeeTrainingModel
+from .token import RevokedTokenModel
+from .playbook import PlaybookModel, PlaybookItemModel
 
 # Import all models to ensure they are registered with SQLModel
 __all__ = [
@@ -12,6 +14,10 @@ __all__ = [
     "TaskModel", 
     "EmployeeTaskModel",
     "DocumentModel",
+    "UploadSessionModel",
     "TrainingModuleModel",
-    "EmployeeTrainingModel"
+    "EmployeeTrainingModel",
+    "RevokedTokenModel",
+    "PlaybookModel",
+    "PlaybookItemModel"
 ]
\ No newline at end of file
@@ -2,6 +2,7 @@
 Document model definitions
 """
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, text
 from typing import Optional
 from datetime import datetime
 import uuid
@@ -12,6 +13,17 @@ from ..core.enums import DocumentType, VerificationStatus
 class DocumentModel(SQLModel, table=True):
     """Document database model"""
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_employee_uploaded_at", "employee_id", "uploaded_at", "id"),
+        Index("ix_documents_uploaded_at", "uploaded_at", "id"),
+        # Only pending documents are ever looked up by status (verification queue)
+        Index(
+            "ix_documents_pending_verification",
+            "employee_id",
+            postgresql_where=text("verification_status = 'PENDING'"),
+            sqlite_where=text("verification_status = 'PENDING'")
+        ),
+    )
     
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     employee_id: str = Field(foreign_key="users.id")
@@ -19,6 +31,7 @@ class DocumentModel(SQLModel, table=True):
     original_filename: str = Field(max_length=255)
     file_path: str = Field(max_length=500)
     file_size: Optional[int] = None
+    checksum: Optional[str] = Field(default=None, max_length=64, index=True)  # SHA-256 hex digest, names the blob
     mime_type: Optional[str] = Field(max_length=100)
     verification_status: VerificationStatus = Field(default=VerificationStatus.PENDING)
     verification_notes: Optional[str] = None
@@ -28,4 +41,21 @@ class DocumentModel(SQLModel, table=True):
     task_id: Optional[str] = Field(foreign_key="tasks.id")
     
     # Simplified relationships
-    related_task: Optional["TaskModel"] = Relationship(back_populates="documents")
\ No newline at end of file
+    related_task: Optional["TaskModel"] = Relationship(back_populates="documents")
+
+
+class UploadSessionModel(SQLModel, table=True):
+    """Resumable upload in progress - chunks are appended to a temp file until finalized"""
+    __tablename__ = "upload_sessions"
+    
+    id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    employee_id: str = Field(foreign_key="users.id", index=True)
+    document_type: DocumentType
+    original_filename: str = Field(max_length=255)
+    mime_type: Optional[str] = Field(default=None, max_length=100)
+    task_id: Optional[str] = Field(default=None, foreign_key="tasks.id")
+    total_size: int
+    received_bytes: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(index=True)
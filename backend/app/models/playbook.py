@@ -0,0 +1,45 @@
+"""
+Onboarding playbook model definitions
+"""
+from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import CheckConstraint, UniqueConstraint
+from typing import Optional, List
+from datetime import datetime
+import uuid
+
+
+class PlaybookModel(SQLModel, table=True):
+    """Onboarding playbook - a reusable, ordered bundle of tasks and training modules"""
+    __tablename__ = "playbooks"
+    
+    id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    name: str = Field(max_length=200)
+    description: Optional[str] = None
+    is_active: bool = Field(default=True)
+    created_by: Optional[str] = Field(foreign_key="users.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    # Relationships
+    items: List["PlaybookItemModel"] = Relationship(back_populates="playbook")
+
+
+class PlaybookItemModel(SQLModel, table=True):
+    """Playbook entry - exactly one task or training module at a position"""
+    __tablename__ = "playbook_items"
+    __table_args__ = (
+        UniqueConstraint("playbook_id", "position", name="uq_playbook_items_playbook_position"),
+        CheckConstraint(
+            "(task_id IS NULL) <> (training_module_id IS NULL)",
+            name="ck_playbook_items_single_target"
+        ),
+    )
+    
+    id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    playbook_id: str = Field(foreign_key="playbooks.id")
+    position: int
+    task_id: Optional[str] = Field(default=None, foreign_key="tasks.id", index=True)
+    training_module_id: Optional[str] = Field(default=None, foreign_key="training_modules.id", index=True)
+    
+    # Simplified relationships
+    playbook: PlaybookModel = Relationship(back_populates="items")
@@ -2,6 +2,7 @@
 Task model definitions
 """
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, UniqueConstraint
 from typing import Optional, List
 from datetime import datetime
 import uuid
@@ -12,6 +13,9 @@ from ..core.enums import TaskType, TaskStatus, DocumentType
 class TaskModel(SQLModel, table=True):
     """Task database model"""
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_created_at", "created_at", "id"),
+    )
     
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     title: str = Field(max_length=200)
@@ -33,6 +37,13 @@ class TaskModel(SQLModel, table=True):
 class EmployeeTaskModel(SQLModel, table=True):
     """Employee task assignment database model"""
     __tablename__ = "employee_tasks"
+    __table_args__ = (
+        UniqueConstraint("employee_id", "task_id", name="uq_employee_tasks_employee_task"),
+        Index("ix_employee_tasks_employee_status", "employee_id", "status", "assigned_at", "id"),
+        Index("ix_employee_tasks_employee_assigned_at", "employee_id", "assigned_at", "id"),
+        Index("ix_employee_tasks_task_id", "task_id"),
+        Index("ix_employee_tasks_status", "status"),
+    )
     
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     employee_id: str = Field(foreign_key="users.id")
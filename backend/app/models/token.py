@@ -0,0 +1,17 @@
+"""
+Token model definitions
+"""
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class RevokedTokenModel(SQLModel, table=True):
+    """Revoked JWT database model - denylist entries kept until the token expires"""
+    __tablename__ = "revoked_tokens"
+    
+    jti: str = Field(primary_key=True, max_length=64)
+    user_id: Optional[str] = Field(default=None, max_length=36)
+    token_type: str = Field(max_length=20)
+    expires_at: datetime = Field(index=True)
+    revoked_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -2,6 +2,7 @@
 Training model definitions
 """
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, UniqueConstraint
 from typing import Optional, List
 from datetime import datetime
 import uuid
@@ -12,6 +13,9 @@ from ..core.enums import TaskStatus
 class TrainingModuleModel(SQLModel, table=True):
     """Training module database model"""
     __tablename__ = "training_modules"
+    __table_args__ = (
+        Index("ix_training_modules_active_created_at", "is_active", "created_at", "id"),
+    )
     
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     title: str = Field(max_length=200)
@@ -32,6 +36,11 @@ class TrainingModuleModel(SQLModel, table=True):
 class EmployeeTrainingModel(SQLModel, table=True):
     """Employee training progress database model"""
     __tablename__ = "employee_training"
+    __table_args__ = (
+        UniqueConstraint(
+            "employee_id", "training_module_id", name="uq_employee_training_employee_module"
+        ),
+    )
     
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     employee_id: str = Field(foreign_key="users.id")
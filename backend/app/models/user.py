@@ -2,6 +2,7 @@
 User model definitions
 """
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import Optional, List
 from datetime import datetime
 import uuid
@@ -12,6 +13,10 @@ from ..core.enums import UserRole
 class UserModel(SQLModel, table=True):
     """User database model"""
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_role_active", "role", "is_active"),
+        Index("ix_users_role_created_at", "role", "created_at", "id"),
+    )
     
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     name: str = Field(max_length=100)
@@ -8,6 +8,9 @@ from .documents import router as documents_router
 from .training import router as training_router
 from .performance import router as performance_router
 from .dashboard import router as dashboard_router
+from .internal import router as internal_router
+from .playbooks import router as playbooks_router
+from .files import router as files_router
 
 __all__ = [
     "auth_router",
@@ -17,4 +20,7 @@ __all__ = [
     "training_router",
     "performance_router",
     "dashboard_router",
+    "internal_router",
+    "playbooks_router",
+    "files_router",
 ]
@@ -1,16 +1,19 @@
 """
 Authentication Router - Login, Register, Token Management
 """
-from fastapi import APIRouter, Depends
-from typing import Annotated
+from fastapi import APIRouter, Depends, UploadFile, File, Form
+from typing import Annotated, Optional
 
-from ..core.dependencies import SessionDep, CurrentUserDep, require_role
+from ..core.dependencies import (
+    SessionDep, CurrentUserDep, PrincipalDep, TokenPayloadDep, require_role
+)
 from ..services.auth_service import AuthService
 from ..schemas.user import (
     UserLoginSchema, UserLoginResponseSchema,
-    UserCreateSchema, UserResponseSchema
+    UserCreateSchema, UserResponseSchema,
+    TokenRefreshSchema, TokenResponseSchema, LogoutSchema
 )
-from ..schemas.responses import MessageResponseSchema
+from ..schemas.responses import MessageResponseSchema, BulkImportResponseSchema
 from ..core.enums import UserRole
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -21,7 +24,7 @@ async def login(login_data: UserLoginSchema, session: SessionDep):
     """
     Authenticate user and return access token
     """
-    access_token, user = await AuthService.login_user(
+    access_token, refresh_token, user = await AuthService.login_user(
         session,
         login_data.email,
         login_data.password
@@ -29,11 +32,29 @@ async def login(login_data: UserLoginSchema, session: SessionDep):
     
     return UserLoginResponseSchema(
         access_token=access_token,
+        refresh_token=refresh_token,
         token_type="bearer",
         user=UserResponseSchema.from_orm(user)
     )
 
 
+@router.post("/refresh", response_model=TokenResponseSchema)
+async def refresh(refresh_data: TokenRefreshSchema, session: SessionDep):
+    """
+    Exchange a refresh token for a new access/refresh token pair
+    """
+    access_token, refresh_token = await AuthService.refresh_tokens(
+        session,
+        refresh_data.refresh_token
+    )
+    
+    return TokenResponseSchema(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer"
+    )
+
+
 @router.post(
     "/register",
     response_model=UserResponseSchema,
@@ -42,7 +63,7 @@ async def login(login_data: UserLoginSchema, session: SessionDep):
 async def register_user(
     user_data: UserCreateSchema,
     session: SessionDep,
-    current_user: CurrentUserDep
+    current_user: PrincipalDep
 ):
     """
     Register new user (HR only)
@@ -51,11 +72,37 @@ async def register_user(
     return UserResponseSchema.from_orm(user)
 
 
+@router.post(
+    "/register/bulk",
+    response_model=BulkImportResponseSchema,
+    dependencies=[Depends(require_role(UserRole.HR))]
+)
+async def bulk_register_users(
+    session: SessionDep,
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Form(None, alias="format")
+):
+    """
+    Bulk register users from a CSV or NDJSON file (HR only)
+    Columns/fields: name, email, password, role (default employee), is_active
+    """
+    return await AuthService.bulk_register_users(session, file, file_format)
+
+
 @router.post("/logout", response_model=MessageResponseSchema)
-async def logout(current_user: CurrentUserDep):
+async def logout(
+    token_payload: TokenPayloadDep,
+    session: SessionDep,
+    logout_data: Optional[LogoutSchema] = None
+):
     """
-    Logout endpoint - client should discard token
+    Logout endpoint - revokes the current access token and, if provided, the refresh token
     """
+    await AuthService.logout_user(
+        session,
+        token_payload,
+        refresh_token=logout_data.refresh_token if logout_data else None
+    )
     return {"message": "Logged out successfully"}
 
 
@@ -68,7 +115,7 @@ async def get_current_user_info(current_user: CurrentUserDep):
 
 
 @router.get("/verify", response_model=MessageResponseSchema)
-async def verify_token(current_user: CurrentUserDep):
+async def verify_token(current_user: PrincipalDep):
     """
     Verify if token is valid
     """
@@ -3,7 +3,7 @@ Dashboard Router - Dashboard metrics for HR and Employees
 """
 from fastapi import APIRouter, Depends
 
-from ..core.dependencies import SessionDep, CurrentUserDep
+from ..core.dependencies import ReadSessionDep, PrincipalDep
 from ..services.performance_service import PerformanceService
 
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
@@ -11,8 +11,8 @@ router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
 @router.get("/")
 async def get_dashboard(
-    session: SessionDep,
-    current_user: CurrentUserDep
+    session: ReadSessionDep,
+    current_user: PrincipalDep
 ):
     """
     Get dashboard data for HR or Employee
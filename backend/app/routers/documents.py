@@ -2,14 +2,31 @@
 Documents Router - Document upload and management endpoints
 """
 from typing import Optional
+from datetime import datetime
 from pathlib import Path
-from fastapi import APIRouter, Depends, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, Form, status
+import aiofiles.os
 
-from ..core.dependencies import SessionDep, CurrentUserDep
-from ..services.document_service import DocumentService
-from ..schemas.document import DocumentUploadResponseSchema
+from ..core.dependencies import SessionDep, ReadSessionDep, PrincipalDep
+from ..services.document_service import DocumentService, download_url_signer, MAX_REQUEST_BODY_SIZE
+from ..schemas.document import (
+    DocumentUploadResponseSchema,
+    DownloadUrlResponseSchema,
+    UploadSessionCreateSchema,
+    UploadSessionResponseSchema
+)
+from ..schemas.responses import MessageResponseSchema
+from ..core.enums import UserRole
+from ..core.http_cache import etag_matches, not_modified_response, version_etag
+from ..core.file_streaming import file_response
+from ..core.request_limits import body_size_limited_route
 
-router = APIRouter(prefix="/api/documents", tags=["Documents"])
+router = APIRouter(
+    prefix="/api/documents",
+    tags=["Documents"],
+    # Oversized bodies are refused on the wire, before FastAPI spools form files to disk
+    route_class=body_size_limited_route(MAX_REQUEST_BODY_SIZE)
+)
 
 # Upload directory setup
 UPLOAD_DIR = Path("uploads")
@@ -18,23 +35,28 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 
 @router.get("/")
 async def get_documents(
-    session: SessionDep,
-    current_user: CurrentUserDep,
+    session: ReadSessionDep,
+    current_user: PrincipalDep,
     page: int = 1,
-    page_size: int = 50
+    page_size: int = 50,
+    cursor: Optional[str] = None,
+    approximate_total: bool = False
 ):
     """
     Get documents - HR sees all, Employee sees their own
+    Pass `next_cursor` from the previous response as `cursor` to fetch the next page
+    `approximate_total` trades an exact total for a cached estimate on the HR list
     """
     document_service = DocumentService(UPLOAD_DIR)
-    from ..core.enums import UserRole
     employee_id = None if current_user.role == UserRole.HR else current_user.id
     
     return await document_service.get_all_documents(
         session,
         page=page,
         page_size=page_size,
-        employee_id=employee_id
+        employee_id=employee_id,
+        cursor=cursor,
+        approximate_total=approximate_total
     )
 
 
@@ -44,13 +66,15 @@ async def get_documents(
 )
 async def upload_document(
     session: SessionDep,
-    current_user: CurrentUserDep,
+    current_user: PrincipalDep,
     file: UploadFile = File(...),
     document_type: str = Form(...),
     task_id: Optional[str] = Form(None)
 ):
     """
     Upload document
+    Bodies whose Content-Length exceeds the limit get 413 before anything is read;
+    otherwise the upload is cut off with 413 as soon as it crosses MAX_FILE_SIZE.
     """
     document_service = DocumentService(UPLOAD_DIR)
     document = await document_service.upload_document(
@@ -63,5 +87,160 @@ async def upload_document(
     
     return DocumentUploadResponseSchema(
         message="Document uploaded successfully",
-        document_id=document.id
+        document_id=document.id,
+        file_size=document.file_size,
+        checksum=document.checksum
+    )
+
+
+@router.post(
+    "/uploads",
+    response_model=UploadSessionResponseSchema,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_upload(
+    upload_data: UploadSessionCreateSchema,
+    session: SessionDep,
+    current_user: PrincipalDep
+):
+    """
+    Start a resumable upload
+    Send the file in chunks with PUT /uploads/{upload_id}?offset=N, then finalize
+    it with POST /uploads/{upload_id}/complete.
+    """
+    document_service = DocumentService(UPLOAD_DIR)
+    return await document_service.create_upload_session(session, upload_data, current_user.id)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionResponseSchema)
+async def get_upload(
+    upload_id: str,
+    session: SessionDep,
+    current_user: PrincipalDep
+):
+    """
+    Get the offset to resume an interrupted upload from
+    """
+    return await DocumentService.get_upload_session(session, upload_id, current_user.id)
+
+
+@router.put("/uploads/{upload_id}", response_model=UploadSessionResponseSchema)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    session: SessionDep,
+    current_user: PrincipalDep,
+    offset: int = Query(..., ge=0)
+):
+    """
+    Append the raw request body at `offset`
+    `offset` must equal the current offset (409 otherwise). Bytes received before
+    a dropped connection are kept - fetch the offset and continue from there.
+    """
+    document_service = DocumentService(UPLOAD_DIR)
+    return await document_service.write_upload_chunk(
+        session, upload_id, current_user.id, offset, request.stream()
+    )
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=DocumentUploadResponseSchema)
+async def complete_upload(
+    upload_id: str,
+    session: SessionDep,
+    current_user: PrincipalDep
+):
+    """
+    Turn a fully received upload into a document
+    """
+    document_service = DocumentService(UPLOAD_DIR)
+    document = await document_service.complete_upload(session, upload_id, current_user.id)
+    
+    return DocumentUploadResponseSchema(
+        message="Document uploaded successfully",
+        document_id=document.id,
+        file_size=document.file_size,
+        checksum=document.checksum
+    )
+
+
+@router.delete("/uploads/{upload_id}", response_model=MessageResponseSchema)
+async def abort_upload(
+    upload_id: str,
+    session: SessionDep,
+    current_user: PrincipalDep
+):
+    """
+    Cancel an upload and discard the bytes received so far
+    """
+    document_service = DocumentService(UPLOAD_DIR)
+    await document_service.abort_upload(session, upload_id, current_user.id)
+    return {"message": "Upload cancelled"}
+
+
+@router.api_route("/{document_id}/content", methods=["GET", "HEAD"])
+async def get_document_content(
+    document_id: str,
+    request: Request,
+    session: ReadSessionDep,
+    current_user: PrincipalDep
+):
+    """
+    Download a document's file - HR can read any document, Employee only their own
+    Supports Range requests; the ETag is the content's SHA-256, so If-None-Match
+    is answered with 304 before the file is opened.
+    """
+    document_service = DocumentService(UPLOAD_DIR)
+    employee_id = None if current_user.role == UserRole.HR else current_user.id
+    document = await document_service.get_document_file(session, document_id, employee_id)
+    
+    etag = f'"{document["checksum"]}"' if document["checksum"] else None
+    if etag and etag_matches(request, etag):
+        return not_modified_response(etag)
+    
+    try:
+        stat_result = await aiofiles.os.stat(document["file_path"])
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document file not found"
+        )
+    
+    if etag is None:
+        # Documents stored before checksums were recorded
+        etag = version_etag(document["file_path"], stat_result.st_size, stat_result.st_mtime_ns)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+    
+    return file_response(
+        request,
+        document["file_path"],
+        stat_result,
+        etag,
+        media_type=document["mime_type"],
+        filename=document["original_filename"]
+    )
+
+
+@router.get("/{document_id}/download-url", response_model=DownloadUrlResponseSchema)
+async def get_document_download_url(
+    document_id: str,
+    session: ReadSessionDep,
+    current_user: PrincipalDep
+):
+    """
+    Get a short-lived signed URL for a document's content
+    The URL works without an Authorization header; `url` is null for documents
+    uploaded before checksums were recorded (use /content for those).
+    """
+    document_service = DocumentService(UPLOAD_DIR)
+    employee_id = None if current_user.role == UserRole.HR else current_user.id
+    document = await document_service.get_document_file(session, document_id, employee_id)
+    
+    expires = download_url_signer.expiry()
+    url = DocumentService.signed_download_url(
+        document["checksum"], document["original_filename"], document["mime_type"], expires
     )
+    return {
+        "url": url,
+        "expires_at": datetime.utcfromtimestamp(expires) if url else None
+    }
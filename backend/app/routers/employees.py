@@ -1,36 +1,56 @@
 """
 Employees Router - Employee management endpoints
 """
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, Response
 
-from ..core.dependencies import SessionDep, CurrentUserDep, require_role
+from ..core.dependencies import SessionDep, ReadSessionDep, require_role
 from ..services.employee_service import EmployeeService
-from ..schemas.user import UserResponseSchema, UserUpdateSchema
+from ..services.document_service import DocumentService
+from .documents import UPLOAD_DIR
+from ..schemas.user import UserResponseSchema, UserUpdateSchema, EmployeeOffboardSchema
 from ..schemas.responses import (
     EmployeeListResponseSchema,
     EmployeeManageResponseSchema,
-    MessageResponseSchema
+    MessageResponseSchema,
+    OffboardResponseSchema
 )
 from ..core.enums import UserRole
+from ..core.http_cache import (
+    REVALIDATE_CACHE_CONTROL,
+    compute_etag,
+    etag_matches,
+    not_modified_response
+)
 
 router = APIRouter(prefix="/api/employees", tags=["Employees"])
 
 
+def _remove_files_later(background_tasks: BackgroundTasks, result: dict) -> None:
+    # Blob references are re-checked at removal time, not when the response is built
+    document_service = DocumentService(UPLOAD_DIR)
+    background_tasks.add_task(document_service.release_files, result["removed_documents"])
+    background_tasks.add_task(
+        DocumentService.remove_files, document_service.upload_temp_paths(result["upload_ids"])
+    )
+
+
 @router.get(
     "/",
     response_model=EmployeeListResponseSchema,
     dependencies=[Depends(require_role(UserRole.HR))]
 )
 async def get_all_employees(
-    session: SessionDep,
-    current_user: CurrentUserDep,
+    session: ReadSessionDep,
     page: int = 1,
-    page_size: int = 50
+    page_size: int = 50,
+    cursor: Optional[str] = None
 ):
     """
     Get all employees with pagination (HR only)
+    Pass `next_cursor` from the previous response as `cursor` to fetch the next page
     """
-    return await EmployeeService.get_all_employees(session, page, page_size)
+    return await EmployeeService.get_all_employees(session, page, page_size, cursor)
 
 
 @router.get(
@@ -40,13 +60,29 @@ async def get_all_employees(
 )
 async def manage_employee(
     employee_id: str,
-    session: SessionDep,
-    current_user: CurrentUserDep
+    request: Request,
+    response: Response,
+    session: ReadSessionDep,
+    page_size: int = 50,
+    tasks_cursor: Optional[str] = None,
+    documents_cursor: Optional[str] = None
 ):
     """
     Get detailed employee information (HR only)
+    Tasks and documents are paged independently with their own cursors.
+    Send the returned ETag in If-None-Match to get 304 when nothing changed.
     """
-    return await EmployeeService.get_employee_details(session, employee_id)
+    details = await EmployeeService.get_employee_details(
+        session, employee_id, page_size, tasks_cursor, documents_cursor
+    )
+    
+    etag = compute_etag(details)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+    return details
 
 
 @router.put(
@@ -57,8 +93,7 @@ async def manage_employee(
 async def update_employee(
     employee_id: str,
     update_data: UserUpdateSchema,
-    session: SessionDep,
-    current_user: CurrentUserDep
+    session: SessionDep
 ):
     """
     Update employee information (HR only)
@@ -75,10 +110,35 @@ async def update_employee(
 async def delete_employee(
     employee_id: str,
     session: SessionDep,
-    current_user: CurrentUserDep
+    background_tasks: BackgroundTasks
 ):
     """
     Delete employee and all related records (HR only)
+    Uploaded files are removed in the background after the response is sent
     """
-    await EmployeeService.delete_employee(session, employee_id)
+    result = await EmployeeService.delete_employee(session, employee_id)
+    _remove_files_later(background_tasks, result)
     return {"message": "Employee deleted successfully"}
+
+
+@router.post(
+    "/offboard",
+    response_model=OffboardResponseSchema,
+    dependencies=[Depends(require_role(UserRole.HR))]
+)
+async def offboard_employees(
+    offboard_data: EmployeeOffboardSchema,
+    session: SessionDep,
+    background_tasks: BackgroundTasks
+):
+    """
+    Delete many employees and all their related records at once (HR only)
+    Uploaded files are removed in the background after the response is sent
+    """
+    result = await EmployeeService.delete_employees(session, offboard_data.employee_ids)
+    _remove_files_later(background_tasks, result)
+    return {
+        "deleted": result["deleted"],
+        "not_found": result["not_found"],
+        "files_queued_for_removal": len({file_path for file_path, _ in result["removed_documents"]})
+    }
@@ -0,0 +1,64 @@
+"""
+Files Router - Document content behind signed, expiring URLs
+"""
+import re
+import time
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, status
+import aiofiles.os
+
+from ..services.document_service import DocumentService, download_url_signer
+from ..core.http_cache import etag_matches, not_modified_response
+from ..core.file_streaming import file_response
+from .documents import UPLOAD_DIR
+
+router = APIRouter(prefix="/api/files", tags=["Files"])
+
+SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+
+
+@router.api_route("/{checksum}", methods=["GET", "HEAD"])
+async def get_signed_file(
+    checksum: str,
+    request: Request,
+    expires: int,
+    sig: str,
+    name: Optional[str] = None,
+    media_type: Optional[str] = Query(None, alias="type")
+):
+    """
+    Serve document content from a URL issued by DocumentService.signed_download_url
+    The signature and expiry are the only credential: no Authorization header,
+    user lookup or database session is involved.
+    """
+    if not SHA256_HEX.match(checksum) or not download_url_signer.verify(
+        [checksum, name, media_type], expires, sig
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired download link"
+        )
+    
+    etag = f'"{checksum}"'
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    
+    file_path = DocumentService(UPLOAD_DIR).blob_store.path_for(checksum)
+    try:
+        stat_result = await aiofiles.os.stat(file_path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+    
+    # The content behind a checksum never changes, so it can be reused until the link expires
+    return file_response(
+        request,
+        str(file_path),
+        stat_result,
+        etag,
+        media_type=media_type,
+        filename=name,
+        cache_control=f"private, max-age={max(expires - int(time.time()), 0)}"
+    )
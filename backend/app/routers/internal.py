@@ -0,0 +1,33 @@
+"""
+Internal Router - Runtime metrics for capacity planning
+"""
+from fastapi import APIRouter, Depends
+
+from ..core.dependencies import require_role
+from ..core.enums import UserRole
+from ..database import async_engine, replica_engine, get_pool_stats
+from ..auth import principal_cache, token_cache, password_executor, revocation_list
+from ..core.pagination import approximate_counts
+from ..services.training_progress_buffer import training_progress_buffer
+
+router = APIRouter(prefix="/api/internal", tags=["Internal"])
+
+
+@router.get(
+    "/metrics",
+    dependencies=[Depends(require_role(UserRole.HR))]
+)
+async def get_metrics():
+    """
+    Get connection pool, cache, password hashing and write buffer statistics (HR only)
+    """
+    return {
+        "database_pool": get_pool_stats(async_engine),
+        "replica_pool": get_pool_stats(replica_engine) if replica_engine is not async_engine else None,
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "password_hashing": password_executor.stats(),
+        "token_revocation": revocation_list.stats(),
+        "approximate_counts": approximate_counts.stats(),
+        "training_progress_buffer": training_progress_buffer.stats()
+    }
@@ -3,7 +3,7 @@ Performance Router - Performance metrics and analytics
 """
 from fastapi import APIRouter, Depends
 
-from ..core.dependencies import SessionDep, CurrentUserDep, require_role
+from ..core.dependencies import ReadSessionDep, require_role
 from ..services.performance_service import PerformanceService
 from ..schemas.responses import OverallPerformanceSchema, EmployeePerformanceSchema
 from ..core.enums import UserRole
@@ -17,8 +17,7 @@ router = APIRouter(prefix="/api/performance", tags=["Performance"])
     dependencies=[Depends(require_role(UserRole.HR))]
 )
 async def get_overall_performance(
-    session: SessionDep,
-    current_user: CurrentUserDep
+    session: ReadSessionDep
 ):
     """
     Get overall performance statistics (HR only)
@@ -33,8 +32,7 @@ async def get_overall_performance(
 )
 async def get_employee_performance(
     employee_id: str,
-    session: SessionDep,
-    current_user: CurrentUserDep
+    session: ReadSessionDep
 ):
     """
     Get individual employee performance (HR only)
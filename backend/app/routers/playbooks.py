@@ -0,0 +1,98 @@
+"""
+Playbooks Router - Onboarding playbook management and application endpoints
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from ..core.dependencies import SessionDep, ReadSessionDep, PrincipalDep, require_role
+from ..services.playbook_service import PlaybookService
+from ..schemas.playbook import (
+    PlaybookCreateSchema,
+    PlaybookResponseSchema,
+    PlaybookApplySchema,
+    PlaybookApplyResponseSchema
+)
+from ..schemas.responses import MessageResponseSchema
+from ..core.enums import UserRole
+
+router = APIRouter(
+    prefix="/api/playbooks",
+    tags=["Playbooks"],
+    dependencies=[Depends(require_role(UserRole.HR))]
+)
+
+
+@router.get("/")
+async def get_playbooks(
+    session: ReadSessionDep,
+    page: int = 1,
+    page_size: int = 50,
+    cursor: Optional[str] = None
+):
+    """
+    Get all playbooks with their items (HR only)
+    Pass `next_cursor` from the previous response as `cursor` to fetch the next page
+    """
+    return await PlaybookService.get_all_playbooks(session, page, page_size, cursor)
+
+
+@router.post("/", response_model=PlaybookResponseSchema)
+async def create_playbook(
+    playbook_data: PlaybookCreateSchema,
+    session: SessionDep,
+    current_user: PrincipalDep
+):
+    """
+    Create a playbook from an ordered list of tasks and training modules (HR only)
+    """
+    return await PlaybookService.create_playbook(session, playbook_data, current_user.id)
+
+
+@router.get("/{playbook_id}", response_model=PlaybookResponseSchema)
+async def get_playbook(
+    playbook_id: str,
+    session: ReadSessionDep
+):
+    """
+    Get a playbook with its items (HR only)
+    """
+    return await PlaybookService.get_playbook(session, playbook_id)
+
+
+@router.delete("/{playbook_id}", response_model=MessageResponseSchema)
+async def delete_playbook(
+    playbook_id: str,
+    session: SessionDep
+):
+    """
+    Delete a playbook (HR only) - assignments it already created are kept
+    """
+    await PlaybookService.delete_playbook(session, playbook_id)
+    return {"message": "Playbook deleted successfully"}
+
+
+@router.post("/{playbook_id}/apply", response_model=PlaybookApplyResponseSchema)
+async def apply_playbook(
+    playbook_id: str,
+    request_data: PlaybookApplySchema,
+    session: SessionDep,
+    current_user: PrincipalDep
+):
+    """
+    Assign every task and training module of a playbook (HR only)
+    Send `employee_ids` for specific employees or `all_active: true` for every
+    active employee. Items an employee already has are skipped.
+    """
+    if not request_data.employee_ids and not request_data.all_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide employee_ids or all_active"
+        )
+
+    return await PlaybookService.apply_playbook(
+        session,
+        playbook_id,
+        current_user.id,
+        employee_ids=request_data.employee_ids,
+        all_active=request_data.all_active
+    )
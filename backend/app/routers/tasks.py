@@ -1,20 +1,29 @@
 """
 Tasks Router - Task management and assignment endpoints
 """
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, Field
 
-from ..core.dependencies import SessionDep, CurrentUserDep, require_role
+from ..core.dependencies import SessionDep, ReadSessionDep, PrincipalDep, require_role
 from ..services.task_service import TaskService
 from ..schemas.task import TaskCreateSchema, TaskUpdateSchema, TaskResponseSchema
-from ..schemas.responses import MessageResponseSchema
-from ..core.enums import UserRole
+from ..schemas.responses import MessageResponseSchema, AssignTaskResponseSchema
+from ..core.enums import UserRole, TaskStatus, TaskType
+from ..core.http_cache import (
+    REVALIDATE_CACHE_CONTROL,
+    etag_matches,
+    not_modified_response,
+    version_etag
+)
 
 router = APIRouter(prefix="/api/tasks", tags=["Tasks"])
 
 
 class AssignTaskRequest(BaseModel):
-    employee_id: str
+    employee_id: Optional[str] = None
+    employee_ids: Optional[List[str]] = Field(None, max_length=1000)
+    all_active: bool = False
 
 
 class CompleteTaskRequest(BaseModel):
@@ -23,18 +32,58 @@ class CompleteTaskRequest(BaseModel):
 
 @router.get("/")
 async def get_tasks(
-    session: SessionDep,
-    current_user: CurrentUserDep,
+    session: ReadSessionDep,
+    current_user: PrincipalDep,
     page: int = 1,
-    page_size: int = 50
+    page_size: int = 50,
+    cursor: Optional[str] = None,
+    approximate_total: bool = False,
+    task_status: Optional[TaskStatus] = Query(None, alias="status"),
+    task_type: Optional[TaskType] = None
 ):
     """
     Get tasks - HR sees all tasks, Employee sees assigned tasks
+    Pass `next_cursor` from the previous response as `cursor` to fetch the next page
+    `approximate_total` trades an exact total for a cached estimate on the HR list
+    `status` and `task_type` filter the employee's assigned tasks
     """
     if current_user.role == UserRole.HR:
-        return await TaskService.get_all_tasks(session, page, page_size)
+        return await TaskService.get_all_tasks(session, page, page_size, cursor, approximate_total)
     else:
-        return await TaskService.get_employee_tasks(session, current_user.id, page, page_size)
+        return await TaskService.get_employee_tasks(
+            session,
+            current_user.id,
+            page,
+            page_size,
+            cursor,
+            task_status=task_status,
+            task_type=task_type
+        )
+
+
+@router.get("/{task_id}", response_model=TaskResponseSchema)
+async def get_task(
+    task_id: str,
+    request: Request,
+    response: Response,
+    session: ReadSessionDep,
+    current_user: PrincipalDep
+):
+    """
+    Get a task with its content - HR sees any task, Employee only assigned tasks
+    The ETag changes only when the task is updated; send it in If-None-Match to get
+    304 without the content being read.
+    """
+    employee_id = None if current_user.role == UserRole.HR else current_user.id
+    updated_at = await TaskService.get_task_version(session, task_id, employee_id)
+    etag = version_etag(task_id, updated_at)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    
+    task = await TaskService.get_task_by_id(session, task_id)
+    response.headers["ETag"] = version_etag(task.id, task.updated_at)
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+    return TaskResponseSchema.from_orm(task)
 
 
 @router.post(
@@ -45,7 +94,7 @@ async def get_tasks(
 async def create_task(
     task_data: TaskCreateSchema,
     session: SessionDep,
-    current_user: CurrentUserDep
+    current_user: PrincipalDep
 ):
     """
     Create new task (HR only)
@@ -62,8 +111,7 @@ async def create_task(
 async def update_task(
     task_id: str,
     update_data: TaskUpdateSchema,
-    session: SessionDep,
-    current_user: CurrentUserDep
+    session: SessionDep
 ):
     """
     Update task (HR only)
@@ -79,8 +127,7 @@ async def update_task(
 )
 async def delete_task(
     task_id: str,
-    session: SessionDep,
-    current_user: CurrentUserDep
+    session: SessionDep
 ):
     """
     Delete task (HR only)
@@ -91,25 +138,56 @@ async def delete_task(
 
 @router.post(
     "/{task_id}/assign",
-    response_model=MessageResponseSchema,
+    response_model=AssignTaskResponseSchema,
     dependencies=[Depends(require_role(UserRole.HR))]
 )
 async def assign_task(
     task_id: str,
     request_data: AssignTaskRequest,
     session: SessionDep,
-    current_user: CurrentUserDep
+    current_user: PrincipalDep
 ):
     """
-    Assign task to employee (HR only)
+    Assign task to employees (HR only)
+    Send `employee_id` for one employee, `employee_ids` for several, or
+    `all_active: true` for every active employee.
     """
-    await TaskService.assign_task_to_employee(
+    if request_data.employee_id and not request_data.employee_ids and not request_data.all_active:
+        assignment_id = await TaskService.assign_task_to_employee(
+            session,
+            request_data.employee_id,
+            task_id,
+            current_user.id
+        )
+        return {
+            "message": "Task assigned successfully",
+            "assignment_id": assignment_id,
+            "assigned": [request_data.employee_id]
+        }
+    
+    if not request_data.employee_ids and not request_data.all_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide employee_id, employee_ids or all_active"
+        )
+    
+    employee_ids = list(request_data.employee_ids or [])
+    if request_data.employee_id:
+        employee_ids.append(request_data.employee_id)
+    
+    result = await TaskService.assign_task_to_employees(
         session,
-        request_data.employee_id,
         task_id,
-        current_user.id
+        current_user.id,
+        employee_ids=employee_ids,
+        all_active=request_data.all_active
     )
-    return {"message": "Task assigned successfully"}
+    return {
+        "message": f"Task assigned to {len(result['assigned'])} employees",
+        "assigned": result["assigned"],
+        "already_assigned": result["already_assigned"],
+        "not_found": result["not_found"]
+    }
 
 
 @router.patch("/{task_id}/complete", response_model=MessageResponseSchema)
@@ -117,7 +195,7 @@ async def complete_task(
     task_id: str,
     request_data: CompleteTaskRequest,
     session: SessionDep,
-    current_user: CurrentUserDep
+    current_user: PrincipalDep
 ):
     """
     Mark task as completed (Employee)
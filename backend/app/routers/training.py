@@ -1,25 +1,39 @@
 """
 Training Router - Training modules and progress tracking
 """
-from fastapi import APIRouter, Depends
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Request, Response
 
-from ..core.dependencies import SessionDep, CurrentUserDep
+from ..core.dependencies import SessionDep, ReadSessionDep, PrincipalDep
 from ..services.training_service import TrainingService
-from ..schemas.training import TrainingProgressUpdateSchema
+from ..schemas.training import TrainingProgressUpdateSchema, TrainingModuleResponseSchema
 from ..schemas.responses import MessageResponseSchema
+from ..core.http_cache import (
+    REVALIDATE_CACHE_CONTROL,
+    etag_matches,
+    not_modified_response,
+    version_etag
+)
 
 router = APIRouter(prefix="/api/training", tags=["Training"])
 
 
 @router.get("/")
 async def get_training_modules(
-    session: SessionDep,
-    current_user: CurrentUserDep,
+    session: ReadSessionDep,
+    current_user: PrincipalDep,
     page: int = 1,
-    page_size: int = 50
+    page_size: int = 50,
+    cursor: Optional[str] = None,
+    mandatory: Optional[bool] = None,
+    incomplete: bool = False,
+    sort: Literal["created_at", "progress"] = "created_at"
 ):
     """
     Get training modules with progress for employees
+    Pass `next_cursor` from the previous response as `cursor` to fetch the next page
+    `mandatory` filters by the mandatory flag; `incomplete` and `sort=progress`
+    (least progressed first) apply to the employee's progress
     """
     from ..core.enums import UserRole
     employee_id = current_user.id if current_user.role == UserRole.EMPLOYEE else None
@@ -28,8 +42,39 @@ async def get_training_modules(
         session,
         page=page,
         page_size=page_size,
-        employee_id=employee_id
+        employee_id=employee_id,
+        cursor=cursor,
+        mandatory=mandatory,
+        incomplete=incomplete,
+        sort_by=sort
+    )
+
+
+@router.get("/{module_id}", response_model=TrainingModuleResponseSchema)
+async def get_training_module(
+    module_id: str,
+    request: Request,
+    response: Response,
+    session: ReadSessionDep,
+    current_user: PrincipalDep
+):
+    """
+    Get a training module with its content - employees only see active modules
+    The ETag changes only when the module is updated; send it in If-None-Match to
+    get 304 without the content being read.
+    """
+    from ..core.enums import UserRole
+    updated_at = await TrainingService.get_training_module_version(
+        session, module_id, active_only=current_user.role == UserRole.EMPLOYEE
     )
+    etag = version_etag(module_id, updated_at)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    
+    module = await TrainingService.get_training_module_by_id(session, module_id)
+    response.headers["ETag"] = version_etag(module.id, module.updated_at)
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+    return TrainingModuleResponseSchema.from_orm(module)
 
 
 @router.put(
@@ -40,10 +85,11 @@ async def update_training_progress(
     training_id: str,
     progress_data: TrainingProgressUpdateSchema,
     session: SessionDep,
-    current_user: CurrentUserDep
+    current_user: PrincipalDep
 ):
     """
     Update training progress (Employee)
+    Progress is buffered and written in batches; completion (100%) is written immediately.
     """
     await TrainingService.update_training_progress(
         session,
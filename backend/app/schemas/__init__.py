@@ -7,7 +7,10 @@ from .user import (
     UserUpdateSchema,
     UserResponseSchema,
     UserLoginSchema,
-    UserLoginResponseSchema
+    UserLoginResponseSchema,
+    TokenRefreshSchema,
+    TokenResponseSchema,
+    LogoutSchema
 )
 from .task import (
     TaskBaseSchema,
@@ -25,7 +28,10 @@ from .document import (
     DocumentCreateSchema,
     DocumentUpdateSchema,
     DocumentResponseSchema,
-    DocumentUploadResponseSchema
+    DocumentUploadResponseSchema,
+    DownloadUrlResponseSchema,
+    UploadSessionCreateSchema,
+    UploadSessionResponseSchema
 )
 from .responses import (
     DashboardHRResponseSchema,
@@ -38,6 +44,7 @@ from .responses import (
     TrainingListResponseSchema,
     HRTrainingListResponseSchema,
     MessageResponseSchema,
+    BulkImportResponseSchema,
     AssignTaskResponseSchema,
     EmployeePerformanceSchema,
     OverallPerformanceSchema,
@@ -54,6 +61,14 @@ from .training import (
     EmployeeTrainingResponseSchema,
     EmployeeTrainingWithModuleSchema
 )
+from .playbook import (
+    PlaybookItemSchema,
+    PlaybookCreateSchema,
+    PlaybookItemResponseSchema,
+    PlaybookResponseSchema,
+    PlaybookApplySchema,
+    PlaybookApplyResponseSchema
+)
 
 __all__ = [
     # User schemas
@@ -63,6 +78,9 @@ __all__ = [
     "UserResponseSchema",
     "UserLoginSchema",
     "UserLoginResponseSchema",
+    "TokenRefreshSchema",
+    "TokenResponseSchema",
+    "LogoutSchema",
     
     # Task schemas
     "TaskBaseSchema",
@@ -81,6 +99,9 @@ __all__ = [
     "DocumentUpdateSchema",
     "DocumentResponseSchema", 
     "DocumentUploadResponseSchema",
+    "DownloadUrlResponseSchema",
+    "UploadSessionCreateSchema",
+    "UploadSessionResponseSchema",
     
     # Training schemas
     "TrainingModuleBaseSchema",
@@ -91,5 +112,13 @@ __all__ = [
     "EmployeeTrainingCreateSchema",
     "EmployeeTrainingUpdateSchema",
     "EmployeeTrainingResponseSchema",
-    "EmployeeTrainingWithModuleSchema"
+    "EmployeeTrainingWithModuleSchema",
+    
+    # Playbook schemas
+    "PlaybookItemSchema",
+    "PlaybookCreateSchema",
+    "PlaybookItemResponseSchema",
+    "PlaybookResponseSchema",
+    "PlaybookApplySchema",
+    "PlaybookApplyResponseSchema"
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Document Pydantic schemas for request/response validation
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
@@ -13,6 +13,7 @@ class DocumentBaseSchema(BaseModel):
     document_type: DocumentType
     original_filename: str
     file_size: Optional[int] = None
+    checksum: Optional[str] = None
     mime_type: Optional[str] = None
     verification_status: VerificationStatus = VerificationStatus.PENDING
     verification_notes: Optional[str] = None
@@ -47,4 +48,29 @@ class DocumentResponseSchema(DocumentBaseSchema):
 class DocumentUploadResponseSchema(BaseModel):
     """Schema for document upload response"""
     message: str
-    document_id: str
\ No newline at end of file
+    document_id: str
+    file_size: int
+    checksum: str
+
+
+class DownloadUrlResponseSchema(BaseModel):
+    """Schema for a signed document download URL"""
+    url: Optional[str]
+    expires_at: Optional[datetime]
+
+
+class UploadSessionCreateSchema(BaseModel):
+    """Schema for starting a resumable upload - the full size is declared up front"""
+    document_type: DocumentType
+    filename: str = Field(..., max_length=255)
+    size: int = Field(..., ge=0)
+    mime_type: Optional[str] = Field(None, max_length=100)
+    task_id: Optional[str] = None
+
+
+class UploadSessionResponseSchema(BaseModel):
+    """Resumable upload state - `offset` is where the next chunk must start"""
+    upload_id: str
+    offset: int
+    size: int
+    expires_at: datetime
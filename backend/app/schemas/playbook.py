@@ -0,0 +1,58 @@
+"""
+Playbook Pydantic schemas for request/response validation
+"""
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+from datetime import datetime
+
+
+class PlaybookItemSchema(BaseModel):
+    """Playbook entry - either a task or a training module"""
+    task_id: Optional[str] = None
+    training_module_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_single_target(self):
+        if (self.task_id is None) == (self.training_module_id is None):
+            raise ValueError("Each item needs exactly one of task_id or training_module_id")
+        return self
+
+
+class PlaybookCreateSchema(BaseModel):
+    """Schema for creating a playbook - items are applied in the given order"""
+    name: str = Field(..., max_length=200)
+    description: Optional[str] = None
+    is_active: bool = True
+    items: List[PlaybookItemSchema] = Field(..., min_length=1, max_length=200)
+
+
+class PlaybookItemResponseSchema(PlaybookItemSchema):
+    """Schema for a playbook entry in responses"""
+    position: int
+
+
+class PlaybookResponseSchema(BaseModel):
+    """Schema for playbook response"""
+    id: str
+    name: str
+    description: Optional[str]
+    is_active: bool
+    created_by: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    items: List[PlaybookItemResponseSchema]
+
+
+class PlaybookApplySchema(BaseModel):
+    """Schema for applying a playbook - the listed employees or every active employee"""
+    employee_ids: Optional[List[str]] = Field(None, max_length=1000)
+    all_active: bool = False
+
+
+class PlaybookApplyResponseSchema(BaseModel):
+    """Playbook application report"""
+    message: str
+    employees: int
+    tasks_assigned: int
+    trainings_assigned: int
+    not_found: List[str]
@@ -44,6 +44,8 @@ class EmployeeListResponseSchema(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+    total_is_approximate: bool = False
 
 
 class EmployeeDetailSchema(BaseModel):
@@ -58,6 +60,8 @@ class TaskAssignmentSchema(BaseModel):
     """Task assignment info"""
     id: str
     task_id: str
+    title: Optional[str] = None
+    task_type: Optional[str] = None
     status: str
     assigned_at: datetime
     completed_at: Optional[datetime]
@@ -77,6 +81,8 @@ class EmployeeManageResponseSchema(BaseModel):
     employee: EmployeeDetailSchema
     tasks: List[TaskAssignmentSchema]
     documents: List[DocumentInfoSchema]
+    tasks_next_cursor: Optional[str] = None
+    documents_next_cursor: Optional[str] = None
 
 
 # Task Schemas
@@ -87,7 +93,6 @@ class TaskDetailSchema(BaseModel):
     title: str
     description: Optional[str]
     task_type: str
-    content: Optional[str]
     status: str
     assigned_at: datetime
     completed_at: Optional[datetime]
@@ -99,6 +104,8 @@ class TaskListResponseSchema(BaseModel):
     total: int
     page: int = 1
     page_size: int = 50
+    next_cursor: Optional[str] = None
+    total_is_approximate: bool = False
 
 
 class TaskBasicSchema(BaseModel):
@@ -115,6 +122,8 @@ class HRTaskListResponseSchema(BaseModel):
     """HR task list response"""
     tasks: List[TaskBasicSchema]
     total: int
+    next_cursor: Optional[str] = None
+    total_is_approximate: bool = False
 
 
 # Document Schemas
@@ -127,6 +136,7 @@ class DocumentListItemSchema(BaseModel):
     verification_status: str
     uploaded_at: datetime
     verified_at: Optional[datetime]
+    download_url: Optional[str] = None
 
 
 class DocumentListResponseSchema(BaseModel):
@@ -135,6 +145,8 @@ class DocumentListResponseSchema(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+    total_is_approximate: bool = False
 
 
 # Training Schemas
@@ -161,7 +173,6 @@ class TrainingModuleHRSchema(BaseModel):
     id: str
     title: str
     description: Optional[str]
-    content: str
     duration_minutes: Optional[int]
     is_mandatory: bool
     created_at: datetime
@@ -171,12 +182,16 @@ class TrainingListResponseSchema(BaseModel):
     """Training list response"""
     training_modules: List[TrainingModuleEmployeeSchema]
     total: int
+    next_cursor: Optional[str] = None
+    total_is_approximate: bool = False
 
 
 class HRTrainingListResponseSchema(BaseModel):
     """HR training list response"""
     training_modules: List[TrainingModuleHRSchema]
     total: int
+    next_cursor: Optional[str] = None
+    total_is_approximate: bool = False
 
 
 # Generic Response Schemas
@@ -185,10 +200,38 @@ class MessageResponseSchema(BaseModel):
     message: str
 
 
+class BulkImportRowResultSchema(BaseModel):
+    """Outcome of a single row in a bulk user import"""
+    row: int
+    email: Optional[str] = None
+    status: str
+    user_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkImportResponseSchema(BaseModel):
+    """Bulk user import report"""
+    total: int
+    created: int
+    skipped: int
+    failed: int
+    results: List[BulkImportRowResultSchema]
+
+
+class OffboardResponseSchema(BaseModel):
+    """Batch employee offboarding report"""
+    deleted: List[str]
+    not_found: List[str]
+    files_queued_for_removal: int
+
+
 class AssignTaskResponseSchema(BaseModel):
     """Task assignment response"""
     message: str
     assignment_id: Optional[str] = None
+    assigned: List[str] = []
+    already_assigned: List[str] = []
+    not_found: List[str] = []
 
 
 # Performance Schemas
@@ -1,8 +1,8 @@
 """
 User Pydantic schemas for request/response validation
 """
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional
 from datetime import datetime
 
 from ..core.enums import UserRole
@@ -47,5 +47,28 @@ class UserLoginSchema(BaseModel):
 class UserLoginResponseSchema(BaseModel):
     """Schema for login response"""
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str
-    user: UserResponseSchema
\ No newline at end of file
+    user: UserResponseSchema
+
+
+class TokenRefreshSchema(BaseModel):
+    """Schema for exchanging a refresh token"""
+    refresh_token: str
+
+
+class TokenResponseSchema(BaseModel):
+    """Schema for refreshed token pair"""
+    access_token: str
+    refresh_token: str
+    token_type: str
+
+
+class LogoutSchema(BaseModel):
+    """Schema for logout - optionally revoke the refresh token too"""
+    refresh_token: Optional[str] = None
+
+
+class EmployeeOffboardSchema(BaseModel):
+    """Schema for deleting many employees at once"""
+    employee_ids: List[str] = Field(..., min_length=1, max_length=500)
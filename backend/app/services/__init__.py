@@ -7,6 +7,7 @@ from .task_service import TaskService
 from .document_service import DocumentService
 from .training_service import TrainingService
 from .performance_service import PerformanceService
+from .playbook_service import PlaybookService
 
 __all__ = [
     "AuthService",
@@ -15,4 +16,5 @@ __all__ = [
     "DocumentService",
     "TrainingService",
     "PerformanceService",
+    "PlaybookService",
 ]
@@ -1,26 +1,45 @@
 """
 Authentication Service - Handles user authentication and registration logic
 """
-from typing import Optional
-from datetime import timedelta
+import codecs
+import csv
+import json
+import uuid
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
+from datetime import datetime, timedelta
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
-from fastapi import HTTPException, status
+from sqlmodel import select, delete
+from fastapi import HTTPException, UploadFile, status
 
 from ..models.user import UserModel
+from ..models.token import RevokedTokenModel
 from ..schemas.user import UserCreateSchema
-from ..auth import authenticate_user, create_access_token, get_password_hash
+from ..auth import (
+    authenticate_user, create_access_token, create_refresh_token, get_password_hash_async,
+    hash_passwords_bulk, invalidate_cached_user, verify_refresh_token, revocation_list,
+    USER_REVOCATION_TYPE
+)
 from ..core.enums import UserRole
+from ..core.sql import dialect_insert, insert_ignoring_conflicts
+
+# Rows validated, checked and inserted together during a bulk import
+BULK_IMPORT_BATCH_SIZE = 500
+UPLOAD_READ_CHUNK_SIZE = 64 * 1024
 
 
 class AuthService:
     """Service for authentication operations"""
     
     @staticmethod
-    async def login_user(session: AsyncSession, email: str, password: str) -> tuple[str, UserModel]:
+    async def login_user(
+        session: AsyncSession,
+        email: str,
+        password: str
+    ) -> tuple[str, str, UserModel]:
         """
-        Authenticate user and generate access token
-        Returns: (access_token, user)
+        Authenticate user and generate access and refresh tokens
+        Returns: (access_token, refresh_token, user)
         """
         user = await authenticate_user(session, email, password)
         if not user:
@@ -29,13 +48,166 @@ class AuthService:
                 detail="Incorrect email or password"
             )
         
-        access_token_expires = timedelta(minutes=30)
-        access_token = create_access_token(
-            data={"sub": user.id, "role": user.role.value},
-            expires_delta=access_token_expires
+        access_token, refresh_token = AuthService._issue_tokens(user)
+        return access_token, refresh_token, user
+    
+    @staticmethod
+    def _issue_tokens(user: UserModel) -> tuple[str, str]:
+        """Create an access/refresh token pair for a user"""
+        claims = {"sub": user.id, "role": user.role.value}
+        return create_access_token(data=claims), create_refresh_token(data=claims)
+    
+    @staticmethod
+    async def refresh_tokens(session: AsyncSession, refresh_token: str) -> tuple[str, str]:
+        """
+        Exchange a refresh token for a new token pair without re-checking the password.
+        The presented refresh token is rotated out (revoked).
+        Returns: (access_token, refresh_token)
+        """
+        payload = verify_refresh_token(refresh_token)
+        
+        user = await session.get(UserModel, payload["sub"])
+        if not user or not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials"
+            )
+        
+        # Only the request that actually rotates the token out gets a new pair;
+        # a replay, even one racing it on another worker, is rejected
+        if not await AuthService.revoke_token(session, payload):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials"
+            )
+        return AuthService._issue_tokens(user)
+    
+    @staticmethod
+    async def logout_user(
+        session: AsyncSession,
+        access_payload: dict,
+        refresh_token: Optional[str] = None
+    ) -> None:
+        """Revoke the presented access token and, if given, the caller's refresh token"""
+        payloads = [access_payload]
+        if refresh_token:
+            refresh_payload = verify_refresh_token(refresh_token)
+            if refresh_payload["sub"] != access_payload["sub"]:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Refresh token does not belong to the current user"
+                )
+            payloads.append(refresh_payload)
+        
+        for payload in payloads:
+            await AuthService.revoke_token(session, payload, commit=False)
+        await session.commit()
+    
+    @staticmethod
+    async def revoke_token(session: AsyncSession, payload: dict, commit: bool = True) -> bool:
+        """
+        Add a token to the persistent denylist and the in-memory revocation list.
+        Returns False if the token was already revoked, here or by another worker
+        (the insert ignores an existing jti instead of failing on it).
+        """
+        jti = payload.get("jti")
+        # Tokens issued before jti support can only expire
+        if jti is None or revocation_list.is_token_revoked(jti):
+            return False
+        
+        inserted = await insert_ignoring_conflicts(
+            session,
+            RevokedTokenModel,
+            [{
+                "jti": jti,
+                "user_id": payload.get("sub"),
+                "token_type": payload.get("type", "access"),
+                "expires_at": datetime.utcfromtimestamp(payload["exp"]),
+                "revoked_at": datetime.utcnow()
+            }],
+            index_elements=["jti"],
+            returning=[RevokedTokenModel.jti]
         )
+        if commit:
+            await session.commit()
+        revocation_list.revoke_token(jti, payload["exp"])
+        return bool(inserted)
+    
+    @staticmethod
+    async def record_user_revocations(session: AsyncSession, user_ids: List[str]) -> None:
+        """
+        Persist user-wide revocations in the caller's transaction, so tokens issued
+        before now stay rejected across restarts and workers. Rows are kept for the
+        longest token lifetime; revoking a user again moves the cutoff forward.
+        """
+        if not user_ids:
+            return
         
-        return access_token, user
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=revocation_list.max_token_lifetime_seconds)
+        upsert_stmt = dialect_insert(session, RevokedTokenModel).values([
+            {
+                "jti": f"{USER_REVOCATION_TYPE}:{user_id}",
+                "user_id": user_id,
+                "token_type": USER_REVOCATION_TYPE,
+                "expires_at": expires_at,
+                "revoked_at": now
+            }
+            for user_id in dict.fromkeys(user_ids)
+        ])
+        upsert_stmt = upsert_stmt.on_conflict_do_update(
+            index_elements=["jti"],
+            set_={
+                "expires_at": upsert_stmt.excluded.expires_at,
+                "revoked_at": upsert_stmt.excluded.revoked_at
+            }
+        )
+        await session.execute(upsert_stmt)
+    
+    @staticmethod
+    async def sync_revoked_tokens(
+        session: AsyncSession,
+        since: Optional[datetime] = None
+    ) -> None:
+        """
+        Mirror unexpired denylist entries (single tokens and user-wide cutoffs) into memory.
+        With `since`, only entries revoked from that time on are loaded (e.g. by other workers).
+        """
+        now = datetime.utcnow()
+        statement = select(
+            RevokedTokenModel.jti,
+            RevokedTokenModel.user_id,
+            RevokedTokenModel.token_type,
+            RevokedTokenModel.expires_at,
+            RevokedTokenModel.revoked_at
+        ).where(
+            RevokedTokenModel.expires_at > now
+        )
+        if since is not None:
+            statement = statement.where(RevokedTokenModel.revoked_at >= since)
+        
+        rows = (await session.execute(statement)).all()
+        epoch = datetime(1970, 1, 1)
+        revocation_list.load(
+            (
+                (row.jti, (row.expires_at - epoch).total_seconds())
+                for row in rows if row.token_type != USER_REVOCATION_TYPE
+            ),
+            replace=since is None,
+            user_cutoffs=(
+                (row.user_id, (row.revoked_at - epoch).total_seconds())
+                for row in rows if row.token_type == USER_REVOCATION_TYPE
+            )
+        )
+    
+    @staticmethod
+    async def purge_expired_revocations(session: AsyncSession) -> None:
+        """Delete denylist rows for tokens that have expired anyway"""
+        await session.execute(
+            delete(RevokedTokenModel).where(RevokedTokenModel.expires_at <= datetime.utcnow())
+        )
+        await session.commit()
+        revocation_list.prune()
     
     @staticmethod
     async def register_user(
@@ -58,7 +230,7 @@ class AuthService:
             )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         db_user = UserModel(
             name=user_data.name,
             email=user_data.email,
@@ -70,6 +242,7 @@ class AuthService:
         session.add(db_user)
         await session.commit()
         await session.refresh(db_user)
+        invalidate_cached_user(db_user.id)
         
         return db_user
     
@@ -79,3 +252,204 @@ class AuthService:
         statement = select(UserModel).where(UserModel.email == email)
         result = await session.execute(statement)
         return result.scalar_one_or_none()
+    
+    @staticmethod
+    async def bulk_register_users(
+        session: AsyncSession,
+        upload: UploadFile,
+        file_format: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Register many users from a CSV (with header) or NDJSON upload (HR only operation).
+        The upload is streamed and processed in batches; each batch costs one email
+        lookup, one parallel hashing pass and one multi-row INSERT.
+        Returns a per-row report.
+        """
+        file_format = (file_format or AuthService._detect_import_format(upload)).lower()
+        if file_format not in ("csv", "ndjson"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unsupported import format, expected csv or ndjson"
+            )
+        
+        results: List[Dict[str, Any]] = []
+        seen_emails: set = set()
+        async for batch in AuthService._iter_import_batches(upload, file_format):
+            results.extend(await AuthService._import_batch(session, batch, seen_emails))
+        
+        return {
+            "total": len(results),
+            "created": sum(1 for r in results if r["status"] == "created"),
+            "skipped": sum(1 for r in results if r["status"] == "duplicate"),
+            "failed": sum(1 for r in results if r["status"] == "invalid"),
+            "results": results
+        }
+    
+    @staticmethod
+    def _detect_import_format(upload: UploadFile) -> str:
+        """Guess the import format from the filename or content type"""
+        filename = (upload.filename or "").lower()
+        content_type = (upload.content_type or "").lower()
+        if filename.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type:
+            return "ndjson"
+        return "csv"
+    
+    @staticmethod
+    async def _iter_upload_lines(upload: UploadFile) -> AsyncIterator[str]:
+        """Yield decoded lines from an upload without reading it all into memory"""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        pending = ""
+        while True:
+            chunk = await upload.read(UPLOAD_READ_CHUNK_SIZE)
+            pending += decoder.decode(chunk, final=not chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+            if not chunk:
+                break
+        if pending:
+            yield pending.rstrip("\r")
+    
+    @staticmethod
+    async def _iter_import_batches(
+        upload: UploadFile,
+        file_format: str
+    ) -> AsyncIterator[List[Tuple[int, Any]]]:
+        """Yield batches of (row_number, raw_row) parsed from the upload"""
+        batch: List[Tuple[int, Any]] = []
+        header: Optional[List[str]] = None
+        row_number = 0
+        
+        async for line in AuthService._iter_upload_lines(upload):
+            if not line.strip():
+                continue
+            
+            if file_format == "csv":
+                # Records are parsed line by line, so quoted fields cannot span lines
+                values = next(csv.reader([line]))
+                if header is None:
+                    header = [column.strip().lower() for column in values]
+                    continue
+                row_number += 1
+                batch.append((row_number, dict(zip(header, values))))
+            else:
+                row_number += 1
+                try:
+                    batch.append((row_number, json.loads(line)))
+                except json.JSONDecodeError as e:
+                    batch.append((row_number, e))
+            
+            if len(batch) >= BULK_IMPORT_BATCH_SIZE:
+                yield batch
+                batch = []
+        
+        if batch:
+            yield batch
+    
+    @staticmethod
+    async def _import_batch(
+        session: AsyncSession,
+        batch: List[Tuple[int, Any]],
+        seen_emails: set
+    ) -> List[Dict[str, Any]]:
+        """Validate, de-duplicate, hash and insert one batch of import rows"""
+        results: Dict[int, Dict[str, Any]] = {}
+        candidates: List[Tuple[int, UserCreateSchema]] = []
+        
+        for row_number, raw in batch:
+            try:
+                if isinstance(raw, Exception):
+                    raise ValueError(f"Malformed JSON: {raw}")
+                if not isinstance(raw, dict):
+                    raise ValueError("Row must be an object")
+                raw = {key: value for key, value in raw.items() if value not in (None, "")}
+                raw.setdefault("role", UserRole.EMPLOYEE.value)
+                user_data = UserCreateSchema(**raw)
+            except (ValidationError, ValueError) as e:
+                email = raw.get("email") if isinstance(raw, dict) else None
+                results[row_number] = AuthService._import_result(
+                    row_number, email, "invalid", error=str(e)
+                )
+                continue
+            
+            if user_data.email in seen_emails:
+                results[row_number] = AuthService._import_result(
+                    row_number, user_data.email, "duplicate", error="Duplicate email in upload"
+                )
+                continue
+            seen_emails.add(user_data.email)
+            candidates.append((row_number, user_data))
+        
+        # One set-based uniqueness check per batch
+        if candidates:
+            existing_stmt = select(UserModel.email).where(
+                UserModel.email.in_([user_data.email for _, user_data in candidates])
+            )
+            existing_result = await session.execute(existing_stmt)
+            existing_emails = set(existing_result.scalars().all())
+            
+            new_users = []
+            for row_number, user_data in candidates:
+                if user_data.email in existing_emails:
+                    results[row_number] = AuthService._import_result(
+                        row_number, user_data.email, "duplicate", error="Email already registered"
+                    )
+                else:
+                    new_users.append((row_number, user_data))
+            
+            password_hashes = await hash_passwords_bulk([u.password for _, u in new_users])
+            
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "name": user_data.name,
+                    "email": user_data.email,
+                    "password_hash": password_hash,
+                    "role": user_data.role,
+                    "is_active": user_data.is_active,
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for (_, user_data), password_hash in zip(new_users, password_hashes)
+            ]
+            
+            inserted: Dict[str, str] = {}
+            if rows:
+                # Emails registered concurrently since the check above are skipped, not fatal
+                insert_stmt = dialect_insert(session, UserModel).values(rows)
+                insert_stmt = insert_stmt.on_conflict_do_nothing(
+                    index_elements=["email"]
+                ).returning(UserModel.id, UserModel.email)
+                insert_result = await session.execute(insert_stmt)
+                inserted = {email: user_id for user_id, email in insert_result.all()}
+                await session.commit()
+            
+            for row_number, user_data in new_users:
+                if user_data.email in inserted:
+                    results[row_number] = AuthService._import_result(
+                        row_number, user_data.email, "created", user_id=inserted[user_data.email]
+                    )
+                else:
+                    results[row_number] = AuthService._import_result(
+                        row_number, user_data.email, "duplicate", error="Email already registered"
+                    )
+        
+        return [results[row_number] for row_number in sorted(results)]
+    
+    @staticmethod
+    def _import_result(
+        row: int,
+        email: Optional[str],
+        row_status: str,
+        user_id: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build one entry of the bulk import report"""
+        return {
+            "row": row,
+            "email": email,
+            "status": row_status,
+            "user_id": user_id,
+            "error": error
+        }
@@ -1,15 +1,41 @@
 """
 Document Service - Handles document management business logic
 """
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, List, Optional, Sequence, Set, Tuple
+from datetime import datetime, timedelta
 from pathlib import Path
+from urllib.parse import urlencode
+import os
+from dotenv import load_dotenv
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, func
+from sqlmodel import select
 from fastapi import UploadFile, HTTPException, status
+from starlette.requests import ClientDisconnect
 import aiofiles
+import aiofiles.os
 
-from ..models.document import DocumentModel
+from ..database import AsyncSessionLocal
+from ..models.document import DocumentModel, UploadSessionModel
 from ..core.enums import DocumentType, VerificationStatus
+from ..core.pagination import clamp_page_size, fetch_page, approximate_row_count
+from ..core.blob_store import BlobStore, BlobTooLargeError
+from ..core.signed_urls import UrlSigner
+from ..schemas.document import UploadSessionCreateSchema
+from ..auth import SECRET_KEY
+
+load_dotenv()
+
+# Largest accepted upload in bytes
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))
+# Largest request body on document routes: one file plus multipart boundaries and form fields
+MAX_REQUEST_BODY_SIZE = MAX_FILE_SIZE + 64 * 1024
+# Signed download links stay valid for between one and two of these periods
+DOWNLOAD_URL_TTL_SECONDS = int(os.getenv("DOWNLOAD_URL_TTL_SECONDS", "300"))
+# Resumable uploads not finished within this many hours are discarded
+UPLOAD_SESSION_TTL_HOURS = float(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+
+download_url_signer = UrlSigner(SECRET_KEY, DOWNLOAD_URL_TTL_SECONDS, purpose="document-download")
 
 
 class DocumentService:
@@ -17,36 +43,49 @@ class DocumentService:
     
     def __init__(self, upload_dir: Path):
         self.upload_dir = upload_dir
+        # Uploaded content is stored once per distinct SHA-256
+        self.blob_store = BlobStore(upload_dir / "blobs")
     
     async def get_all_documents(
         self,
         session: AsyncSession,
         page: int = 1,
         page_size: int = 50,
-        employee_id: str = None
+        employee_id: str = None,
+        cursor: Optional[str] = None,
+        approximate_total: bool = False
     ) -> Dict[str, Any]:
-        """Get paginated list of documents"""
+        """
+        Get paginated list of documents, ordered by (uploaded_at, id).
+        `approximate_total` only applies to the unfiltered list, where the total is
+        a cached table estimate instead of an exact count.
+        """
         # Build base query
         if employee_id:
-            count_stmt = select(func.count()).select_from(DocumentModel).where(
-                DocumentModel.employee_id == employee_id
-            )
             docs_stmt = select(DocumentModel).where(
                 DocumentModel.employee_id == employee_id
             )
+            approximate_total = False
         else:
-            count_stmt = select(func.count()).select_from(DocumentModel)
             docs_stmt = select(DocumentModel)
         
-        # Get total count
-        total_result = await session.execute(count_stmt)
-        total = total_result.scalar()
-        
-        # Get paginated documents
-        offset = (page - 1) * page_size
-        docs_result = await session.execute(docs_stmt.offset(offset).limit(page_size))
-        documents = docs_result.scalars().all()
+        # Get paginated documents with the total
+        page_size = clamp_page_size(page_size)
+        documents, next_cursor, total = await fetch_page(
+            session,
+            docs_stmt,
+            order_by=(DocumentModel.uploaded_at, DocumentModel.id),
+            key=lambda doc: (doc.uploaded_at, doc.id),
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            scalars=True,
+            with_total=not approximate_total
+        )
+        if approximate_total:
+            total = await approximate_row_count(session, DocumentModel)
         
+        expires = download_url_signer.expiry()
         return {
             "documents": [
                 {
@@ -56,12 +95,70 @@ class DocumentService:
                     "original_filename": doc.original_filename,
                     "verification_status": doc.verification_status.value,
                     "uploaded_at": doc.uploaded_at,
-                    "verified_at": doc.verified_at
+                    "verified_at": doc.verified_at,
+                    "download_url": DocumentService.signed_download_url(
+                        doc.checksum, doc.original_filename, doc.mime_type, expires
+                    )
                 } for doc in documents
             ],
             "total": total,
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "total_is_approximate": approximate_total
+        }
+    
+    @staticmethod
+    def signed_download_url(
+        checksum: Optional[str],
+        filename: str,
+        mime_type: Optional[str],
+        expires: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Short-lived URL serving a document's content without authentication or a
+        database lookup. Only content-addressed documents (with a checksum) get one.
+        """
+        if not checksum:
+            return None
+        expires = expires or download_url_signer.expiry()
+        params = {"expires": expires, "name": filename, "type": mime_type}
+        params["sig"] = download_url_signer.sign([checksum, filename, mime_type], expires)
+        query = urlencode({key: value for key, value in params.items() if value is not None})
+        return f"/api/files/{checksum}?{query}"
+    
+    async def get_document_file(
+        self,
+        session: AsyncSession,
+        document_id: str,
+        employee_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get what is needed to serve a document's content, without touching the disk.
+        With `employee_id` the document must belong to that employee.
+        """
+        file_stmt = select(
+            DocumentModel.file_path,
+            DocumentModel.checksum,
+            DocumentModel.mime_type,
+            DocumentModel.original_filename
+        ).where(DocumentModel.id == document_id)
+        if employee_id:
+            file_stmt = file_stmt.where(DocumentModel.employee_id == employee_id)
+        document = (await session.execute(file_stmt)).one_or_none()
+        if document is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document not found"
+            )
+        
+        # Content-addressed documents are located by checksum, older ones by their own path
+        file_path = self.blob_store.path_for(document.checksum) if document.checksum else Path(document.file_path)
+        return {
+            "file_path": str(file_path),
+            "checksum": document.checksum,
+            "mime_type": document.mime_type,
+            "original_filename": document.original_filename
         }
     
     async def upload_document(
@@ -82,38 +179,293 @@ class DocumentService:
                 detail="Invalid document type"
             )
         
-        # Create file path
-        filename = f"{employee_id}_{doc_type.value}_{file.filename}"
-        file_path = self.upload_dir / filename
-        
-        # Save file asynchronously
+        # Store the content - identical uploads share one blob
         try:
-            async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
-        except Exception as e:
+            checksum, file_size, temp_path = await self.blob_store.save(file.read, MAX_FILE_SIZE)
+        except BlobTooLargeError:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds the {MAX_FILE_SIZE} byte limit"
+            )
+        except OSError as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"File upload failed: {str(e)}"
             )
         
-        # Save document metadata
         document = DocumentModel(
             employee_id=employee_id,
             document_type=doc_type,
-            original_filename=file.filename,
-            file_path=str(file_path),
-            file_size=file.size,
+            original_filename=file.filename or "upload",
+            file_size=file_size,
+            checksum=checksum,
             mime_type=file.content_type,
             task_id=task_id
         )
+        try:
+            return await self._save_document(session, document, temp_path)
+        except Exception:
+            await self.blob_store.discard(temp_path)
+            raise
+    
+    async def _save_document(
+        self,
+        session: AsyncSession,
+        document: DocumentModel,
+        temp_path: Path
+    ) -> DocumentModel:
+        """
+        Commit a document row, then move its content from `temp_path` into the blob
+        store - in that order, so a concurrent release of the same blob cannot win
+        """
+        document.file_path = str(self.blob_store.path_for(document.checksum))
+        # Only the base name of the client's filename is kept
+        document.original_filename = Path(document.original_filename).name or "upload"
         
         session.add(document)
-        await session.commit()
+        try:
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        try:
+            await self.blob_store.commit(temp_path, document.checksum)
+        except OSError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"File upload failed: {str(e)}"
+            )
         await session.refresh(document)
         
         return document
     
+    def _upload_temp_path(self, upload_id: str) -> Path:
+        return self.blob_store.temp_dir / f"{upload_id}.upload"
+    
+    def upload_temp_paths(self, upload_ids: List[str]) -> List[str]:
+        """Temp files of the given uploads, for removal once their rows are deleted"""
+        return [str(self._upload_temp_path(upload_id)) for upload_id in upload_ids]
+    
+    async def create_upload_session(
+        self,
+        session: AsyncSession,
+        upload_data: UploadSessionCreateSchema,
+        employee_id: str
+    ) -> Dict[str, Any]:
+        """Start a resumable upload of `upload_data.size` bytes"""
+        if upload_data.size > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds the {MAX_FILE_SIZE} byte limit"
+            )
+        
+        # Abandoned uploads are cleaned up whenever a new one starts
+        await self.purge_expired_uploads(session)
+        
+        now = datetime.utcnow()
+        upload = UploadSessionModel(
+            employee_id=employee_id,
+            document_type=upload_data.document_type,
+            original_filename=upload_data.filename,
+            mime_type=upload_data.mime_type,
+            task_id=upload_data.task_id,
+            total_size=upload_data.size,
+            created_at=now,
+            updated_at=now,
+            expires_at=now + timedelta(hours=UPLOAD_SESSION_TTL_HOURS)
+        )
+        
+        try:
+            await aiofiles.os.makedirs(self.blob_store.temp_dir, exist_ok=True)
+            async with aiofiles.open(self._upload_temp_path(upload.id), "wb"):
+                pass
+        except OSError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"File upload failed: {str(e)}"
+            )
+        
+        session.add(upload)
+        try:
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            await DocumentService.remove_files([str(self._upload_temp_path(upload.id))])
+            raise
+        
+        return self._upload_state(upload)
+    
+    @staticmethod
+    def _upload_state(upload: UploadSessionModel) -> Dict[str, Any]:
+        return {
+            "upload_id": upload.id,
+            "offset": upload.received_bytes,
+            "size": upload.total_size,
+            "expires_at": upload.expires_at
+        }
+    
+    @staticmethod
+    async def get_upload_session(
+        session: AsyncSession,
+        upload_id: str,
+        employee_id: str
+    ) -> Dict[str, Any]:
+        """Get the state of an unexpired upload owned by the employee"""
+        upload = await DocumentService._get_upload(session, upload_id, employee_id)
+        return DocumentService._upload_state(upload)
+    
+    @staticmethod
+    async def _get_upload(
+        session: AsyncSession,
+        upload_id: str,
+        employee_id: str
+    ) -> UploadSessionModel:
+        upload_stmt = select(UploadSessionModel).where(
+            UploadSessionModel.id == upload_id,
+            UploadSessionModel.employee_id == employee_id,
+            UploadSessionModel.expires_at > datetime.utcnow()
+        )
+        upload = (await session.execute(upload_stmt)).scalar_one_or_none()
+        
+        if not upload:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found"
+            )
+        
+        return upload
+    
+    async def write_upload_chunk(
+        self,
+        session: AsyncSession,
+        upload_id: str,
+        employee_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes]
+    ) -> Dict[str, Any]:
+        """
+        Append a chunk starting at `offset` and return the upload's new state.
+        The offset must equal the bytes received so far. Whatever arrives before a
+        client disconnects is kept, so the client can ask for the offset and resume.
+        """
+        upload = await self._get_upload(session, upload_id, employee_id)
+        if offset != upload.received_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload is at offset {upload.received_bytes}, not {offset}"
+            )
+        state = self._upload_state(upload)
+        total_size = upload.total_size
+        # Don't hold a pooled connection while the body streams in
+        await session.commit()
+        
+        written = 0
+        too_large = False
+        try:
+            async with aiofiles.open(self._upload_temp_path(upload_id), "r+b") as f:
+                # Bytes past the recorded offset were never acknowledged - overwrite them
+                await f.truncate(offset)
+                await f.seek(offset)
+                async for chunk in chunks:
+                    if offset + written + len(chunk) > total_size:
+                        too_large = True
+                        break
+                    await f.write(chunk)
+                    written += len(chunk)
+        except ClientDisconnect:
+            pass
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found"
+            )
+        
+        # Only advance from the offset this chunk was validated against
+        new_offset = offset + written
+        result = await session.execute(
+            update(UploadSessionModel)
+            .where(
+                UploadSessionModel.id == upload_id,
+                UploadSessionModel.received_bytes == offset
+            )
+            .values(received_bytes=new_offset, updated_at=datetime.utcnow())
+        )
+        await session.commit()
+        
+        if result.rowcount == 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload was modified by another request"
+            )
+        if too_large:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Upload exceeds its declared size of {total_size} bytes"
+            )
+        
+        return {**state, "offset": new_offset}
+    
+    async def complete_upload(
+        self,
+        session: AsyncSession,
+        upload_id: str,
+        employee_id: str
+    ) -> DocumentModel:
+        """Finalize a fully received upload into a document"""
+        upload = await self._get_upload(session, upload_id, employee_id)
+        if upload.received_bytes != upload.total_size:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload is incomplete: {upload.received_bytes} of {upload.total_size} bytes received"
+            )
+        
+        # The assembled file is renamed into the blob store, not copied
+        temp_path = self._upload_temp_path(upload_id)
+        try:
+            checksum = await self.blob_store.digest_file(temp_path)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found"
+            )
+        
+        document = DocumentModel(
+            employee_id=employee_id,
+            document_type=upload.document_type,
+            original_filename=upload.original_filename,
+            file_size=upload.total_size,
+            checksum=checksum,
+            mime_type=upload.mime_type,
+            task_id=upload.task_id
+        )
+        await session.delete(upload)
+        return await self._save_document(session, document, temp_path)
+    
+    async def abort_upload(
+        self,
+        session: AsyncSession,
+        upload_id: str,
+        employee_id: str
+    ) -> None:
+        """Discard an upload and the bytes received so far"""
+        upload = await self._get_upload(session, upload_id, employee_id)
+        await session.delete(upload)
+        await session.commit()
+        await DocumentService.remove_files([str(self._upload_temp_path(upload_id))])
+    
+    async def purge_expired_uploads(self, session: AsyncSession) -> int:
+        """Delete expired uploads with their temp files and return how many there were"""
+        expired_stmt = delete(UploadSessionModel).where(
+            UploadSessionModel.expires_at <= datetime.utcnow()
+        ).returning(UploadSessionModel.id)
+        expired_ids = (await session.execute(expired_stmt)).scalars().all()
+        if not expired_ids:
+            return 0
+        
+        await session.commit()
+        await DocumentService.remove_files(self.upload_temp_paths(expired_ids))
+        return len(expired_ids)
+    
     async def verify_document(
         self,
         session: AsyncSession,
@@ -131,10 +483,48 @@ class DocumentService:
         
         document.verification_status = verification_status
         if verification_status in [VerificationStatus.APPROVED, VerificationStatus.REJECTED]:
-            from datetime import datetime
             document.verified_at = datetime.utcnow()
         
         await session.commit()
         await session.refresh(document)
         
         return document
+    
+    async def release_files(self, removed_documents: Sequence[Tuple[str, Optional[str]]]) -> int:
+        """
+        Remove the stored files of documents that were just deleted and return how
+        many went. A blob is shared by every document with its checksum, so it is only
+        removed when no document references it - checked again at removal time, which
+        keeps it when an upload of the same content commits concurrently. Documents
+        stored before checksums were recorded own their file outright.
+        """
+        legacy_paths = sorted({file_path for file_path, checksum in removed_documents if not checksum})
+        await DocumentService.remove_files(legacy_paths)
+        
+        checksums = {checksum for _, checksum in removed_documents if checksum}
+        try:
+            released = await self.blob_store.release(checksums, DocumentService._referenced_checksums)
+        except Exception as e:
+            print(f"⚠️  Could not release stored files: {e}")
+            released = []
+        return len(legacy_paths) + len(released)
+    
+    @staticmethod
+    async def _referenced_checksums(checksums: Set[str]) -> Set[str]:
+        # A new session each time, so documents committed since the last check are seen
+        async with AsyncSessionLocal() as session:
+            referenced_stmt = select(DocumentModel.checksum).where(
+                DocumentModel.checksum.in_(checksums)
+            ).distinct()
+            return set((await session.execute(referenced_stmt)).scalars().all())
+    
+    @staticmethod
+    async def remove_files(file_paths: List[str]) -> None:
+        """Delete stored files of removed documents, skipping ones already gone"""
+        for file_path in file_paths:
+            try:
+                await aiofiles.os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️  Could not remove {file_path}: {e}")
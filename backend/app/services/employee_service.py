@@ -1,81 +1,144 @@
 """
 Employee Service - Handles employee management business logic
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete
 from sqlmodel import select, func
 from fastapi import HTTPException, status
 
 from ..models.user import UserModel
-from ..models.task import EmployeeTaskModel
-from ..models.document import DocumentModel
+from ..models.task import TaskModel, EmployeeTaskModel
+from ..models.document import DocumentModel, UploadSessionModel
 from ..models.training import EmployeeTrainingModel
 from ..schemas.user import UserUpdateSchema
-from ..core.enums import UserRole, TaskStatus
+from ..auth import invalidate_cached_user, revoke_user_tokens
+from ..core.enums import UserRole, TaskStatus, TaskType, DocumentType, VerificationStatus
+from ..core.pagination import clamp_page_size, encode_cursor, fetch_page, seek_after
+from ..core.sql import json_array_agg
+from .auth_service import AuthService
+from .document_service import DocumentService
 
 
 class EmployeeService:
     """Service for employee management operations"""
     
+    @staticmethod
+    def task_stats_columns():
+        """
+        Aggregate columns over EmployeeTaskModel rows: total and completed assignments.
+        Counting the assignment id keeps employees without tasks at zero under a LEFT JOIN.
+        """
+        return (
+            func.count(EmployeeTaskModel.id).label("total_tasks"),
+            func.count(EmployeeTaskModel.id).filter(
+                EmployeeTaskModel.status == TaskStatus.COMPLETED
+            ).label("completed_tasks")
+        )
+    
+    @staticmethod
+    def task_stats(total_tasks: int, completed_tasks: int) -> Dict[str, Any]:
+        """Build the task statistics dict from aggregated counts"""
+        return {
+            "total_tasks": total_tasks,
+            "completed_tasks": completed_tasks,
+            "completion_rate": completed_tasks / total_tasks * 100 if total_tasks > 0 else 0
+        }
+    
     @staticmethod
     async def get_all_employees(
         session: AsyncSession,
         page: int = 1,
-        page_size: int = 50
+        page_size: int = 50,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get paginated list of all employees with statistics"""
-        # Get total count
-        count_stmt = select(func.count()).select_from(UserModel).where(
+        """Get paginated list of all employees with statistics, ordered by (created_at, id)"""
+        # Get the page, its task statistics and the total in one grouped LEFT JOIN
+        page_size = clamp_page_size(page_size)
+        employees_stmt = select(
+            UserModel.id,
+            UserModel.name,
+            UserModel.email,
+            UserModel.is_active,
+            UserModel.created_at,
+            *EmployeeService.task_stats_columns()
+        ).outerjoin(
+            EmployeeTaskModel, EmployeeTaskModel.employee_id == UserModel.id
+        ).where(
             UserModel.role == UserRole.EMPLOYEE
+        ).group_by(
+            UserModel.id
+        )
+        employees_result, next_cursor, total = await fetch_page(
+            session,
+            employees_stmt,
+            order_by=(UserModel.created_at, UserModel.id),
+            key=lambda row: (row.created_at, row.id),
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            count_stmt=select(UserModel.id).where(UserModel.role == UserRole.EMPLOYEE)
         )
-        total_result = await session.execute(count_stmt)
-        total = total_result.scalar()
         
-        # Get paginated employees
-        offset = (page - 1) * page_size
-        employees_stmt = select(UserModel).where(
-            UserModel.role == UserRole.EMPLOYEE
-        ).offset(offset).limit(page_size)
-        employees_result = await session.execute(employees_stmt)
-        employees = employees_result.scalars().all()
-        
-        # Build employee data with statistics
-        employee_data = []
-        for employee in employees:
-            stats = await EmployeeService._get_employee_task_stats(session, employee.id)
-            employee_data.append({
-                "id": employee.id,
-                "name": employee.name,
-                "email": employee.email,
-                "is_active": employee.is_active,
-                **stats
-            })
+        employee_data = [
+            {
+                "id": row.id,
+                "name": row.name,
+                "email": row.email,
+                "is_active": row.is_active,
+                **EmployeeService.task_stats(row.total_tasks, row.completed_tasks)
+            } for row in employees_result
+        ]
         
         return {
             "employees": employee_data,
             "total": total,
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "total_is_approximate": False
         }
     
     @staticmethod
-    async def _get_employee_task_stats(session: AsyncSession, employee_id: str) -> Dict[str, Any]:
-        """Get task statistics for an employee"""
-        tasks_stmt = select(EmployeeTaskModel).where(
+    async def get_employee_task_stats(session: AsyncSession, employee_id: str) -> Dict[str, Any]:
+        """Get task statistics for a single employee"""
+        stats_stmt = select(*EmployeeService.task_stats_columns()).where(
             EmployeeTaskModel.employee_id == employee_id
         )
-        tasks_result = await session.execute(tasks_stmt)
-        tasks = tasks_result.scalars().all()
-        
-        completed = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
-        total = len(tasks)
+        row = (await session.execute(stats_stmt)).one()
+        return EmployeeService.task_stats(row.total_tasks, row.completed_tasks)
+    
+    @staticmethod
+    async def resolve_employee_ids(
+        session: AsyncSession,
+        employee_ids: Optional[List[str]] = None,
+        all_active: bool = False,
+        employees_only: bool = True
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Resolve a bulk target - the listed ids, or every active employee - in one query.
+        With `employees_only=False` listed ids may be any existing user, whatever the role.
+        Returns (ids found, requested ids that are not employees / users).
+        """
+        if all_active:
+            targets_stmt = select(UserModel.id).where(
+                UserModel.role == UserRole.EMPLOYEE,
+                UserModel.is_active == True
+            ).order_by(UserModel.id)
+            return list((await session.execute(targets_stmt)).scalars().all()), []
         
-        return {
-            "total_tasks": total,
-            "completed_tasks": completed,
-            "completion_rate": completed / total * 100 if total > 0 else 0
-        }
+        requested_ids = list(dict.fromkeys(employee_ids or []))
+        if not requested_ids:
+            return [], []
+        targets_stmt = select(UserModel.id).where(UserModel.id.in_(requested_ids))
+        if employees_only:
+            targets_stmt = targets_stmt.where(UserModel.role == UserRole.EMPLOYEE)
+        found_ids = set((await session.execute(targets_stmt)).scalars().all())
+        return (
+            [employee_id for employee_id in requested_ids if employee_id in found_ids],
+            [employee_id for employee_id in requested_ids if employee_id not in found_ids]
+        )
     
     @staticmethod
     async def get_employee_by_id(
@@ -99,24 +162,113 @@ class EmployeeService:
     @staticmethod
     async def get_employee_details(
         session: AsyncSession,
-        employee_id: str
+        employee_id: str,
+        page_size: int = 50,
+        tasks_cursor: Optional[str] = None,
+        documents_cursor: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get detailed employee information including tasks and documents"""
-        employee = await EmployeeService.get_employee_by_id(session, employee_id)
+        """
+        Get detailed employee information including tasks and documents in one query.
+        Each embedded list holds at most `page_size` items ordered by (assigned_at/uploaded_at, id);
+        pass the returned `tasks_next_cursor` / `documents_next_cursor` to continue a section.
+        """
+        page_size = clamp_page_size(page_size)
         
-        # Get employee's tasks
-        tasks_stmt = select(EmployeeTaskModel).where(
-            EmployeeTaskModel.employee_id == employee.id
+        # Task assignments joined to their task, aggregated to a JSON array
+        task_order = (EmployeeTaskModel.assigned_at, EmployeeTaskModel.id)
+        tasks_stmt = select(
+            EmployeeTaskModel.id,
+            EmployeeTaskModel.task_id,
+            TaskModel.title,
+            TaskModel.task_type,
+            EmployeeTaskModel.status,
+            EmployeeTaskModel.assigned_at,
+            EmployeeTaskModel.completed_at
+        ).join(
+            TaskModel, TaskModel.id == EmployeeTaskModel.task_id
+        ).where(
+            EmployeeTaskModel.employee_id == employee_id
         )
-        tasks_result = await session.execute(tasks_stmt)
-        tasks = tasks_result.scalars().all()
+        if tasks_cursor:
+            tasks_stmt = tasks_stmt.where(seek_after(task_order, tasks_cursor))
+        tasks_rows = tasks_stmt.order_by(*task_order).limit(page_size + 1).subquery()
+        tasks_json = select(json_array_agg(
+            session,
+            {name: tasks_rows.c[name] for name in tasks_rows.c.keys()},
+            order_by=(tasks_rows.c.assigned_at, tasks_rows.c.id)
+        )).scalar_subquery()
         
-        # Get employee's documents
-        docs_stmt = select(DocumentModel).where(
-            DocumentModel.employee_id == employee.id
+        # Documents aggregated the same way
+        document_order = (DocumentModel.uploaded_at, DocumentModel.id)
+        docs_stmt = select(
+            DocumentModel.id,
+            DocumentModel.document_type,
+            DocumentModel.original_filename,
+            DocumentModel.verification_status,
+            DocumentModel.uploaded_at
+        ).where(
+            DocumentModel.employee_id == employee_id
         )
-        docs_result = await session.execute(docs_stmt)
-        documents = docs_result.scalars().all()
+        if documents_cursor:
+            docs_stmt = docs_stmt.where(seek_after(document_order, documents_cursor))
+        docs_rows = docs_stmt.order_by(*document_order).limit(page_size + 1).subquery()
+        docs_json = select(json_array_agg(
+            session,
+            {name: docs_rows.c[name] for name in docs_rows.c.keys()},
+            order_by=(docs_rows.c.uploaded_at, docs_rows.c.id)
+        )).scalar_subquery()
+        
+        employee_stmt = select(
+            UserModel.id,
+            UserModel.name,
+            UserModel.email,
+            UserModel.is_active,
+            tasks_json.label("tasks"),
+            docs_json.label("documents")
+        ).where(
+            UserModel.id == employee_id,
+            UserModel.role == UserRole.EMPLOYEE
+        )
+        employee = (await session.execute(employee_stmt)).one_or_none()
+        if not employee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Employee not found"
+            )
+        
+        # JSON carries enum names and timestamps as text - convert to the API representation
+        tasks = [
+            {
+                "id": task["id"],
+                "task_id": task["task_id"],
+                "title": task["title"],
+                "task_type": TaskType[task["task_type"]].value,
+                "status": TaskStatus[task["status"]].value,
+                "assigned_at": datetime.fromisoformat(task["assigned_at"]),
+                "completed_at": (
+                    datetime.fromisoformat(task["completed_at"]) if task["completed_at"] else None
+                )
+            } for task in employee.tasks or []
+        ]
+        documents = [
+            {
+                "id": doc["id"],
+                "document_type": DocumentType[doc["document_type"]].value,
+                "original_filename": doc["original_filename"],
+                "verification_status": VerificationStatus[doc["verification_status"]].value,
+                "uploaded_at": datetime.fromisoformat(doc["uploaded_at"])
+            } for doc in employee.documents or []
+        ]
+        
+        tasks_next_cursor = None
+        if len(tasks) > page_size:
+            tasks = tasks[:page_size]
+            tasks_next_cursor = encode_cursor((tasks[-1]["assigned_at"], tasks[-1]["id"]))
+        
+        documents_next_cursor = None
+        if len(documents) > page_size:
+            documents = documents[:page_size]
+            documents_next_cursor = encode_cursor((documents[-1]["uploaded_at"], documents[-1]["id"]))
         
         return {
             "employee": {
@@ -125,24 +277,10 @@ class EmployeeService:
                 "email": employee.email,
                 "is_active": employee.is_active
             },
-            "tasks": [
-                {
-                    "id": task.id,
-                    "task_id": task.task_id,
-                    "status": task.status.value,
-                    "assigned_at": task.assigned_at,
-                    "completed_at": task.completed_at
-                } for task in tasks
-            ],
-            "documents": [
-                {
-                    "id": doc.id,
-                    "document_type": doc.document_type.value,
-                    "original_filename": doc.original_filename,
-                    "verification_status": doc.verification_status.value,
-                    "uploaded_at": doc.uploaded_at
-                } for doc in documents
-            ]
+            "tasks": tasks,
+            "documents": documents,
+            "tasks_next_cursor": tasks_next_cursor,
+            "documents_next_cursor": documents_next_cursor
         }
     
     @staticmethod
@@ -176,40 +314,82 @@ class EmployeeService:
             employee.is_active = update_data.is_active
         
         employee.updated_at = datetime.utcnow()
+        if not employee.is_active:
+            await AuthService.record_user_revocations(session, [employee_id])
         await session.commit()
         await session.refresh(employee)
+        if employee.is_active:
+            invalidate_cached_user(employee_id)
+        else:
+            revoke_user_tokens(employee_id)
         
         return employee
     
     @staticmethod
-    async def delete_employee(session: AsyncSession, employee_id: str) -> None:
-        """Delete employee and all related records"""
-        employee = await EmployeeService.get_employee_by_id(session, employee_id)
-        
-        # Delete employee tasks
-        tasks_stmt = select(EmployeeTaskModel).where(
-            EmployeeTaskModel.employee_id == employee_id
-        )
-        tasks_result = await session.execute(tasks_stmt)
-        for task in tasks_result.scalars().all():
-            await session.delete(task)
-        
-        # Delete employee documents
-        docs_stmt = select(DocumentModel).where(
-            DocumentModel.employee_id == employee_id
+    async def delete_employee(session: AsyncSession, employee_id: str) -> Dict[str, Any]:
+        """
+        Delete employee and all related records.
+        Returns the (file_path, checksum) pairs of the deleted documents and the ids
+        of abandoned uploads, whose files are removed later.
+        """
+        result = await EmployeeService.delete_employees(session, [employee_id])
+        if not result["deleted"]:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Employee not found"
+            )
+        return result
+    
+    @staticmethod
+    async def delete_employees(session: AsyncSession, employee_ids: List[str]) -> Dict[str, Any]:
+        """
+        Delete many employees and their assignments, training progress, documents and
+        unfinished uploads with one set-based DELETE per table, in a single transaction.
+        Ids that are unknown or not employees are reported in `not_found`.
+        Stored files are left to DocumentService.release_files, which checks whether
+        a shared blob is still referenced at the moment it removes it.
+        """
+        requested_ids = list(dict.fromkeys(employee_ids))
+        found_stmt = select(UserModel.id).where(
+            UserModel.id.in_(requested_ids),
+            UserModel.role == UserRole.EMPLOYEE
         )
-        docs_result = await session.execute(docs_stmt)
-        for doc in docs_result.scalars().all():
-            await session.delete(doc)
+        found_ids = set((await session.execute(found_stmt)).scalars().all())
+        deleted_ids = [employee_id for employee_id in requested_ids if employee_id in found_ids]
         
-        # Delete employee training
-        training_stmt = select(EmployeeTrainingModel).where(
-            EmployeeTrainingModel.employee_id == employee_id
-        )
-        training_result = await session.execute(training_stmt)
-        for training in training_result.scalars().all():
-            await session.delete(training)
+        removed_documents: List[Tuple[str, Optional[str]]] = []
+        upload_ids: List[str] = []
+        if deleted_ids:
+            await session.execute(
+                delete(EmployeeTaskModel).where(EmployeeTaskModel.employee_id.in_(deleted_ids))
+            )
+            await session.execute(
+                delete(EmployeeTrainingModel).where(EmployeeTrainingModel.employee_id.in_(deleted_ids))
+            )
+            docs_result = await session.execute(
+                delete(DocumentModel).where(
+                    DocumentModel.employee_id.in_(deleted_ids)
+                ).returning(DocumentModel.file_path, DocumentModel.checksum)
+            )
+            removed_documents = [(row.file_path, row.checksum) for row in docs_result.all()]
+            upload_ids = list((await session.execute(
+                delete(UploadSessionModel).where(
+                    UploadSessionModel.employee_id.in_(deleted_ids)
+                ).returning(UploadSessionModel.id)
+            )).scalars().all())
+            await session.execute(
+                delete(UserModel).where(UserModel.id.in_(deleted_ids))
+            )
+            # Outstanding tokens must stay rejected on every worker
+            await AuthService.record_user_revocations(session, deleted_ids)
+            await session.commit()
+            
+            for employee_id in deleted_ids:
+                revoke_user_tokens(employee_id)
         
-        # Delete employee
-        await session.delete(employee)
-        await session.commit()
+        return {
+            "deleted": deleted_ids,
+            "not_found": [employee_id for employee_id in requested_ids if employee_id not in found_ids],
+            "removed_documents": removed_documents,
+            "upload_ids": upload_ids
+        }
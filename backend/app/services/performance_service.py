@@ -10,6 +10,8 @@ from ..models.task import EmployeeTaskModel
 from ..models.training import TrainingModuleModel, EmployeeTrainingModel
 from ..models.document import DocumentModel
 from ..core.enums import UserRole, TaskStatus, VerificationStatus
+from ..core.sql import days_between
+from .employee_service import EmployeeService
 
 
 class PerformanceService:
@@ -107,41 +109,44 @@ class PerformanceService:
                 detail="Employee not found"
             )
         
-        # Get task statistics
-        tasks_stmt = select(EmployeeTaskModel).where(
+        # Task statistics and average completion time in one aggregate query
+        completion_days = days_between(
+            session, EmployeeTaskModel.assigned_at, EmployeeTaskModel.completed_at
+        )
+        tasks_stmt = select(
+            *EmployeeService.task_stats_columns(),
+            func.avg(completion_days).filter(
+                EmployeeTaskModel.status == TaskStatus.COMPLETED,
+                EmployeeTaskModel.completed_at.is_not(None)
+            ).label("avg_completion_days")
+        ).where(
             EmployeeTaskModel.employee_id == employee_id
         )
-        tasks_result = await session.execute(tasks_stmt)
-        tasks = tasks_result.scalars().all()
+        tasks_row = (await session.execute(tasks_stmt)).one()
         
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
+        task_stats = EmployeeService.task_stats(tasks_row.total_tasks, tasks_row.completed_tasks)
+        total_tasks = task_stats["total_tasks"]
+        completed_tasks = task_stats["completed_tasks"]
         pending_tasks = total_tasks - completed_tasks
-        completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        
-        # Calculate average task completion time
-        completed_with_dates = [
-            t for t in tasks
-            if t.status == TaskStatus.COMPLETED and t.completed_at and t.assigned_at
-        ]
-        if completed_with_dates:
-            total_days = sum([
-                (t.completed_at - t.assigned_at).days
-                for t in completed_with_dates
-            ])
-            avg_task_completion_days = total_days / len(completed_with_dates)
-        else:
-            avg_task_completion_days = None
+        completion_rate = task_stats["completion_rate"]
+        avg_task_completion_days = (
+            float(tasks_row.avg_completion_days)
+            if tasks_row.avg_completion_days is not None else None
+        )
         
         # Get training statistics
-        training_stmt = select(EmployeeTrainingModel).where(
+        training_stmt = select(
+            func.count(EmployeeTrainingModel.id).label("total_training"),
+            func.count(EmployeeTrainingModel.id).filter(
+                EmployeeTrainingModel.status == TaskStatus.COMPLETED
+            ).label("completed_training")
+        ).where(
             EmployeeTrainingModel.employee_id == employee_id
         )
-        training_result = await session.execute(training_stmt)
-        trainings = training_result.scalars().all()
+        training_row = (await session.execute(training_stmt)).one()
         
-        total_training = len(trainings)
-        completed_training = len([t for t in trainings if t.status == TaskStatus.COMPLETED])
+        total_training = training_row.total_training
+        completed_training = training_row.completed_training
         training_completion_rate = (
             (completed_training / total_training * 100)
             if total_training > 0 else 0
@@ -169,45 +174,37 @@ class PerformanceService:
         """Get role-specific dashboard metrics"""
         if user_role.lower() == "hr":
             # HR Dashboard
-            employees_stmt = select(UserModel).where(UserModel.role == UserRole.EMPLOYEE)
-            employees_result = await session.execute(employees_stmt)
-            total_employees = employees_result.scalars().all()
+            total_employees_stmt = select(func.count()).select_from(UserModel).where(
+                UserModel.role == UserRole.EMPLOYEE
+            )
+            total_employees = (await session.execute(total_employees_stmt)).scalar()
             
-            pending_tasks_stmt = select(EmployeeTaskModel).where(
+            pending_tasks_stmt = select(func.count()).select_from(EmployeeTaskModel).where(
                 EmployeeTaskModel.status == TaskStatus.PENDING
             )
-            pending_tasks_result = await session.execute(pending_tasks_stmt)
-            pending_tasks = pending_tasks_result.scalars().all()
+            pending_tasks = (await session.execute(pending_tasks_stmt)).scalar()
             
-            pending_docs_stmt = select(DocumentModel).where(
+            pending_docs_stmt = select(func.count()).select_from(DocumentModel).where(
                 DocumentModel.verification_status == VerificationStatus.PENDING
             )
-            pending_docs_result = await session.execute(pending_docs_stmt)
-            pending_documents = pending_docs_result.scalars().all()
+            pending_documents = (await session.execute(pending_docs_stmt)).scalar()
             
             return {
                 "role": "hr",
-                "total_employees": len(total_employees),
-                "pending_tasks": len(pending_tasks),
-                "pending_documents": len(pending_documents),
+                "total_employees": total_employees,
+                "pending_tasks": pending_tasks,
+                "pending_documents": pending_documents,
                 "recent_activities": []
             }
         
         elif user_role.lower() == "employee":
             # Employee Dashboard
-            user_tasks_stmt = select(EmployeeTaskModel).where(
-                EmployeeTaskModel.employee_id == employee_id
-            )
-            user_tasks_result = await session.execute(user_tasks_stmt)
-            user_tasks = user_tasks_result.scalars().all()
-            
-            completed_tasks = [task for task in user_tasks if task.status == TaskStatus.COMPLETED]
-            pending_tasks = [task for task in user_tasks if task.status == TaskStatus.PENDING]
+            task_stats = await EmployeeService.get_employee_task_stats(session, employee_id)
             
             return {
                 "role": "employee",
-                "total_tasks": len(user_tasks),
-                "completed_tasks": len(completed_tasks),
-                "pending_tasks": len(pending_tasks),
-                "completion_rate": len(completed_tasks) / len(user_tasks) * 100 if user_tasks else 0
+                "total_tasks": task_stats["total_tasks"],
+                "completed_tasks": task_stats["completed_tasks"],
+                "pending_tasks": task_stats["total_tasks"] - task_stats["completed_tasks"],
+                "completion_rate": task_stats["completion_rate"]
             }
@@ -0,0 +1,260 @@
+"""
+Playbook Service - Handles onboarding playbooks and applying them to employees
+"""
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete
+from sqlmodel import select
+from fastapi import HTTPException, status
+
+from ..models.playbook import PlaybookModel, PlaybookItemModel
+from ..models.task import TaskModel, EmployeeTaskModel
+from ..models.training import TrainingModuleModel, EmployeeTrainingModel
+from ..schemas.playbook import PlaybookCreateSchema
+from ..core.enums import TaskStatus
+from ..core.pagination import clamp_page_size, fetch_page
+from ..core.sql import insert_ignoring_conflicts
+from .employee_service import EmployeeService
+
+
+class PlaybookService:
+    """Service for onboarding playbook operations"""
+
+    @staticmethod
+    async def get_all_playbooks(
+        session: AsyncSession,
+        page: int = 1,
+        page_size: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get paginated list of playbooks with their items, ordered by (created_at, id)"""
+        page_size = clamp_page_size(page_size)
+        playbooks, next_cursor, total = await fetch_page(
+            session,
+            select(PlaybookModel),
+            order_by=(PlaybookModel.created_at, PlaybookModel.id),
+            key=lambda playbook: (playbook.created_at, playbook.id),
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            scalars=True
+        )
+
+        # Items for the whole page in one query
+        items_by_playbook = await PlaybookService._get_items(
+            session, [playbook.id for playbook in playbooks]
+        )
+
+        return {
+            "playbooks": [
+                PlaybookService._playbook_data(playbook, items_by_playbook.get(playbook.id, []))
+                for playbook in playbooks
+            ],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "total_is_approximate": False
+        }
+
+    @staticmethod
+    async def get_playbook(session: AsyncSession, playbook_id: str) -> Dict[str, Any]:
+        """Get a playbook with its ordered items"""
+        playbook = await PlaybookService._get_playbook_model(session, playbook_id)
+        items_by_playbook = await PlaybookService._get_items(session, [playbook.id])
+        return PlaybookService._playbook_data(playbook, items_by_playbook.get(playbook.id, []))
+
+    @staticmethod
+    async def create_playbook(
+        session: AsyncSession,
+        playbook_data: PlaybookCreateSchema,
+        created_by: str
+    ) -> Dict[str, Any]:
+        """Create a playbook after checking every referenced task and training module exists"""
+        task_ids = {item.task_id for item in playbook_data.items if item.task_id}
+        module_ids = {item.training_module_id for item in playbook_data.items if item.training_module_id}
+
+        if task_ids:
+            found_tasks = set((await session.execute(
+                select(TaskModel.id).where(TaskModel.id.in_(task_ids))
+            )).scalars().all())
+            if task_ids - found_tasks:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown task ids: {', '.join(sorted(task_ids - found_tasks))}"
+                )
+
+        if module_ids:
+            found_modules = set((await session.execute(
+                select(TrainingModuleModel.id).where(TrainingModuleModel.id.in_(module_ids))
+            )).scalars().all())
+            if module_ids - found_modules:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown training module ids: {', '.join(sorted(module_ids - found_modules))}"
+                )
+
+        playbook = PlaybookModel(
+            name=playbook_data.name,
+            description=playbook_data.description,
+            is_active=playbook_data.is_active,
+            created_by=created_by
+        )
+        items = [
+            PlaybookItemModel(
+                playbook_id=playbook.id,
+                position=position,
+                task_id=item.task_id,
+                training_module_id=item.training_module_id
+            )
+            for position, item in enumerate(playbook_data.items)
+        ]
+
+        session.add(playbook)
+        session.add_all(items)
+        await session.commit()
+
+        return PlaybookService._playbook_data(playbook, items)
+
+    @staticmethod
+    async def delete_playbook(session: AsyncSession, playbook_id: str) -> None:
+        """Delete a playbook - assignments it already created are kept"""
+        await PlaybookService._get_playbook_model(session, playbook_id)
+        await session.execute(
+            delete(PlaybookItemModel).where(PlaybookItemModel.playbook_id == playbook_id)
+        )
+        await session.execute(delete(PlaybookModel).where(PlaybookModel.id == playbook_id))
+        await session.commit()
+
+    @staticmethod
+    async def apply_playbook(
+        session: AsyncSession,
+        playbook_id: str,
+        assigned_by: str,
+        employee_ids: Optional[List[str]] = None,
+        all_active: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Assign every task and training module of a playbook to many employees.
+        All rows are written with multi-row INSERT ... ON CONFLICT DO NOTHING in one
+        transaction; items an employee already has are skipped.
+        """
+        playbook = await PlaybookService._get_playbook_model(session, playbook_id)
+        if not playbook.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Playbook is not active"
+            )
+
+        items_stmt = select(
+            PlaybookItemModel.task_id,
+            PlaybookItemModel.training_module_id
+        ).where(
+            PlaybookItemModel.playbook_id == playbook_id
+        ).order_by(PlaybookItemModel.position)
+        items = (await session.execute(items_stmt)).all()
+        task_ids = [item.task_id for item in items if item.task_id]
+        module_ids = [item.training_module_id for item in items if item.training_module_id]
+
+        target_ids, not_found = await EmployeeService.resolve_employee_ids(
+            session, employee_ids, all_active
+        )
+
+        # Rows are built in Python so ids and timestamps match the ORM defaults
+        now = datetime.utcnow()
+        task_rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "employee_id": employee_id,
+                "task_id": task_id,
+                "assigned_by": assigned_by,
+                "status": TaskStatus.PENDING,
+                "assigned_at": now
+            }
+            for employee_id in target_ids
+            for task_id in task_ids
+        ]
+        training_rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "employee_id": employee_id,
+                "training_module_id": module_id,
+                "status": TaskStatus.PENDING,
+                "progress_percentage": 0
+            }
+            for employee_id in target_ids
+            for module_id in module_ids
+        ]
+
+        inserted_tasks = await insert_ignoring_conflicts(
+            session,
+            EmployeeTaskModel,
+            task_rows,
+            index_elements=["employee_id", "task_id"],
+            returning=(EmployeeTaskModel.id,)
+        )
+        inserted_trainings = await insert_ignoring_conflicts(
+            session,
+            EmployeeTrainingModel,
+            training_rows,
+            index_elements=["employee_id", "training_module_id"],
+            returning=(EmployeeTrainingModel.id,)
+        )
+        await session.commit()
+
+        return {
+            "message": f"Playbook applied to {len(target_ids)} employees",
+            "employees": len(target_ids),
+            "tasks_assigned": len(inserted_tasks),
+            "trainings_assigned": len(inserted_trainings),
+            "not_found": not_found
+        }
+
+    @staticmethod
+    async def _get_playbook_model(session: AsyncSession, playbook_id: str) -> PlaybookModel:
+        """Get playbook by ID or raise 404"""
+        playbook = await session.get(PlaybookModel, playbook_id)
+        if not playbook:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Playbook not found"
+            )
+        return playbook
+
+    @staticmethod
+    async def _get_items(
+        session: AsyncSession,
+        playbook_ids: List[str]
+    ) -> Dict[str, List[PlaybookItemModel]]:
+        """Load the ordered items of several playbooks, grouped by playbook id"""
+        if not playbook_ids:
+            return {}
+        items_stmt = select(PlaybookItemModel).where(
+            PlaybookItemModel.playbook_id.in_(playbook_ids)
+        ).order_by(PlaybookItemModel.playbook_id, PlaybookItemModel.position)
+        items_by_playbook: Dict[str, List[PlaybookItemModel]] = {}
+        for item in (await session.execute(items_stmt)).scalars().all():
+            items_by_playbook.setdefault(item.playbook_id, []).append(item)
+        return items_by_playbook
+
+    @staticmethod
+    def _playbook_data(playbook: PlaybookModel, items: List[PlaybookItemModel]) -> Dict[str, Any]:
+        """Build the playbook response dict"""
+        return {
+            "id": playbook.id,
+            "name": playbook.name,
+            "description": playbook.description,
+            "is_active": playbook.is_active,
+            "created_by": playbook.created_by,
+            "created_at": playbook.created_at,
+            "updated_at": playbook.updated_at,
+            "items": [
+                {
+                    "position": item.position,
+                    "task_id": item.task_id,
+                    "training_module_id": item.training_module_id
+                } for item in items
+            ]
+        }
@@ -1,15 +1,23 @@
 """
 Task Service - Handles task management business logic
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, func
+from sqlalchemy import delete, exists, update
+from sqlalchemy.orm import defer
+from sqlmodel import select
 from fastapi import HTTPException, status
 
 from ..models.task import TaskModel, EmployeeTaskModel
+from ..models.document import DocumentModel, UploadSessionModel
+from ..models.playbook import PlaybookItemModel
 from ..schemas.task import TaskCreateSchema, TaskUpdateSchema
-from ..core.enums import TaskStatus
+from ..core.enums import TaskStatus, TaskType
+from ..core.pagination import clamp_page_size, fetch_page, approximate_row_count
+from ..core.sql import insert_ignoring_conflicts
+from .employee_service import EmployeeService
 
 
 class TaskService:
@@ -19,19 +27,30 @@ class TaskService:
     async def get_all_tasks(
         session: AsyncSession,
         page: int = 1,
-        page_size: int = 50
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+        approximate_total: bool = False
     ) -> Dict[str, Any]:
-        """Get paginated list of all tasks (HR view)"""
-        # Get total count
-        count_stmt = select(func.count()).select_from(TaskModel)
-        total_result = await session.execute(count_stmt)
-        total = total_result.scalar()
-        
-        # Get paginated tasks
-        offset = (page - 1) * page_size
-        tasks_stmt = select(TaskModel).offset(offset).limit(page_size)
-        tasks_result = await session.execute(tasks_stmt)
-        tasks = tasks_result.scalars().all()
+        """
+        Get paginated list of all tasks (HR view), ordered by (created_at, id).
+        With `approximate_total` the total is a cached table estimate instead of an exact count.
+        """
+        # Get paginated tasks with the total
+        page_size = clamp_page_size(page_size)
+        tasks, next_cursor, total = await fetch_page(
+            session,
+            # Content is only served by the task detail endpoint
+            select(TaskModel).options(defer(TaskModel.content, raiseload=True)),
+            order_by=(TaskModel.created_at, TaskModel.id),
+            key=lambda task: (task.created_at, task.id),
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            scalars=True,
+            with_total=not approximate_total
+        )
+        if approximate_total:
+            total = await approximate_row_count(session, TaskModel)
         
         return {
             "tasks": [
@@ -46,7 +65,9 @@ class TaskService:
             ],
             "total": total,
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "total_is_approximate": approximate_total
         }
     
     @staticmethod
@@ -54,46 +75,66 @@ class TaskService:
         session: AsyncSession,
         employee_id: str,
         page: int = 1,
-        page_size: int = 50
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+        task_status: Optional[TaskStatus] = None,
+        task_type: Optional[TaskType] = None
     ) -> Dict[str, Any]:
-        """Get paginated list of tasks assigned to an employee"""
-        # Get total count
-        count_stmt = select(func.count()).select_from(EmployeeTaskModel).where(
+        """
+        Get paginated list of tasks assigned to an employee, ordered by (assigned_at, id).
+        Assignments are joined to their task summary in the page query (content is
+        fetched per task from the detail endpoint); optional status and task type
+        filters are applied in SQL.
+        """
+        # Get paginated employee tasks with task details and the total
+        page_size = clamp_page_size(page_size)
+        employee_tasks_stmt = select(
+            EmployeeTaskModel.id.label("assignment_id"),
+            TaskModel.id.label("task_id"),
+            TaskModel.title,
+            TaskModel.description,
+            TaskModel.task_type,
+            EmployeeTaskModel.status,
+            EmployeeTaskModel.assigned_at,
+            EmployeeTaskModel.completed_at
+        ).join(
+            TaskModel, TaskModel.id == EmployeeTaskModel.task_id
+        ).where(
             EmployeeTaskModel.employee_id == employee_id
         )
-        total_result = await session.execute(count_stmt)
-        total = total_result.scalar()
+        if task_status is not None:
+            employee_tasks_stmt = employee_tasks_stmt.where(EmployeeTaskModel.status == task_status)
+        if task_type is not None:
+            employee_tasks_stmt = employee_tasks_stmt.where(TaskModel.task_type == task_type)
         
-        # Get paginated employee tasks
-        offset = (page - 1) * page_size
-        employee_tasks_stmt = select(EmployeeTaskModel).where(
-            EmployeeTaskModel.employee_id == employee_id
-        ).offset(offset).limit(page_size)
-        employee_tasks_result = await session.execute(employee_tasks_stmt)
-        employee_tasks = employee_tasks_result.scalars().all()
-        
-        # Build task data with details
-        task_data = []
-        for emp_task in employee_tasks:
-            task = await session.get(TaskModel, emp_task.task_id)
-            if task:
-                task_data.append({
-                    "assignment_id": emp_task.id,
-                    "task_id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "task_type": task.task_type.value,
-                    "content": task.content,
-                    "status": emp_task.status.value,
-                    "assigned_at": emp_task.assigned_at,
-                    "completed_at": emp_task.completed_at
-                })
+        employee_tasks, next_cursor, total = await fetch_page(
+            session,
+            employee_tasks_stmt,
+            order_by=(EmployeeTaskModel.assigned_at, EmployeeTaskModel.id),
+            key=lambda row: (row.assigned_at, row.assignment_id),
+            page=page,
+            page_size=page_size,
+            cursor=cursor
+        )
         
         return {
-            "tasks": task_data,
+            "tasks": [
+                {
+                    "assignment_id": row.assignment_id,
+                    "task_id": row.task_id,
+                    "title": row.title,
+                    "description": row.description,
+                    "task_type": row.task_type.value,
+                    "status": row.status.value,
+                    "assigned_at": row.assigned_at,
+                    "completed_at": row.completed_at
+                } for row in employee_tasks
+            ],
             "total": total,
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "total_is_approximate": False
         }
     
     @staticmethod
@@ -134,6 +175,30 @@ class TaskService:
             )
         return task
     
+    @staticmethod
+    async def get_task_version(
+        session: AsyncSession,
+        task_id: str,
+        employee_id: Optional[str] = None
+    ) -> datetime:
+        """
+        Get a task's updated_at without loading its content.
+        With `employee_id` the task must be assigned to that employee.
+        """
+        version_stmt = select(TaskModel.updated_at).where(TaskModel.id == task_id)
+        if employee_id:
+            version_stmt = version_stmt.where(exists().where(
+                EmployeeTaskModel.task_id == TaskModel.id,
+                EmployeeTaskModel.employee_id == employee_id
+            ))
+        updated_at = (await session.execute(version_stmt)).scalar_one_or_none()
+        if updated_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        return updated_at
+    
     @staticmethod
     async def update_task(
         session: AsyncSession,
@@ -160,19 +225,29 @@ class TaskService:
     
     @staticmethod
     async def delete_task(session: AsyncSession, task_id: str) -> None:
-        """Delete task and all assignments"""
-        task = await TaskService.get_task_by_id(session, task_id)
+        """Delete task and all assignments in a single transaction"""
+        await TaskService.get_task_by_id(session, task_id)
         
         # Delete task assignments first
-        assignments_stmt = select(EmployeeTaskModel).where(
-            EmployeeTaskModel.task_id == task_id
+        await session.execute(
+            delete(EmployeeTaskModel).where(EmployeeTaskModel.task_id == task_id)
+        )
+        
+        # Drop the task from any onboarding playbooks
+        await session.execute(
+            delete(PlaybookItemModel).where(PlaybookItemModel.task_id == task_id)
+        )
+        
+        # Keep uploaded documents, detached from the task
+        await session.execute(
+            update(DocumentModel).where(DocumentModel.task_id == task_id).values(task_id=None)
+        )
+        await session.execute(
+            update(UploadSessionModel).where(UploadSessionModel.task_id == task_id).values(task_id=None)
         )
-        assignments_result = await session.execute(assignments_stmt)
-        for assignment in assignments_result.scalars().all():
-            await session.delete(assignment)
         
         # Delete task
-        await session.delete(task)
+        await session.execute(delete(TaskModel).where(TaskModel.id == task_id))
         await session.commit()
     
     @staticmethod
@@ -181,32 +256,73 @@ class TaskService:
         employee_id: str,
         task_id: str,
         assigned_by: str
-    ) -> EmployeeTaskModel:
-        """Assign a task to an employee"""
-        # Check if assignment already exists
-        existing_stmt = select(EmployeeTaskModel).where(
-            EmployeeTaskModel.employee_id == employee_id,
-            EmployeeTaskModel.task_id == task_id
+    ) -> str:
+        """Assign a task to a single employee, returning the assignment id"""
+        result = await TaskService.assign_task_to_employees(
+            session, task_id, assigned_by, employee_ids=[employee_id]
         )
-        existing_result = await session.execute(existing_stmt)
-        if existing_result.scalar_one_or_none():
+        if result["not_found"]:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Employee not found"
+            )
+        if result["already_assigned"]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Task already assigned"
             )
+        return result["assignment_ids"][employee_id]
+    
+    @staticmethod
+    async def assign_task_to_employees(
+        session: AsyncSession,
+        task_id: str,
+        assigned_by: str,
+        employee_ids: Optional[List[str]] = None,
+        all_active: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Assign a task to many employees - the listed ids, or every active employee.
+        Existing assignments are left untouched by INSERT ... ON CONFLICT DO NOTHING on
+        (employee_id, task_id), so concurrent requests cannot create duplicates.
+        Listed ids may belong to any user, as tasks could always be assigned to any
+        account; only ids without a user are reported as not found.
+        """
+        await TaskService.get_task_by_id(session, task_id)
         
-        # Create assignment
-        assignment = EmployeeTaskModel(
-            employee_id=employee_id,
-            task_id=task_id,
-            assigned_by=assigned_by
+        # Resolve the target users in one query
+        target_ids, not_found = await EmployeeService.resolve_employee_ids(
+            session, employee_ids, all_active, employees_only=False
         )
         
-        session.add(assignment)
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "employee_id": employee_id,
+                "task_id": task_id,
+                "assigned_by": assigned_by,
+                "status": TaskStatus.PENDING,
+                "assigned_at": now
+            }
+            for employee_id in target_ids
+        ]
+        inserted = await insert_ignoring_conflicts(
+            session,
+            EmployeeTaskModel,
+            rows,
+            index_elements=["employee_id", "task_id"],
+            returning=(EmployeeTaskModel.employee_id, EmployeeTaskModel.id)
+        )
         await session.commit()
-        await session.refresh(assignment)
         
-        return assignment
+        assignment_ids = {employee_id: assignment_id for employee_id, assignment_id in inserted}
+        return {
+            "assigned": [employee_id for employee_id in target_ids if employee_id in assignment_ids],
+            "already_assigned": [employee_id for employee_id in target_ids if employee_id not in assignment_ids],
+            "not_found": not_found,
+            "assignment_ids": assignment_ids
+        }
     
     @staticmethod
     async def complete_task(
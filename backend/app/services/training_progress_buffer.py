@@ -0,0 +1,195 @@
+"""
+Training Progress Buffer - Coalesces progress heartbeats into batched upserts
+"""
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import case, func
+from sqlmodel import select
+
+from ..core.enums import TaskStatus
+from ..core.metrics import Histogram
+from ..core.sql import BULK_INSERT_BATCH_SIZE, dialect_insert, greatest
+from ..database import AsyncSessionLocal
+from ..models.training import TrainingModuleModel, EmployeeTrainingModel
+from ..models.user import UserModel
+
+load_dotenv()
+
+# How often buffered progress is written, and how many pairs may wait before an early flush
+TRAINING_PROGRESS_FLUSH_SECONDS = float(os.getenv("TRAINING_PROGRESS_FLUSH_SECONDS", "5"))
+TRAINING_PROGRESS_MAX_PENDING = int(os.getenv("TRAINING_PROGRESS_MAX_PENDING", "500"))
+
+
+class TrainingProgressBuffer:
+    """
+    Keeps the highest reported percentage per (employee, training module) in memory
+    and writes them with one multi-row INSERT ... ON CONFLICT DO UPDATE.
+
+    A flush happens every `flush_interval_seconds`, as soon as `max_pending` pairs
+    are waiting, and right away when a module is completed. Stored progress never
+    decreases. Progress reported since the last flush is lost if the process dies.
+    """
+
+    def __init__(self, session_factory, flush_interval_seconds: float, max_pending: int):
+        self.session_factory = session_factory
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self._pending: Dict[Tuple[str, str], int] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.failures = 0
+        self.flush_time = Histogram()
+
+    async def record(self, employee_id: str, training_module_id: str, progress_percentage: int) -> None:
+        """Buffer a progress report, flushing when the module is complete or the buffer is full"""
+        key = (employee_id, training_module_id)
+        self.recorded += 1
+        previous = self._pending.get(key)
+        if previous is not None:
+            self.coalesced += 1
+            progress_percentage = max(previous, progress_percentage)
+        self._pending[key] = progress_percentage
+
+        if progress_percentage >= 100 or len(self._pending) >= self.max_pending:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write everything buffered so far and return the number of rows written"""
+        async with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+
+            started_at = time.perf_counter()
+            try:
+                written = await self._write(batch)
+            except Exception:
+                # Put the batch back so the next flush retries it
+                self.failures += 1
+                for key, progress_percentage in batch.items():
+                    self._pending[key] = max(self._pending.get(key, 0), progress_percentage)
+                raise
+            finally:
+                self.flush_time.observe(time.perf_counter() - started_at)
+
+            self.flushes += 1
+            self.rows_written += written
+            self.rows_dropped += len(batch) - written
+            return written
+
+    async def _write(self, batch: Dict[Tuple[str, str], int]) -> int:
+        async with self.session_factory() as session:
+            # Employees or modules deleted since they were buffered would fail the whole statement,
+            # and progress on modules that are no longer offered is dropped
+            employee_ids = {employee_id for employee_id, _ in batch}
+            module_ids = {module_id for _, module_id in batch}
+            existing_employees = set((await session.execute(
+                select(UserModel.id).where(UserModel.id.in_(employee_ids))
+            )).scalars().all())
+            existing_modules = set((await session.execute(
+                select(TrainingModuleModel.id).where(
+                    TrainingModuleModel.id.in_(module_ids),
+                    TrainingModuleModel.is_active == True
+                )
+            )).scalars().all())
+
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "employee_id": employee_id,
+                    "training_module_id": module_id,
+                    "progress_percentage": progress_percentage,
+                    "status": TaskStatus.COMPLETED if progress_percentage >= 100 else TaskStatus.PENDING,
+                    "started_at": now,
+                    "completed_at": now if progress_percentage >= 100 else None
+                }
+                for (employee_id, module_id), progress_percentage in batch.items()
+                if employee_id in existing_employees and module_id in existing_modules
+            ]
+
+            for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+                upsert_stmt = dialect_insert(session, EmployeeTrainingModel).values(
+                    rows[start:start + BULK_INSERT_BATCH_SIZE]
+                )
+                excluded = upsert_stmt.excluded
+                upsert_stmt = upsert_stmt.on_conflict_do_update(
+                    index_elements=["employee_id", "training_module_id"],
+                    set_={
+                        "progress_percentage": greatest(
+                            session,
+                            EmployeeTrainingModel.progress_percentage,
+                            excluded.progress_percentage
+                        ),
+                        # A completed module stays completed
+                        "status": case(
+                            (excluded.progress_percentage >= 100, excluded.status),
+                            else_=EmployeeTrainingModel.status
+                        ),
+                        "started_at": func.coalesce(EmployeeTrainingModel.started_at, excluded.started_at),
+                        "completed_at": func.coalesce(EmployeeTrainingModel.completed_at, excluded.completed_at)
+                    }
+                )
+                await session.execute(upsert_stmt)
+            await session.commit()
+        return len(rows)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"⚠️  Training progress flush failed: {e}")
+
+    def start(self) -> None:
+        """Start the periodic flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"⚠️  Training progress lost on shutdown ({len(self._pending)} pending): {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return buffering and flush metrics"""
+        return {
+            "pending": len(self._pending),
+            "max_pending": self.max_pending,
+            "flush_interval_seconds": self.flush_interval_seconds,
+            "recorded": self.recorded,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "failures": self.failures,
+            "flush_seconds": self.flush_time.snapshot()
+        }
+
+
+training_progress_buffer = TrainingProgressBuffer(
+    AsyncSessionLocal,
+    flush_interval_seconds=TRAINING_PROGRESS_FLUSH_SECONDS,
+    max_pending=TRAINING_PROGRESS_MAX_PENDING
+)
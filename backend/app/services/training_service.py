@@ -1,14 +1,31 @@
 """
 Training Service - Handles training module and progress management
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
+import os
+from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, func
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import defer
+from sqlmodel import select
 from fastapi import HTTPException, status
 
 from ..models.training import TrainingModuleModel, EmployeeTrainingModel
 from ..core.enums import TaskStatus
+from ..core.pagination import clamp_page_size, fetch_page
+from ..core.cache import TTLCache
+from ..database import mark_write
+from .training_progress_buffer import training_progress_buffer
+
+load_dotenv()
+
+# How long an active training module id is trusted without re-checking the database.
+# Kept short because modules can be deactivated outside the API; the flush re-checks anyway.
+TRAINING_MODULE_CACHE_TTL_SECONDS = float(os.getenv("TRAINING_MODULE_CACHE_TTL_SECONDS", "60"))
+
+# Active module ids seen by progress updates, so heartbeats skip the lookup
+known_training_modules = TTLCache(max_size=10000, ttl_seconds=TRAINING_MODULE_CACHE_TTL_SECONDS)
 
 
 class TrainingService:
@@ -19,87 +36,182 @@ class TrainingService:
         session: AsyncSession,
         page: int = 1,
         page_size: int = 50,
-        employee_id: str = None
+        employee_id: str = None,
+        cursor: Optional[str] = None,
+        mandatory: Optional[bool] = None,
+        incomplete: bool = False,
+        sort_by: str = "created_at"
     ) -> Dict[str, Any]:
-        """Get paginated list of training modules"""
-        # Get total count
-        count_stmt = select(func.count()).select_from(TrainingModuleModel).where(
-            TrainingModuleModel.is_active == True
-        )
-        total_result = await session.execute(count_stmt)
-        total = total_result.scalar()
+        """
+        Get paginated list of training modules, ordered by (created_at, id).
+        With `employee_id` each module carries that employee's progress, and
+        `incomplete` / `sort_by="progress"` apply to it.
+        """
+        page_size = clamp_page_size(page_size)
+        if employee_id:
+            return await TrainingService._get_employee_training_page(
+                session, employee_id, page, page_size, cursor, mandatory, incomplete, sort_by
+            )
         
-        # Get paginated modules
-        offset = (page - 1) * page_size
-        modules_stmt = select(TrainingModuleModel).where(
+        # HR view - just modules
+        # Content is only served by the module detail endpoint
+        modules_stmt = select(TrainingModuleModel).options(
+            defer(TrainingModuleModel.content, raiseload=True)
+        ).where(
             TrainingModuleModel.is_active == True
-        ).offset(offset).limit(page_size)
-        modules_result = await session.execute(modules_stmt)
-        modules = modules_result.scalars().all()
+        )
+        if mandatory is not None:
+            modules_stmt = modules_stmt.where(TrainingModuleModel.is_mandatory == mandatory)
+        modules, next_cursor, total = await fetch_page(
+            session,
+            modules_stmt,
+            order_by=(TrainingModuleModel.created_at, TrainingModuleModel.id),
+            key=lambda module: (module.created_at, module.id),
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            scalars=True
+        )
         
-        if employee_id:
-            # Include employee progress
-            return await TrainingService._build_employee_training_data(
-                session, modules, employee_id, total, page, page_size
+        return {
+            "training_modules": [
+                {
+                    "id": module.id,
+                    "title": module.title,
+                    "description": module.description,
+                    "duration_minutes": module.duration_minutes,
+                    "is_mandatory": module.is_mandatory,
+                    "created_at": module.created_at
+                } for module in modules
+            ],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "total_is_approximate": False
+        }
+    
+    @staticmethod
+    async def get_training_module_version(
+        session: AsyncSession,
+        module_id: str,
+        active_only: bool = False
+    ) -> datetime:
+        """Get a training module's updated_at without loading its content"""
+        version_stmt = select(TrainingModuleModel.updated_at).where(
+            TrainingModuleModel.id == module_id
+        )
+        if active_only:
+            version_stmt = version_stmt.where(TrainingModuleModel.is_active == True)
+        updated_at = (await session.execute(version_stmt)).scalar_one_or_none()
+        if updated_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Training module not found"
             )
-        else:
-            # HR view - just modules
-            return {
-                "training_modules": [
-                    {
-                        "id": module.id,
-                        "title": module.title,
-                        "description": module.description,
-                        "content": module.content,
-                        "duration_minutes": module.duration_minutes,
-                        "is_mandatory": module.is_mandatory,
-                        "created_at": module.created_at
-                    } for module in modules
-                ],
-                "total": total,
-                "page": page,
-                "page_size": page_size
-            }
+        return updated_at
+    
+    @staticmethod
+    async def get_training_module_by_id(
+        session: AsyncSession,
+        module_id: str
+    ) -> TrainingModuleModel:
+        """Get training module by ID, including its content"""
+        module = await session.get(TrainingModuleModel, module_id)
+        if not module:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Training module not found"
+            )
+        return module
     
     @staticmethod
-    async def _build_employee_training_data(
+    async def _get_employee_training_page(
         session: AsyncSession,
-        modules: list,
         employee_id: str,
-        total: int,
         page: int,
-        page_size: int
+        page_size: int,
+        cursor: Optional[str],
+        mandatory: Optional[bool],
+        incomplete: bool,
+        sort_by: str
     ) -> Dict[str, Any]:
-        """Build training data with employee progress"""
-        progress_data = []
-        
-        for module in modules:
-            progress_stmt = select(EmployeeTrainingModel).where(
+        """
+        One page of active modules with the employee's progress, LEFT OUTER JOINed
+        on the (employee_id, training_module_id) unique index
+        """
+        # Modules the employee has not started have no progress row
+        progress_percentage = func.coalesce(EmployeeTrainingModel.progress_percentage, 0)
+        training_stmt = select(
+            TrainingModuleModel.id,
+            TrainingModuleModel.title,
+            TrainingModuleModel.description,
+            TrainingModuleModel.duration_minutes,
+            TrainingModuleModel.is_mandatory,
+            TrainingModuleModel.created_at,
+            EmployeeTrainingModel.status,
+            progress_percentage.label("progress_percentage"),
+            EmployeeTrainingModel.started_at,
+            EmployeeTrainingModel.completed_at
+        ).outerjoin(
+            EmployeeTrainingModel,
+            and_(
                 EmployeeTrainingModel.employee_id == employee_id,
-                EmployeeTrainingModel.training_module_id == module.id
+                EmployeeTrainingModel.training_module_id == TrainingModuleModel.id
             )
-            progress_result = await session.execute(progress_stmt)
-            progress = progress_result.scalar_one_or_none()
-            
-            progress_data.append({
-                "id": module.id,
-                "title": module.title,
-                "description": module.description,
-                "duration_minutes": module.duration_minutes,
-                "is_mandatory": module.is_mandatory,
-                "progress": {
-                    "status": progress.status.value if progress else "pending",
-                    "progress_percentage": progress.progress_percentage if progress else 0,
-                    "started_at": progress.started_at if progress else None,
-                    "completed_at": progress.completed_at if progress else None
-                }
-            })
+        ).where(
+            TrainingModuleModel.is_active == True
+        )
+        if mandatory is not None:
+            training_stmt = training_stmt.where(TrainingModuleModel.is_mandatory == mandatory)
+        if incomplete:
+            training_stmt = training_stmt.where(or_(
+                EmployeeTrainingModel.status.is_(None),
+                EmployeeTrainingModel.status != TaskStatus.COMPLETED
+            ))
+        
+        if sort_by == "progress":
+            # Least progressed first - ascending only, as keyset pagination requires.
+            # No index covers coalesce(progress, 0): the database sorts this employee's
+            # rows, at most one per active module, which stays cheap while that count
+            # is small; created_at, id breaks ties so cursors stay stable across pages
+            order_by = (progress_percentage, TrainingModuleModel.created_at, TrainingModuleModel.id)
+            key = lambda row: (row.progress_percentage, row.created_at, row.id)
+        else:
+            order_by = (TrainingModuleModel.created_at, TrainingModuleModel.id)
+            key = lambda row: (row.created_at, row.id)
+        
+        rows, next_cursor, total = await fetch_page(
+            session,
+            training_stmt,
+            order_by=order_by,
+            key=key,
+            page=page,
+            page_size=page_size,
+            cursor=cursor
+        )
         
         return {
-            "training_modules": progress_data,
+            "training_modules": [
+                {
+                    "id": row.id,
+                    "title": row.title,
+                    "description": row.description,
+                    "duration_minutes": row.duration_minutes,
+                    "is_mandatory": row.is_mandatory,
+                    "progress": {
+                        "status": row.status.value if row.status else "pending",
+                        "progress_percentage": row.progress_percentage,
+                        "started_at": row.started_at,
+                        "completed_at": row.completed_at
+                    }
+                } for row in rows
+            ],
             "total": total,
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "total_is_approximate": False
         }
     
     @staticmethod
@@ -108,44 +220,31 @@ class TrainingService:
         training_id: str,
         employee_id: str,
         progress_percentage: float
-    ) -> EmployeeTrainingModel:
-        """Update employee's training progress"""
-        # Find or create training record
-        progress_stmt = select(EmployeeTrainingModel).where(
-            EmployeeTrainingModel.employee_id == employee_id,
-            EmployeeTrainingModel.training_module_id == training_id
-        )
-        progress_result = await session.execute(progress_stmt)
-        progress = progress_result.scalar_one_or_none()
-        
-        if not progress:
-            # Create new progress record
-            initial_status = TaskStatus.COMPLETED if progress_percentage >= 100 else TaskStatus.PENDING
-            progress = EmployeeTrainingModel(
-                employee_id=employee_id,
-                training_module_id=training_id,
-                progress_percentage=progress_percentage,
-                status=initial_status,
-                started_at=datetime.utcnow()
+    ) -> None:
+        """
+        Record an employee's training progress.
+        Reports are coalesced in memory and written in batches; reaching 100% is
+        written before returning. Progress never goes down.
+        """
+        if not known_training_modules.get(training_id):
+            module_stmt = select(TrainingModuleModel.id).where(
+                TrainingModuleModel.id == training_id,
+                TrainingModuleModel.is_active == True
             )
-            if progress_percentage >= 100:
-                progress.completed_at = datetime.utcnow()
-            session.add(progress)
-        else:
-            # Update existing record
-            progress.progress_percentage = progress_percentage
-            
-            # Mark as completed if 100%
-            if progress_percentage >= 100:
-                progress.status = TaskStatus.COMPLETED
-                progress.completed_at = datetime.utcnow()
-            else:
-                progress.status = TaskStatus.PENDING
+            if (await session.execute(module_stmt)).scalar_one_or_none() is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Training module not found"
+                )
+            known_training_modules.set(training_id, True)
         
-        await session.commit()
-        await session.refresh(progress)
-        
-        return progress
+        await training_progress_buffer.record(
+            employee_id,
+            training_id,
+            min(max(int(progress_percentage), 0), 100)
+        )
+        # The row reaches the primary at the next flush at the latest
+        mark_write(session, delay_seconds=training_progress_buffer.flush_interval_seconds)
     
     @staticmethod
     async def get_employee_training_stats(
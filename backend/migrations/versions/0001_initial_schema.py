@@ -0,0 +1,142 @@
+"""Initial schema - tables as previously created by SQLModel.metadata.create_all
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001_initial_schema"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+user_role = sa.Enum("HR", "EMPLOYEE", name="userrole")
+task_type = sa.Enum("READ", "UPLOAD", "SIGN", name="tasktype")
+task_status = sa.Enum("PENDING", "COMPLETED", name="taskstatus")
+document_type = sa.Enum("AADHAR", "RESUME", "OTHER", name="documenttype")
+verification_status = sa.Enum("PENDING", "VERIFIED", "FAILED", name="verificationstatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("role", user_role, nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("task_type", task_type, nullable=False),
+        sa.Column("content", sa.String(), nullable=True),
+        sa.Column("required_document_type", document_type, nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_by", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "training_modules",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("content", sa.String(), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=True),
+        sa.Column("is_mandatory", sa.Boolean(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_by", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "documents",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("employee_id", sa.String(), nullable=False),
+        sa.Column("document_type", document_type, nullable=False),
+        sa.Column("original_filename", sa.String(), nullable=False),
+        sa.Column("file_path", sa.String(), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=True),
+        sa.Column("mime_type", sa.String(), nullable=True),
+        sa.Column("verification_status", verification_status, nullable=False),
+        sa.Column("verification_notes", sa.String(), nullable=True),
+        sa.Column("verified_by", sa.String(), nullable=True),
+        sa.Column("verified_at", sa.DateTime(), nullable=True),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=False),
+        sa.Column("task_id", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(["employee_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"]),
+        sa.ForeignKeyConstraint(["verified_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "employee_tasks",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("employee_id", sa.String(), nullable=False),
+        sa.Column("task_id", sa.String(), nullable=False),
+        sa.Column("assigned_by", sa.String(), nullable=True),
+        sa.Column("status", task_status, nullable=False),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.Column("assigned_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["assigned_by"], ["users.id"]),
+        sa.ForeignKeyConstraint(["employee_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "employee_training",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("employee_id", sa.String(), nullable=False),
+        sa.Column("training_module_id", sa.String(), nullable=False),
+        sa.Column("status", task_status, nullable=False),
+        sa.Column("progress_percentage", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["employee_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["training_module_id"], ["training_modules.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("jti", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("token_type", sa.String(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index("ix_revoked_tokens_expires_at", "revoked_tokens", ["expires_at"])
+    op.create_index("ix_revoked_tokens_revoked_at", "revoked_tokens", ["revoked_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_revoked_tokens_revoked_at", table_name="revoked_tokens")
+    op.drop_index("ix_revoked_tokens_expires_at", table_name="revoked_tokens")
+    op.drop_table("revoked_tokens")
+    op.drop_table("employee_training")
+    op.drop_table("employee_tasks")
+    op.drop_table("documents")
+    op.drop_table("training_modules")
+    op.drop_table("tasks")
+    op.drop_table("users")
+
+    bind = op.get_bind()
+    for enum_type in (verification_status, document_type, task_status, task_type, user_role):
+        enum_type.drop(bind, checkfirst=True)
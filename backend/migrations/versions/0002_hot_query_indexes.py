@@ -0,0 +1,91 @@
+"""Indexes and unique constraints for per-employee queries
+
+Revision ID: 0002_hot_query_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002_hot_query_indexes"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+PENDING_DOCUMENTS = "verification_status = 'PENDING'"
+
+
+def upgrade() -> None:
+    # Check-then-insert allowed duplicates under concurrency; keep one row per pair
+    # (completed assignments / furthest training progress win) before enforcing uniqueness
+    op.execute(
+        """
+        DELETE FROM employee_tasks WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY employee_id, task_id
+                    ORDER BY (completed_at IS NULL), id
+                ) AS row_number
+                FROM employee_tasks
+            ) ranked
+            WHERE row_number > 1
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM employee_training WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY employee_id, training_module_id
+                    ORDER BY progress_percentage DESC, id
+                ) AS row_number
+                FROM employee_training
+            ) ranked
+            WHERE row_number > 1
+        )
+        """
+    )
+
+    with op.batch_alter_table("employee_tasks") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_employee_tasks_employee_task", ["employee_id", "task_id"]
+        )
+    op.create_index(
+        "ix_employee_tasks_employee_status", "employee_tasks", ["employee_id", "status"]
+    )
+    op.create_index("ix_employee_tasks_task_id", "employee_tasks", ["task_id"])
+    op.create_index("ix_employee_tasks_status", "employee_tasks", ["status"])
+
+    with op.batch_alter_table("employee_training") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_employee_training_employee_module", ["employee_id", "training_module_id"]
+        )
+
+    op.create_index("ix_documents_employee_id", "documents", ["employee_id"])
+    op.create_index(
+        "ix_documents_pending_verification",
+        "documents",
+        ["employee_id"],
+        postgresql_where=sa.text(PENDING_DOCUMENTS),
+        sqlite_where=sa.text(PENDING_DOCUMENTS),
+    )
+
+    op.create_index("ix_users_role_active", "users", ["role", "is_active"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_role_active", table_name="users")
+    op.drop_index("ix_documents_pending_verification", table_name="documents")
+    op.drop_index("ix_documents_employee_id", table_name="documents")
+
+    with op.batch_alter_table("employee_training") as batch_op:
+        batch_op.drop_constraint("uq_employee_training_employee_module", type_="unique")
+
+    op.drop_index("ix_employee_tasks_status", table_name="employee_tasks")
+    op.drop_index("ix_employee_tasks_task_id", table_name="employee_tasks")
+    op.drop_index("ix_employee_tasks_employee_status", table_name="employee_tasks")
+    with op.batch_alter_table("employee_tasks") as batch_op:
+        batch_op.drop_constraint("uq_employee_tasks_employee_task", type_="unique")
@@ -0,0 +1,49 @@
+"""Indexes on the sort keys used by cursor pagination
+
+Revision ID: 0003_keyset_pagination_indexes
+Revises: 0002_hot_query_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0003_keyset_pagination_indexes"
+down_revision = "0002_hot_query_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_role_created_at", "users", ["role", "created_at", "id"])
+    op.create_index("ix_tasks_created_at", "tasks", ["created_at", "id"])
+    op.create_index(
+        "ix_employee_tasks_employee_assigned_at",
+        "employee_tasks",
+        ["employee_id", "assigned_at", "id"]
+    )
+    op.create_index(
+        "ix_training_modules_active_created_at",
+        "training_modules",
+        ["is_active", "created_at", "id"]
+    )
+
+    # (employee_id, uploaded_at, id) also serves plain employee_id lookups
+    op.drop_index("ix_documents_employee_id", table_name="documents")
+    op.create_index(
+        "ix_documents_employee_uploaded_at",
+        "documents",
+        ["employee_id", "uploaded_at", "id"]
+    )
+    op.create_index("ix_documents_uploaded_at", "documents", ["uploaded_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_uploaded_at", table_name="documents")
+    op.drop_index("ix_documents_employee_uploaded_at", table_name="documents")
+    op.create_index("ix_documents_employee_id", "documents", ["employee_id"])
+
+    op.drop_index("ix_training_modules_active_created_at", table_name="training_modules")
+    op.drop_index("ix_employee_tasks_employee_assigned_at", table_name="employee_tasks")
+    op.drop_index("ix_tasks_created_at", table_name="tasks")
+    op.drop_index("ix_users_role_created_at", table_name="users")
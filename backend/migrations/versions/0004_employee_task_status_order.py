@@ -0,0 +1,31 @@
+"""Order-preserving index for status-filtered employee task pages
+
+Revision ID: 0004_employee_task_status_order
+Revises: 0003_keyset_pagination_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_employee_task_status_order"
+down_revision = "0003_keyset_pagination_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Widen (employee_id, status) so a status filter can still read pages in key order
+    op.drop_index("ix_employee_tasks_employee_status", table_name="employee_tasks")
+    op.create_index(
+        "ix_employee_tasks_employee_status",
+        "employee_tasks",
+        ["employee_id", "status", "assigned_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employee_tasks_employee_status", table_name="employee_tasks")
+    op.create_index(
+        "ix_employee_tasks_employee_status", "employee_tasks", ["employee_id", "status"]
+    )
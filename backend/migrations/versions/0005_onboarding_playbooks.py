@@ -0,0 +1,57 @@
+"""Onboarding playbooks
+
+Revision ID: 0005_onboarding_playbooks
+Revises: 0004_employee_task_status_order
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_onboarding_playbooks"
+down_revision = "0004_employee_task_status_order"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "playbooks",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_by", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "playbook_items",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("playbook_id", sa.String(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.String(), nullable=True),
+        sa.Column("training_module_id", sa.String(), nullable=True),
+        sa.CheckConstraint(
+            "(task_id IS NULL) <> (training_module_id IS NULL)",
+            name="ck_playbook_items_single_target"
+        ),
+        sa.ForeignKeyConstraint(["playbook_id"], ["playbooks.id"]),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"]),
+        sa.ForeignKeyConstraint(["training_module_id"], ["training_modules.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("playbook_id", "position", name="uq_playbook_items_playbook_position"),
+    )
+    # Deleting a task or module has to find the playbook entries pointing at it
+    op.create_index("ix_playbook_items_task_id", "playbook_items", ["task_id"])
+    op.create_index("ix_playbook_items_training_module_id", "playbook_items", ["training_module_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_playbook_items_training_module_id", table_name="playbook_items")
+    op.drop_index("ix_playbook_items_task_id", table_name="playbook_items")
+    op.drop_table("playbook_items")
+    op.drop_table("playbooks")
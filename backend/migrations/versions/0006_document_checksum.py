@@ -0,0 +1,26 @@
+"""Store the SHA-256 of uploaded documents
+
+Revision ID: 0006_document_checksum
+Revises: 0005_onboarding_playbooks
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_document_checksum"
+down_revision = "0005_onboarding_playbooks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing documents keep a NULL checksum; it is computed for new uploads only
+    with op.batch_alter_table("documents") as batch_op:
+        batch_op.add_column(sa.Column("checksum", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("documents") as batch_op:
+        batch_op.drop_column("checksum")
@@ -0,0 +1,23 @@
+"""Index document checksums for blob reference counting
+
+Revision ID: 0007_document_blob_refs
+Revises: 0006_document_checksum
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0007_document_blob_refs"
+down_revision = "0006_document_checksum"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Deleting a document checks whether any other document still uses its blob
+    op.create_index("ix_documents_checksum", "documents", ["checksum"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_checksum", table_name="documents")
@@ -0,0 +1,48 @@
+"""Resumable upload sessions
+
+Revision ID: 0008_resumable_uploads
+Revises: 0007_document_blob_refs
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0008_resumable_uploads"
+down_revision = "0007_document_blob_refs"
+branch_labels = None
+depends_on = None
+
+# Reuses the enum type created by 0001_initial_schema
+document_type = postgresql.ENUM("AADHAR", "RESUME", "OTHER", name="documenttype", create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upload_sessions",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("employee_id", sa.String(), nullable=False),
+        sa.Column("document_type", document_type, nullable=False),
+        sa.Column("original_filename", sa.String(length=255), nullable=False),
+        sa.Column("mime_type", sa.String(length=100), nullable=True),
+        sa.Column("task_id", sa.String(), nullable=True),
+        sa.Column("total_size", sa.Integer(), nullable=False),
+        sa.Column("received_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["employee_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_upload_sessions_employee_id", "upload_sessions", ["employee_id"])
+    # Expired sessions are purged by expiry
+    op.create_index("ix_upload_sessions_expires_at", "upload_sessions", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_upload_sessions_expires_at", table_name="upload_sessions")
+    op.drop_index("ix_upload_sessions_employee_id", table_name="upload_sessions")
+    op.drop_table("upload_sessions")
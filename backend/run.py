@@ -5,9 +5,9 @@ import asyncio
 import uvicorn
 import os
 from app.main import app
-from app.database import create_db_and_tables, AsyncSessionLocal
+from app.database import verify_schema_revision, AsyncSessionLocal
 from app.core.enums import UserRole
-from app.auth import get_password_hash
+from app.auth import get_password_hash_async
 
 async def create_default_users():
     """Create default HR and employee users if they don't exist"""
@@ -23,30 +23,25 @@ async def create_default_users():
         if not hr_exists:
             print("Creating default users...")
             
-            # Create HR user
-            hr_user = UserModel(
-                name="John HR",
-                email="john.hr@company.com",
-                password_hash=get_password_hash("password123"),
-                role=UserRole.HR
-            )
-            session.add(hr_user)
-            
-            # Create sample employees
-            employees = [
-                ("Jane Employee", "jane.employee@company.com"),
-                ("Bob Employee", "bob.employee@company.com"),
-                ("Alice Employee", "alice.employee@company.com")
+            default_users = [
+                ("John HR", "john.hr@company.com", UserRole.HR),
+                ("Jane Employee", "jane.employee@company.com", UserRole.EMPLOYEE),
+                ("Bob Employee", "bob.employee@company.com", UserRole.EMPLOYEE),
+                ("Alice Employee", "alice.employee@company.com", UserRole.EMPLOYEE)
             ]
             
-            for name, email in employees:
-                employee = UserModel(
+            # Hash passwords concurrently on the password executor
+            password_hashes = await asyncio.gather(*[
+                get_password_hash_async("password123") for _ in default_users
+            ])
+            
+            for (name, email, role), password_hash in zip(default_users, password_hashes):
+                session.add(UserModel(
                     name=name,
                     email=email,
-                    password_hash=get_password_hash("password123"),
-                    role=UserRole.EMPLOYEE
-                )
-                session.add(employee)
+                    password_hash=password_hash,
+                    role=role
+                ))
             
             await session.commit()
             print("✅ Default users created!")
@@ -58,15 +53,15 @@ async def create_default_users():
 
 async def startup():
     """Initialize the application"""
-    print("Creating database tables...")
-    await create_db_and_tables()
-    print("Database tables created successfully!")
+    print("Checking database schema revision...")
+    await verify_schema_revision()
+    print("Database schema is up to date!")
     
     # Create default users if they don't exist
     await create_default_users()
 
 if __name__ == "__main__":
-    # Create database tables
+    # Verify schema and seed default users
     asyncio.run(startup())
     
     # Start the server
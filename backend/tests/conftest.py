@@ -0,0 +1,148 @@
+"""
+Shared test fixtures - services run against a throwaway SQLite database
+"""
+import asyncio
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, List, Tuple
+
+# Must be set before anything imports app.database
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="hivedesk-tests-")
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(_TEST_DB_DIR, "test.db")
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from app import models  # noqa: F401 - registers every table on the metadata
+from app.auth import TokenPrincipal, get_current_principal
+from app.database import AsyncSessionLocal, async_engine
+from app.models.task import TaskModel, EmployeeTaskModel
+from app.models.training import TrainingModuleModel, EmployeeTrainingModel
+from app.models.user import UserModel
+from app.core.enums import TaskStatus, TaskType, UserRole
+
+
+class QueryCounter:
+    """Records the SQL statements sent to the database"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    async def measure(self, call: Callable[[AsyncSession], Awaitable[Any]]) -> Tuple[Any, List[str]]:
+        """Run `call` in a fresh session and return its result with the statements it issued"""
+        async with AsyncSessionLocal() as session:
+            self.statements = []
+            result = await call(session)
+            return result, list(self.statements)
+
+
+@pytest.fixture
+def run():
+    """Run coroutines on one event loop, against a newly created schema"""
+    loop = asyncio.new_event_loop()
+
+    async def create_schema():
+        async with async_engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    loop.run_until_complete(create_schema())
+    yield loop.run_until_complete
+
+    # Pooled connections belong to this loop
+    loop.run_until_complete(async_engine.dispose())
+    loop.close()
+
+
+@pytest.fixture
+def query_counter():
+    """Count statements executed on the application engine"""
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+def seed_employees(run):
+    """
+    Returns a coroutine function adding `count` employees, each assigned
+    `tasks_per_employee` new tasks (every other one completed) and one
+    training module. Returns the ids of the new employees.
+    """
+    async def seed(count: int, tasks_per_employee: int) -> List[str]:
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as session:
+            hr = UserModel(
+                name="HR",
+                email=f"hr-{uuid.uuid4().hex}@example.com",
+                password_hash="x",
+                role=UserRole.HR
+            )
+            tasks = [
+                TaskModel(
+                    title=f"Task {n}",
+                    task_type=TaskType.READ if n % 2 == 0 else TaskType.UPLOAD,
+                    created_by=hr.id
+                )
+                for n in range(tasks_per_employee)
+            ]
+            module = TrainingModuleModel(title="Security", content="...", created_by=hr.id)
+            employees = [
+                UserModel(
+                    name=f"Employee {n}",
+                    email=f"employee-{uuid.uuid4().hex}@example.com",
+                    password_hash="x",
+                    role=UserRole.EMPLOYEE
+                )
+                for n in range(count)
+            ]
+            session.add_all([hr, module, *tasks, *employees])
+            await session.flush()
+
+            for employee in employees:
+                session.add_all([
+                    EmployeeTaskModel(
+                        employee_id=employee.id,
+                        task_id=task.id,
+                        assigned_by=hr.id,
+                        status=TaskStatus.COMPLETED if n % 2 == 0 else TaskStatus.PENDING,
+                        assigned_at=now - timedelta(days=3, seconds=n),
+                        completed_at=now if n % 2 == 0 else None
+                    )
+                    for n, task in enumerate(tasks)
+                ])
+                session.add(EmployeeTrainingModel(
+                    employee_id=employee.id,
+                    training_module_id=module.id,
+                    progress_percentage=50
+                ))
+            await session.commit()
+            return [employee.id for employee in employees]
+
+    return seed
+
+
+
+@pytest.fixture
+def api_client():
+    """
+    Returns a function creating an HTTP client for the application, authenticated as
+    the given principal. Use it inside `run` so requests share the test event loop.
+    """
+    from app.main import app
+
+    def client(principal: TokenPrincipal) -> httpx.AsyncClient:
+        app.dependency_overrides[get_current_principal] = lambda: principal
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    yield client
+    app.dependency_overrides.clear()
@@ -0,0 +1,115 @@
+"""
+Bulk user import from CSV and NDJSON uploads
+"""
+import io
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import select
+from starlette.datastructures import Headers, UploadFile
+
+from app import auth
+from app.core.enums import UserRole
+from app.database import AsyncSessionLocal
+from app.models.user import UserModel
+from app.services import auth_service
+from app.services.auth_service import AuthService
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    # Several batches per upload, so de-duplication has to carry across them
+    monkeypatch.setattr(auth_service, "BULK_IMPORT_BATCH_SIZE", 2)
+    yield
+    if auth._password_process_pool is not None:
+        auth._password_process_pool.shutdown(wait=True)
+        auth._password_process_pool = None
+
+
+def _upload(content: bytes, filename: str, content_type: str = "text/plain") -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(content), filename=filename, headers=Headers({"content-type": content_type})
+    )
+
+
+async def _import(upload: UploadFile, file_format=None):
+    async with AsyncSessionLocal() as session:
+        return await AuthService.bulk_register_users(session, upload, file_format)
+
+
+async def _register_existing(email: str):
+    async with AsyncSessionLocal() as session:
+        session.add(UserModel(name="Existing", email=email, password_hash="x", role=UserRole.EMPLOYEE))
+        await session.commit()
+
+
+async def _users_by_email(emails):
+    async with AsyncSessionLocal() as session:
+        users = (await session.execute(select(UserModel).where(UserModel.email.in_(emails)))).scalars().all()
+        return {user.email: user for user in users}
+
+
+def _statuses(report):
+    return [(row["row"], row["email"], row["status"]) for row in report["results"]]
+
+
+def test_csv_import_reports_every_row(run):
+    run(_register_existing("taken@example.com"))
+    csv_content = (
+        "\ufeffName,EMAIL,Password,role\r\n"
+        "Ann,ann@example.com,secret-1,\r\n"
+        "\r\n"
+        "Bob,bob@example.com,secret-2,hr\r\n"
+        "Ann again,ann@example.com,secret-3,\r\n"
+        "Taken,taken@example.com,secret-4,\r\n"
+        "Bad email,not-an-email,secret-5,\r\n"
+        "No password,nopass@example.com,,\r\n"
+    ).encode("utf-8")
+
+    report = run(_import(_upload(csv_content, "people.csv")))
+
+    assert _statuses(report) == [
+        (1, "ann@example.com", "created"),
+        (2, "bob@example.com", "created"),
+        (3, "ann@example.com", "duplicate"),
+        (4, "taken@example.com", "duplicate"),
+        (5, "not-an-email", "invalid"),
+        (6, "nopass@example.com", "invalid")
+    ]
+    assert (report["total"], report["created"], report["skipped"], report["failed"]) == (6, 2, 2, 2)
+    assert report["results"][2]["error"] == "Duplicate email in upload"
+    assert report["results"][3]["error"] == "Email already registered"
+
+    users = run(_users_by_email(["ann@example.com", "bob@example.com", "nopass@example.com"]))
+    assert set(users) == {"ann@example.com", "bob@example.com"}
+    assert users["ann@example.com"].role == UserRole.EMPLOYEE
+    assert users["bob@example.com"].role == UserRole.HR
+    assert users["ann@example.com"].id == report["results"][0]["user_id"]
+    assert auth.verify_password("secret-1", users["ann@example.com"].password_hash)
+
+
+def test_ndjson_import_rejects_malformed_lines(run):
+    lines = [
+        json.dumps({"name": "Cy", "email": "cy@example.com", "password": "pw"}),
+        "{not json",
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"name": "Di", "email": "di@example.com", "password": "pw", "role": "ceo"})
+    ]
+
+    report = run(_import(_upload("\n".join(lines).encode(), "people.jsonl")))
+
+    assert _statuses(report) == [
+        (1, "cy@example.com", "created"),
+        (2, None, "invalid"),
+        (3, None, "invalid"),
+        (4, "di@example.com", "invalid")
+    ]
+    assert report["results"][1]["error"].startswith("Malformed JSON")
+    assert report["results"][2]["error"] == "Row must be an object"
+
+
+def test_unsupported_format_is_rejected(run):
+    with pytest.raises(HTTPException) as rejected:
+        run(_import(_upload(b"<users/>", "people.xml"), file_format="xml"))
+    assert rejected.value.status_code == 400
@@ -0,0 +1,102 @@
+"""
+Content-addressed document storage: shared blobs and releasing them
+"""
+import io
+import os
+
+import pytest
+from sqlalchemy import delete
+from starlette.datastructures import Headers, UploadFile
+
+from app.database import AsyncSessionLocal
+from app.models.document import DocumentModel
+from app.services.document_service import DocumentService
+
+CONTENT = os.urandom(200000)
+
+
+def _upload_file(content: bytes, filename: str = "scan.pdf") -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(content),
+        filename=filename,
+        headers=Headers({"content-type": "application/pdf"})
+    )
+
+
+async def _upload(document_service: DocumentService, employee_id: str, content: bytes = CONTENT):
+    async with AsyncSessionLocal() as session:
+        return await document_service.upload_document(
+            session, _upload_file(content), "resume", employee_id
+        )
+
+
+async def _delete(document_id: str):
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            delete(DocumentModel)
+            .where(DocumentModel.id == document_id)
+            .returning(DocumentModel.file_path, DocumentModel.checksum)
+        )
+        removed = [(row.file_path, row.checksum) for row in result.all()]
+        await session.commit()
+        return removed
+
+
+@pytest.fixture
+def document_service(tmp_path):
+    return DocumentService(tmp_path)
+
+
+def test_identical_uploads_share_one_blob_until_the_last_is_deleted(run, seed_employees, document_service):
+    employee_id = run(seed_employees(1, 0))[0]
+    first = run(_upload(document_service, employee_id))
+    second = run(_upload(document_service, employee_id))
+    blob_path = document_service.blob_store.path_for(first.checksum)
+
+    assert first.checksum == second.checksum
+    assert first.file_path == second.file_path == str(blob_path)
+
+    assert run(document_service.release_files(run(_delete(first.id)))) == 0
+    assert blob_path.read_bytes() == CONTENT
+
+    assert run(document_service.release_files(run(_delete(second.id)))) == 1
+    assert not blob_path.exists()
+    # Nothing is left behind in the temp directory either
+    assert list(document_service.blob_store.temp_dir.iterdir()) == []
+
+
+@pytest.mark.parametrize("upload_after_check", [1, 2])
+def test_upload_racing_a_release_keeps_the_blob(
+    run, seed_employees, document_service, monkeypatch, upload_after_check
+):
+    """
+    The last document using a blob is deleted while the same bytes are uploaded
+    again. The upload commits right after the releaser's first reference check
+    (before the blob is moved aside) or right after its second one (after the
+    blob was already deleted); either way the new document keeps its content.
+    """
+    employee_id = run(seed_employees(1, 0))[0]
+    original = run(_upload(document_service, employee_id))
+    removed = run(_delete(original.id))
+
+    referenced_checksums = DocumentService._referenced_checksums
+    checks = []
+    racing_uploads = []
+
+    async def referenced_with_concurrent_upload(checksums):
+        result = await referenced_checksums(checksums)
+        checks.append(result)
+        if len(checks) == upload_after_check:
+            racing_uploads.append(await _upload(document_service, employee_id))
+        return result
+
+    monkeypatch.setattr(
+        DocumentService, "_referenced_checksums", staticmethod(referenced_with_concurrent_upload)
+    )
+    run(document_service.release_files(removed))
+
+    assert checks[0] == set()
+    assert len(racing_uploads) == 1
+    assert racing_uploads[0].checksum == original.checksum
+    with open(racing_uploads[0].file_path, "rb") as f:
+        assert f.read() == CONTENT
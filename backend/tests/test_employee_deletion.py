@@ -0,0 +1,76 @@
+"""
+Set-based employee deletion and removal of their stored files
+"""
+import io
+import os
+
+from sqlmodel import select
+from starlette.datastructures import Headers, UploadFile
+
+from app.database import AsyncSessionLocal
+from app.models.document import DocumentModel
+from app.models.task import EmployeeTaskModel
+from app.models.user import UserModel
+from app.services.document_service import DocumentService
+from app.services.employee_service import EmployeeService
+
+CONTENT = os.urandom(50000)
+
+
+async def _upload(document_service: DocumentService, employee_id: str):
+    async with AsyncSessionLocal() as session:
+        return await document_service.upload_document(
+            session,
+            UploadFile(
+                file=io.BytesIO(CONTENT),
+                filename="contract.pdf",
+                headers=Headers({"content-type": "application/pdf"})
+            ),
+            "other",
+            employee_id
+        )
+
+
+async def _delete_employees(employee_ids):
+    async with AsyncSessionLocal() as session:
+        return await EmployeeService.delete_employees(session, employee_ids)
+
+
+async def _remaining(employee_column, employee_ids):
+    async with AsyncSessionLocal() as session:
+        rows = await session.execute(select(employee_column).where(employee_column.in_(employee_ids)))
+        return rows.scalars().all()
+
+
+def test_delete_employees_removes_related_rows(run, seed_employees, tmp_path):
+    leaving_id, staying_id = run(seed_employees(2, 3))
+    document_service = DocumentService(tmp_path)
+    run(_upload(document_service, leaving_id))
+
+    result = run(_delete_employees([leaving_id, "missing-id"]))
+
+    assert result["deleted"] == [leaving_id]
+    assert result["not_found"] == ["missing-id"]
+    assert len(result["removed_documents"]) == 1
+    for employee_column in (UserModel.id, EmployeeTaskModel.employee_id, DocumentModel.employee_id):
+        assert run(_remaining(employee_column, [leaving_id])) == []
+    assert len(run(_remaining(EmployeeTaskModel.employee_id, [staying_id]))) == 3
+
+
+def test_blob_uploaded_again_before_removal_is_kept(run, seed_employees, tmp_path):
+    """The files to remove are decided when the background task runs, not at delete time"""
+    leaving_id, staying_id = run(seed_employees(2, 0))
+    document_service = DocumentService(tmp_path)
+    original = run(_upload(document_service, leaving_id))
+    blob_path = document_service.blob_store.path_for(original.checksum)
+
+    result = run(_delete_employees([leaving_id]))
+    # Same bytes uploaded between the delete and the background removal
+    run(_upload(document_service, staying_id))
+    run(document_service.release_files(result["removed_documents"]))
+
+    assert blob_path.read_bytes() == CONTENT
+
+    result = run(_delete_employees([staying_id]))
+    assert run(document_service.release_files(result["removed_documents"])) == 1
+    assert not blob_path.exists()
@@ -0,0 +1,66 @@
+"""
+Employee management view: one query, paged sections and conditional GET
+"""
+from app.auth import TokenPrincipal
+from app.core.enums import UserRole
+from app.database import AsyncSessionLocal
+from app.services.employee_service import EmployeeService
+
+HR = TokenPrincipal(id="hr-1", role=UserRole.HR)
+
+
+def test_details_cost_one_query_whatever_the_number_of_tasks(run, seed_employees, query_counter):
+    counts = []
+    for tasks_per_employee in (2, 30):
+        employee_id = run(seed_employees(1, tasks_per_employee))[0]
+        details, statements = run(query_counter.measure(
+            lambda session: EmployeeService.get_employee_details(session, employee_id, page_size=50)
+        ))
+        assert len(details["tasks"]) == tasks_per_employee
+        counts.append(len(statements))
+    assert counts == [1, 1]
+
+
+def test_task_section_pages_with_its_own_cursor(run, seed_employees):
+    employee_id = run(seed_employees(1, 5))[0]
+
+    async def all_tasks():
+        task_ids, cursor = [], None
+        async with AsyncSessionLocal() as session:
+            while True:
+                details = await EmployeeService.get_employee_details(
+                    session, employee_id, page_size=2, tasks_cursor=cursor
+                )
+                task_ids.extend(task["id"] for task in details["tasks"])
+                cursor = details["tasks_next_cursor"]
+                if cursor is None:
+                    return task_ids
+
+    task_ids = run(all_tasks())
+    assert len(task_ids) == len(set(task_ids)) == 5
+
+
+def test_manage_view_answers_304_until_the_employee_changes(run, seed_employees, api_client):
+    employee_id = run(seed_employees(1, 2))[0]
+
+    async def scenario():
+        async with api_client(HR) as client:
+            first = await client.get(f"/api/employees/{employee_id}")
+            etag = first.headers["etag"]
+            unchanged = await client.get(
+                f"/api/employees/{employee_id}", headers={"If-None-Match": f'"other", {etag}'}
+            )
+            await client.put(f"/api/employees/{employee_id}", json={"name": "Renamed"})
+            changed = await client.get(f"/api/employees/{employee_id}", headers={"If-None-Match": etag})
+            return first, unchanged, changed
+
+    first, unchanged, changed = run(scenario())
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == first.headers["etag"]
+    assert changed.status_code == 200
+    assert changed.json()["employee"]["name"] == "Renamed"
+    assert changed.headers["etag"] != first.headers["etag"]
@@ -0,0 +1,49 @@
+"""
+Query-count regression tests for the employee list, performance and dashboard aggregates
+"""
+from app.services.employee_service import EmployeeService
+from app.services.performance_service import PerformanceService
+
+
+def test_employee_aggregates_issue_a_fixed_number_of_queries(run, seed_employees, query_counter):
+    """5 or 50 employees, with few or many assignments, cost the same queries"""
+    counts = []
+    for new_employees, tasks_per_employee in ((5, 3), (45, 20)):
+        employee_id = run(seed_employees(new_employees, tasks_per_employee))[0]
+
+        employees, list_statements = run(query_counter.measure(
+            lambda session: EmployeeService.get_all_employees(session, page_size=50)
+        ))
+        performance, performance_statements = run(query_counter.measure(
+            lambda session: PerformanceService.get_employee_performance(session, employee_id)
+        ))
+        _, hr_dashboard_statements = run(query_counter.measure(
+            lambda session: PerformanceService.get_dashboard_metrics(session, "hr")
+        ))
+        employee_dashboard, employee_dashboard_statements = run(query_counter.measure(
+            lambda session: PerformanceService.get_dashboard_metrics(session, "employee", employee_id)
+        ))
+
+        # The aggregates still reflect every seeded assignment
+        assert len(employees["employees"]) == employees["total"]
+        assert all(row["total_tasks"] > 0 for row in employees["employees"])
+        assert performance["total_tasks"] == tasks_per_employee
+        assert performance["completed_tasks"] == (tasks_per_employee + 1) // 2
+        assert performance["total_training"] == 1
+        assert employee_dashboard["total_tasks"] == tasks_per_employee
+
+        counts.append({
+            "get_all_employees": len(list_statements),
+            "get_employee_performance": len(performance_statements),
+            "hr_dashboard": len(hr_dashboard_statements),
+            "employee_dashboard": len(employee_dashboard_statements)
+        })
+
+    assert counts[0] == counts[1]
+    # Page with its total; employee row, task and training aggregates; three counts; one aggregate
+    assert counts[0] == {
+        "get_all_employees": 1,
+        "get_employee_performance": 3,
+        "hr_dashboard": 3,
+        "employee_dashboard": 1
+    }
@@ -0,0 +1,149 @@
+"""
+Document downloads: byte ranges, conditional GET and zero-copy sending
+"""
+import asyncio
+import io
+import os
+from email.utils import formatdate
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from app.auth import TokenPrincipal
+from app.core.enums import UserRole
+from app.core.file_streaming import (
+    ZERO_COPY_SEND_EXTENSION,
+    FileRangeResponse,
+    RangeNotSatisfiableError,
+    parse_byte_range
+)
+from app.database import AsyncSessionLocal
+from app.routers import documents as documents_router
+from app.services.document_service import DocumentService
+
+CONTENT = os.urandom(200000)
+SIZE = len(CONTENT)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, SIZE - 1)),
+    ("bytes=-500", (SIZE - 500, SIZE - 1)),
+    ("bytes=-999999999", (0, SIZE - 1)),
+    ("bytes=190000-999999999", (190000, SIZE - 1)),
+    # Ignored, the whole file is sent
+    ("items=0-10", None),
+    ("bytes=0-10,20-30", None),
+    ("bytes=50-10", None),
+    ("bytes=abc-", None),
+    ("bytes=-", None)
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize("header", [f"bytes={SIZE}-", "bytes=-0"])
+def test_unsatisfiable_ranges(header):
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_byte_range(header, SIZE)
+
+
+def test_zero_copy_send_is_used_when_the_server_offers_it(tmp_path):
+    path = tmp_path / "blob"
+    path.write_bytes(CONTENT)
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    response = FileRangeResponse(str(path), (10, 19), 206, {"Content-Range": f"bytes 10-19/{SIZE}"})
+    asyncio.run(response(
+        {"type": "http", "method": "GET", "extensions": {ZERO_COPY_SEND_EXTENSION: {}}}, None, send
+    ))
+
+    start, body = messages
+    assert start["status"] == 206
+    assert (b"content-length", b"10") in start["headers"]
+    assert body["type"] == ZERO_COPY_SEND_EXTENSION
+    assert (body["offset"], body["count"]) == (10, 10)
+
+
+@pytest.fixture
+def stored_document(run, seed_employees, tmp_path, monkeypatch):
+    """An employee's document stored under a temporary upload directory"""
+    monkeypatch.setattr(documents_router, "UPLOAD_DIR", tmp_path)
+    employee_id = run(seed_employees(1, 0))[0]
+
+    async def upload():
+        async with AsyncSessionLocal() as session:
+            return await DocumentService(tmp_path).upload_document(
+                session,
+                UploadFile(
+                    file=io.BytesIO(CONTENT),
+                    filename="scan.pdf",
+                    headers=Headers({"content-type": "application/pdf"})
+                ),
+                "resume",
+                employee_id
+            )
+
+    return employee_id, run(upload())
+
+
+def test_content_endpoint_serves_ranges_and_validators(run, api_client, stored_document):
+    employee_id, document = stored_document
+    url = f"/api/documents/{document.id}/content"
+
+    async def scenario():
+        async with api_client(TokenPrincipal(id=employee_id, role=UserRole.EMPLOYEE)) as client:
+            full = await client.get(url)
+            responses = {
+                "range": await client.get(url, headers={"Range": "bytes=100-199"}),
+                "suffix": await client.get(url, headers={"Range": "bytes=-10"}),
+                "unsatisfiable": await client.get(url, headers={"Range": f"bytes={SIZE}-"}),
+                "stale_if_range": await client.get(
+                    url, headers={"Range": "bytes=0-9", "If-Range": '"outdated"'}
+                ),
+                "current_if_range": await client.get(
+                    url, headers={"Range": "bytes=0-9", "If-Range": full.headers["etag"]}
+                ),
+                "if_none_match": await client.get(url, headers={"If-None-Match": full.headers["etag"]}),
+                "if_modified_since": await client.get(
+                    url, headers={"If-Modified-Since": formatdate(usegmt=True)}
+                ),
+                "head": await client.head(url)
+            }
+        return full, responses
+
+    full, responses = run(scenario())
+
+    assert full.status_code == 200
+    assert full.content == CONTENT
+    assert full.headers["etag"] == f'"{document.checksum}"'
+    assert full.headers["accept-ranges"] == "bytes"
+
+    assert responses["range"].status_code == 206
+    assert responses["range"].content == CONTENT[100:200]
+    assert responses["range"].headers["content-range"] == f"bytes 100-199/{SIZE}"
+    assert responses["suffix"].content == CONTENT[-10:]
+    assert responses["unsatisfiable"].status_code == 416
+    assert responses["unsatisfiable"].headers["content-range"] == f"bytes */{SIZE}"
+    assert responses["stale_if_range"].status_code == 200
+    assert responses["stale_if_range"].content == CONTENT
+    assert responses["current_if_range"].status_code == 206
+    assert responses["if_none_match"].status_code == 304
+    assert responses["if_modified_since"].status_code == 304
+    assert responses["head"].status_code == 200
+    assert responses["head"].headers["content-length"] == str(SIZE)
+    assert responses["head"].content == b""
+
+
+def test_employees_cannot_download_other_employees_documents(run, api_client, stored_document):
+    _, document = stored_document
+
+    async def download():
+        async with api_client(TokenPrincipal(id="someone-else", role=UserRole.EMPLOYEE)) as client:
+            return await client.get(f"/api/documents/{document.id}/content")
+
+    assert run(download()).status_code == 404
@@ -0,0 +1,122 @@
+"""
+Keyset (cursor) pagination and list totals
+"""
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.core import pagination
+from app.core.enums import UserRole
+from app.database import AsyncSessionLocal
+from app.models.user import UserModel
+from app.services.employee_service import EmployeeService
+from app.services.task_service import TaskService
+
+
+async def _same_created_at(employee_ids):
+    # Every employee ties on created_at, so only the id orders them
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(UserModel).where(UserModel.id.in_(employee_ids)).values(created_at=datetime(2024, 1, 1))
+        )
+        await session.commit()
+
+
+async def _pages(page_size: int, cursor=None, limit=None):
+    pages = []
+    async with AsyncSessionLocal() as session:
+        while limit is None or len(pages) < limit:
+            page = await EmployeeService.get_all_employees(session, page_size=page_size, cursor=cursor)
+            pages.append(page)
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+    return pages
+
+
+async def _offset_page(page: int, page_size: int):
+    async with AsyncSessionLocal() as session:
+        return await EmployeeService.get_all_employees(session, page=page, page_size=page_size)
+
+
+def _ids(pages):
+    return [employee["id"] for page in pages for employee in page["employees"]]
+
+
+def test_cursor_pages_cover_tied_rows_once_in_key_order(run, seed_employees):
+    employee_ids = run(seed_employees(7, 0))
+    run(_same_created_at(employee_ids))
+
+    pages = run(_pages(page_size=3))
+
+    assert [len(page["employees"]) for page in pages] == [3, 3, 1]
+    assert _ids(pages) == sorted(employee_ids)
+    # The offset fallback returns the same order
+    offset_ids = _ids([run(_offset_page(page, 3)) for page in (1, 2, 3)])
+    assert offset_ids == _ids(pages)
+
+
+def test_cursor_is_stable_when_earlier_rows_are_added(run, seed_employees):
+    employee_ids = run(seed_employees(6, 0))
+    first_page = run(_pages(page_size=3, limit=1))[0]
+
+    async def add_earlier_employee():
+        async with AsyncSessionLocal() as session:
+            session.add(UserModel(
+                name="Early",
+                email="early@example.com",
+                password_hash="x",
+                role=UserRole.EMPLOYEE,
+                created_at=datetime(2000, 1, 1)
+            ))
+            await session.commit()
+
+    run(add_earlier_employee())
+    rest = run(_pages(page_size=3, cursor=first_page["next_cursor"]))
+
+    # An offset page 2 would now repeat the last row of page 1; the cursor does not
+    assert sorted(_ids([first_page]) + _ids(rest)) == sorted(employee_ids)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm90IGpzb24", "WzFd"])
+def test_malformed_cursor_is_a_bad_request(run, cursor):
+    with pytest.raises(HTTPException) as rejected:
+        run(_pages(page_size=3, cursor=cursor))
+    assert rejected.value.status_code == 400
+
+
+def test_totals_come_with_the_page_including_cursor_and_empty_pages(run, seed_employees, query_counter):
+    run(seed_employees(5, 0))
+    first_page = run(_pages(page_size=2, limit=1))[0]
+
+    second_page, statements = run(query_counter.measure(
+        lambda session: EmployeeService.get_all_employees(
+            session, page_size=2, cursor=first_page["next_cursor"]
+        )
+    ))
+    past_the_end = run(_offset_page(10, 2))
+
+    assert first_page["total"] == second_page["total"] == past_the_end["total"] == 5
+    assert len(statements) == 1
+    assert past_the_end["employees"] == []
+
+
+def test_approximate_total_is_a_cached_estimate(run, seed_employees, query_counter, monkeypatch):
+    monkeypatch.setattr(pagination, "approximate_counts", pagination.TTLCache(max_size=8, ttl_seconds=60))
+    run(seed_employees(1, 4))
+
+    async def task_page(session, approximate_total):
+        return await TaskService.get_all_tasks(session, page_size=2, approximate_total=approximate_total)
+
+    estimated, first_statements = run(query_counter.measure(lambda session: task_page(session, True)))
+    run(seed_employees(1, 3))
+    cached, cached_statements = run(query_counter.measure(lambda session: task_page(session, True)))
+    exact = run(query_counter.measure(lambda session: task_page(session, False)))[0]
+
+    assert estimated["total"] == 4 and estimated["total_is_approximate"]
+    # The estimate is reused for its TTL: no count query, and it may lag behind
+    assert cached["total"] == 4
+    assert len(cached_statements) == len(first_statements) - 1 == 1
+    assert exact["total"] == 7 and not exact["total_is_approximate"]
@@ -0,0 +1,82 @@
+"""
+Password hashing off the event loop, with admission control
+"""
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app import auth
+from app.core.executor import BoundedExecutor, ExecutorSaturatedError
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_executor_rejects_work_beyond_workers_plus_queue(loop):
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: "rejected")
+        # The loop is not blocked while the pool is busy
+        heartbeat = await asyncio.wait_for(asyncio.sleep(0, result="alive"), timeout=1)
+
+        release.set()
+        return heartbeat, await running, await queued, await executor.run(lambda: "after")
+
+    try:
+        assert loop.run_until_complete(scenario()) == ("alive", True, "queued", "after")
+    finally:
+        release.set()
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["pending"] == 0
+    assert stats["run_seconds"]["count"] == 3
+
+
+def test_saturated_password_executor_answers_503_with_retry_after(loop, monkeypatch):
+    saturated = BoundedExecutor("password-hash", max_workers=1, max_queue=0)
+    monkeypatch.setattr(auth, "password_executor", saturated)
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(saturated.run(release.wait))
+        await asyncio.sleep(0.05)
+        try:
+            await auth.verify_password_async("secret", "hash")
+        finally:
+            release.set()
+            await busy
+
+    try:
+        with pytest.raises(HTTPException) as rejected:
+            loop.run_until_complete(scenario())
+    finally:
+        saturated.shutdown()
+
+    assert rejected.value.status_code == 503
+    assert rejected.value.headers["Retry-After"] == str(auth.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+
+
+def test_hash_and_verify_round_trip(loop):
+    async def scenario():
+        hashed = await auth.get_password_hash_async("correct horse")
+        return (
+            await auth.verify_password_async("correct horse", hashed),
+            await auth.verify_password_async("wrong", hashed)
+        )
+
+    assert loop.run_until_complete(scenario()) == (True, False)
@@ -0,0 +1,123 @@
+"""
+Onboarding playbooks: creation checks and set-based application
+"""
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.core.enums import TaskType
+from app.database import AsyncSessionLocal
+from app.models.task import TaskModel, EmployeeTaskModel
+from app.models.training import EmployeeTrainingModel
+from app.schemas.playbook import PlaybookCreateSchema, PlaybookItemSchema
+from app.services.playbook_service import PlaybookService
+
+
+async def _create_tasks(count: int):
+    async with AsyncSessionLocal() as session:
+        tasks = [TaskModel(title=f"Playbook task {n}", task_type=TaskType.READ) for n in range(count)]
+        session.add_all(tasks)
+        await session.commit()
+        return [task.id for task in tasks]
+
+
+async def _training_module_of(employee_id: str) -> str:
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(
+            select(EmployeeTrainingModel.training_module_id)
+            .where(EmployeeTrainingModel.employee_id == employee_id)
+        )).scalar_one()
+
+
+async def _create_playbook(items, is_active: bool = True):
+    async with AsyncSessionLocal() as session:
+        return await PlaybookService.create_playbook(
+            session,
+            PlaybookCreateSchema(name="Engineering", is_active=is_active, items=items),
+            "hr-1"
+        )
+
+
+async def _fetch(playbook_id: str):
+    async with AsyncSessionLocal() as session:
+        return await PlaybookService.get_playbook(session, playbook_id)
+
+
+async def _apply(playbook_id: str, **targets):
+    async with AsyncSessionLocal() as session:
+        return await PlaybookService.apply_playbook(session, playbook_id, "hr-1", **targets)
+
+
+async def _assignment_counts(employee_id: str):
+    async with AsyncSessionLocal() as session:
+        tasks = await session.scalar(
+            select(func.count()).where(EmployeeTaskModel.employee_id == employee_id)
+        )
+        trainings = await session.scalar(
+            select(func.count()).where(EmployeeTrainingModel.employee_id == employee_id)
+        )
+        return tasks, trainings
+
+
+def test_items_need_exactly_one_target_and_must_exist(run):
+    with pytest.raises(ValidationError):
+        PlaybookItemSchema(task_id="a", training_module_id="b")
+    with pytest.raises(ValidationError):
+        PlaybookItemSchema()
+
+    with pytest.raises(HTTPException) as unknown:
+        run(_create_playbook([PlaybookItemSchema(task_id="missing-task")]))
+    assert unknown.value.status_code == 400
+    assert "missing-task" in unknown.value.detail
+
+
+def test_apply_assigns_everything_once_and_skips_what_employees_have(run, seed_employees):
+    first_id, second_id = run(seed_employees(2, 0))
+    task_ids = run(_create_tasks(2))
+    module_id = run(_training_module_of(first_id))
+    playbook = run(_create_playbook([
+        PlaybookItemSchema(task_id=task_ids[1]),
+        PlaybookItemSchema(training_module_id=module_id),
+        PlaybookItemSchema(task_id=task_ids[0])
+    ]))
+    assert [item["task_id"] for item in run(_fetch(playbook["id"]))["items"]] == [task_ids[1], None, task_ids[0]]
+
+    result = run(_apply(playbook["id"], employee_ids=[first_id, second_id, "missing-id"]))
+    again = run(_apply(playbook["id"], employee_ids=[first_id, second_id]))
+
+    assert result["employees"] == 2
+    assert result["tasks_assigned"] == 4
+    # Both employees already had the seeded training module
+    assert result["trainings_assigned"] == 0
+    assert result["not_found"] == ["missing-id"]
+    assert (again["tasks_assigned"], again["trainings_assigned"]) == (0, 0)
+    assert run(_assignment_counts(first_id)) == (2, 1)
+
+
+def test_apply_costs_the_same_queries_for_few_or_many_employees(run, seed_employees, query_counter):
+    task_ids = run(_create_tasks(3))
+    playbook = run(_create_playbook([PlaybookItemSchema(task_id=task_id) for task_id in task_ids]))
+
+    counts = []
+    for employees in (2, 25):
+        employee_ids = run(seed_employees(employees, 0))
+        result, statements = run(query_counter.measure(
+            lambda session: PlaybookService.apply_playbook(
+                session, playbook["id"], "hr-1", employee_ids=employee_ids
+            )
+        ))
+        assert result["tasks_assigned"] == employees * len(task_ids)
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+
+def test_inactive_playbook_cannot_be_applied(run, seed_employees):
+    employee_id = run(seed_employees(1, 0))[0]
+    task_ids = run(_create_tasks(1))
+    playbook = run(_create_playbook([PlaybookItemSchema(task_id=task_ids[0])], is_active=False))
+
+    with pytest.raises(HTTPException) as rejected:
+        run(_apply(playbook["id"], employee_ids=[employee_id]))
+    assert rejected.value.status_code == 400
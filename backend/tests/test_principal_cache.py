@@ -0,0 +1,44 @@
+"""
+Cached principals shared between requests
+"""
+import dataclasses
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import update
+
+from app.auth import CurrentUser, create_access_token, get_current_user, invalidate_cached_user, principal_cache
+from app.database import AsyncSessionLocal
+from app.models.user import UserModel
+from app.schemas.user import UserResponseSchema
+
+
+async def _current_user(user_id: str) -> CurrentUser:
+    token = create_access_token(data={"sub": user_id, "role": "employee"})
+    async with AsyncSessionLocal() as session:
+        return await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), session)
+
+
+async def _rename(user_id: str, name: str):
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(UserModel).where(UserModel.id == user_id).values(name=name))
+        await session.commit()
+
+
+def test_cached_user_is_an_immutable_snapshot(run, seed_employees):
+    employee_id = run(seed_employees(1, 0))[0]
+    principal_cache.invalidate(employee_id)
+
+    first = run(_current_user(employee_id))
+    second = run(_current_user(employee_id))
+
+    # The second request is served from the cache, and cannot alter what others see
+    assert second is first
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.name = "Changed by a request"
+    assert not hasattr(first, "password_hash")
+    assert UserResponseSchema.from_orm(first).id == employee_id
+
+    run(_rename(employee_id, "Renamed"))
+    invalidate_cached_user(employee_id)
+    assert run(_current_user(employee_id)).name == "Renamed"
@@ -0,0 +1,114 @@
+"""
+Read routing between the primary and a replica, with read-your-writes across workers
+"""
+import os
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from sqlalchemy import event, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+
+from app import database
+from app.auth import TokenPrincipal, get_current_principal
+from app.core.dependencies import ReadSessionDep, SessionDep
+from app.core.enums import UserRole
+from app.core.read_your_writes import LAST_WRITE_COOKIE, LastWriteCookieMiddleware
+from app.models.training import TrainingModuleModel
+
+
+@pytest.fixture
+def replica(run, tmp_path, monkeypatch):
+    """A second, empty SQLite database serving the read sessions; yields its engine"""
+    replica_engine = database.build_engine(
+        "sqlite+aiosqlite:///" + os.path.join(tmp_path, "replica.db")
+    )
+
+    async def create_schema():
+        async with replica_engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    run(create_schema())
+    monkeypatch.setattr(
+        database,
+        "AsyncReadSessionLocal",
+        sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    )
+    yield replica_engine
+    run(replica_engine.dispose())
+
+
+def _worker() -> FastAPI:
+    """One API process - workers share nothing but the databases"""
+    app = FastAPI()
+    app.add_middleware(LastWriteCookieMiddleware, window_seconds=database.READ_YOUR_WRITES_SECONDS)
+    app.dependency_overrides[get_current_principal] = lambda: TokenPrincipal(id="hr-1", role=UserRole.HR)
+
+    @app.post("/modules")
+    async def create_module(session: SessionDep):
+        session.add(TrainingModuleModel(title="Safety", content="..."))
+        await session.commit()
+
+    @app.get("/modules/missing")
+    async def missing_module(session: ReadSessionDep):
+        await session.execute(select(TrainingModuleModel.id))
+        raise HTTPException(status_code=404, detail="Training module not found")
+
+    @app.get("/modules/count")
+    async def count_modules(session: ReadSessionDep):
+        return (await session.execute(select(func.count(TrainingModuleModel.id)))).scalar_one()
+
+    return app
+
+
+def _client(app: FastAPI, cookies=None) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", cookies=cookies)
+
+
+def test_reads_follow_a_write_to_the_primary_on_any_worker(run, replica):
+    first_worker, second_worker = _worker(), _worker()
+
+    async def scenario():
+        async with _client(first_worker) as client:
+            # The replica has not seen the module yet
+            assert (await client.get("/modules/count")).json() == 0
+            assert LAST_WRITE_COOKIE not in client.cookies
+
+            await client.post("/modules")
+            assert LAST_WRITE_COOKIE in client.cookies
+            same_worker = (await client.get("/modules/count")).json()
+            cookies = dict(client.cookies)
+
+        # The next read lands on another worker, which never saw the write
+        async with _client(second_worker, cookies) as client:
+            other_worker = (await client.get("/modules/count")).json()
+        async with _client(second_worker) as client:
+            without_cookie = (await client.get("/modules/count")).json()
+        expired = {LAST_WRITE_COOKIE: str(time.time() - database.READ_YOUR_WRITES_SECONDS - 1)}
+        async with _client(second_worker, expired) as client:
+            after_window = (await client.get("/modules/count")).json()
+        return same_worker, other_worker, without_cookie, after_window
+
+    same_worker, other_worker, without_cookie, after_window = run(scenario())
+
+    assert same_worker == 1
+    assert other_worker == 1
+    assert without_cookie == 0
+    assert after_window == 0
+
+
+def test_read_session_is_released_when_the_request_fails(run, replica):
+    checked_out = []
+    event.listen(replica.sync_engine, "checkout", lambda *args: checked_out.append(1))
+    event.listen(replica.sync_engine, "checkin", lambda *args: checked_out.pop())
+
+    async def fail_twice():
+        async with _client(_worker()) as client:
+            return [(await client.get("/modules/missing")).status_code for _ in range(2)]
+
+    assert run(fail_twice()) == [404, 404]
+    # Both connections went back to the pool instead of waiting for garbage collection
+    assert checked_out == []
@@ -0,0 +1,62 @@
+"""
+Body size limits on routes that accept uploads
+"""
+import pytest
+from fastapi import APIRouter, FastAPI, File, Request, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.request_limits import body_size_limited_route
+
+LIMIT = 1024
+
+
+@pytest.fixture
+def upload_client():
+    received = []
+    router = APIRouter(route_class=body_size_limited_route(LIMIT))
+
+    @router.post("/form")
+    async def form_upload(file: UploadFile = File(...)):
+        content = await file.read()
+        received.append(len(content))
+        return {"size": len(content)}
+
+    @router.put("/raw")
+    async def raw_upload(request: Request):
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+        received.append(size)
+        return {"size": size}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app), received
+
+
+def _chunks(total: int, chunk_size: int = 256):
+    # A generator body is sent chunked, without Content-Length
+    for start in range(0, total, chunk_size):
+        yield b"x" * min(chunk_size, total - start)
+
+
+def test_bodies_within_the_limit_are_accepted(upload_client):
+    client, received = upload_client
+    assert client.post("/form", files={"file": ("a.txt", b"x" * 500)}).json() == {"size": 500}
+    assert client.put("/raw", content=_chunks(LIMIT)).json() == {"size": LIMIT}
+    assert received == [500, LIMIT]
+
+
+def test_declared_length_over_the_limit_is_rejected_before_the_handler(upload_client):
+    client, received = upload_client
+    response = client.post("/form", files={"file": ("a.txt", b"x" * (LIMIT + 1))})
+
+    assert response.status_code == 413
+    assert received == []
+
+
+def test_undeclared_length_is_cut_off_at_the_limit(upload_client):
+    client, received = upload_client
+
+    assert client.put("/raw", content=_chunks(LIMIT * 4)).status_code == 413
+    assert received == []
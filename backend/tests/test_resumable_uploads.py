@@ -0,0 +1,164 @@
+"""
+Resumable uploads: chunk offsets, resuming after a disconnect and expiry
+"""
+import hashlib
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from starlette.requests import ClientDisconnect
+
+from app.auth import TokenPrincipal
+from app.core.enums import UserRole
+from app.database import AsyncSessionLocal
+from app.models.document import UploadSessionModel
+from app.routers import documents as documents_router
+from app.services.document_service import DocumentService
+
+CONTENT = os.urandom(50000)
+SIZE = len(CONTENT)
+
+
+@pytest.fixture
+def employee(run, seed_employees, tmp_path, monkeypatch):
+    """An employee uploading into a temporary upload directory"""
+    monkeypatch.setattr(documents_router, "UPLOAD_DIR", tmp_path)
+    return TokenPrincipal(id=run(seed_employees(1, 0))[0], role=UserRole.EMPLOYEE)
+
+
+async def _start(client, size: int = SIZE) -> str:
+    response = await client.post("/api/documents/uploads", json={
+        "document_type": "resume",
+        "filename": "scan.pdf",
+        "size": size,
+        "mime_type": "application/pdf"
+    })
+    assert response.status_code == 201
+    assert response.json()["offset"] == 0
+    return response.json()["upload_id"]
+
+
+def test_chunks_must_start_at_the_current_offset(run, api_client, employee, tmp_path):
+    url = "/api/documents/uploads"
+
+    async def scenario():
+        async with api_client(employee) as client:
+            upload_id = await _start(client)
+            return upload_id, {
+                "first": await client.put(f"{url}/{upload_id}?offset=0", content=CONTENT[:20000]),
+                "replayed": await client.put(f"{url}/{upload_id}?offset=0", content=CONTENT[:20000]),
+                "skipping": await client.put(f"{url}/{upload_id}?offset=30000", content=CONTENT[30000:]),
+                "early_complete": await client.post(f"{url}/{upload_id}/complete"),
+                "state": await client.get(f"{url}/{upload_id}"),
+                "rest": await client.put(f"{url}/{upload_id}?offset=20000", content=CONTENT[20000:]),
+                "complete": await client.post(f"{url}/{upload_id}/complete"),
+                "after_complete": await client.get(f"{url}/{upload_id}")
+            }
+
+    upload_id, responses = run(scenario())
+
+    assert responses["first"].json()["offset"] == 20000
+    assert responses["replayed"].status_code == 409
+    assert responses["skipping"].status_code == 409
+    assert responses["early_complete"].status_code == 409
+    assert responses["state"].json()["offset"] == 20000
+    assert responses["state"].json()["size"] == SIZE
+    assert responses["rest"].json()["offset"] == SIZE
+    assert responses["complete"].status_code == 200
+    assert responses["complete"].json()["checksum"] == hashlib.sha256(CONTENT).hexdigest()
+    assert responses["complete"].json()["file_size"] == SIZE
+    assert responses["after_complete"].status_code == 404
+    # The temp file was moved into the blob store
+    assert not os.path.exists(DocumentService(tmp_path).upload_temp_paths([upload_id])[0])
+
+
+def test_chunks_past_the_declared_size_are_rejected(run, api_client, employee):
+    url = "/api/documents/uploads"
+
+    async def scenario():
+        async with api_client(employee) as client:
+            upload_id = await _start(client, size=100)
+            too_large = await client.put(f"{url}/{upload_id}?offset=0", content=b"x" * 101)
+            return too_large, await client.get(f"{url}/{upload_id}")
+
+    too_large, state = run(scenario())
+
+    assert too_large.status_code == 413
+    assert state.json()["offset"] == 0
+
+
+def test_bytes_received_before_a_disconnect_are_kept(run, api_client, employee, tmp_path):
+    async def interrupted_body():
+        yield CONTENT[:15000]
+        raise ClientDisconnect()
+
+    async def scenario():
+        async with api_client(employee) as client:
+            upload_id = await _start(client)
+        async with AsyncSessionLocal() as session:
+            state = await DocumentService(tmp_path).write_upload_chunk(
+                session, upload_id, employee.id, 0, interrupted_body()
+            )
+        async with api_client(employee) as client:
+            resumed = await client.get(f"/api/documents/uploads/{upload_id}")
+            offset = resumed.json()["offset"]
+            await client.put(f"/api/documents/uploads/{upload_id}?offset={offset}", content=CONTENT[offset:])
+            completed = await client.post(f"/api/documents/uploads/{upload_id}/complete")
+        return state, resumed, completed
+
+    state, resumed, completed = run(scenario())
+
+    assert state["offset"] == 15000
+    assert resumed.json()["offset"] == 15000
+    assert completed.json()["checksum"] == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_uploads_belong_to_their_employee(run, api_client, employee):
+    async def scenario():
+        async with api_client(employee) as client:
+            upload_id = await _start(client)
+        async with api_client(TokenPrincipal(id="someone-else", role=UserRole.EMPLOYEE)) as client:
+            return (
+                await client.get(f"/api/documents/uploads/{upload_id}"),
+                await client.put(f"/api/documents/uploads/{upload_id}?offset=0", content=b"x"),
+                await client.delete(f"/api/documents/uploads/{upload_id}")
+            )
+
+    assert [response.status_code for response in run(scenario())] == [404, 404, 404]
+
+
+def test_expired_uploads_are_unreachable_and_purged(run, api_client, employee, tmp_path):
+    async def expire(upload_id: str):
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(UploadSessionModel)
+                .where(UploadSessionModel.id == upload_id)
+                .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+            )
+            await session.commit()
+
+    async def scenario():
+        async with api_client(employee) as client:
+            upload_id = await _start(client)
+            await client.put(f"/api/documents/uploads/{upload_id}?offset=0", content=CONTENT[:1000])
+            await expire(upload_id)
+            responses = [
+                await client.get(f"/api/documents/uploads/{upload_id}"),
+                await client.put(f"/api/documents/uploads/{upload_id}?offset=1000", content=CONTENT[1000:]),
+                await client.post(f"/api/documents/uploads/{upload_id}/complete")
+            ]
+            temp_path = DocumentService(tmp_path).upload_temp_paths([upload_id])[0]
+            kept_until_purged = os.path.exists(temp_path)
+            # Starting another upload cleans up the abandoned one
+            await _start(client)
+        async with AsyncSessionLocal() as session:
+            remaining = await session.get(UploadSessionModel, upload_id)
+        return responses, kept_until_purged, os.path.exists(temp_path), remaining
+
+    responses, kept_until_purged, still_exists, remaining = run(scenario())
+
+    assert [response.status_code for response in responses] == [404, 404, 404]
+    assert kept_until_purged
+    assert not still_exists
+    assert remaining is None
@@ -0,0 +1,135 @@
+"""
+Signed, expiring download URLs
+"""
+import io
+import time
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from app.auth import TokenPrincipal
+from app.core.enums import UserRole
+from app.core.signed_urls import UrlSigner
+from app.database import AsyncSessionLocal
+from app.routers import documents as documents_router
+from app.routers import files as files_router
+from app.services.document_service import DocumentService
+
+CONTENT = b"%PDF-1.4 signed download"
+VALUES = ["checksum", "scan.pdf", "application/pdf"]
+
+
+def test_expiry_is_rounded_so_urls_are_stable_within_a_ttl():
+    signer = UrlSigner("secret", 300, "downloads")
+
+    assert signer.expiry(now=1000) == signer.expiry(now=1199) == 1500
+    assert signer.expiry(now=1200) == 1800
+    for now in (1000, 1199, 1200, 1499):
+        assert 300 < signer.expiry(now=now) - now <= 600
+
+
+def test_signatures_expire():
+    signer = UrlSigner("secret", 300, "downloads")
+    signature = signer.sign(VALUES, 1500)
+
+    assert signer.verify(VALUES, 1500, signature, now=1499)
+    assert signer.verify(VALUES, 1500, signature, now=1500)
+    assert not signer.verify(VALUES, 1500, signature, now=1501)
+
+
+@pytest.mark.parametrize("values, expires, signer", [
+    (["checksum", "other.pdf", "application/pdf"], 1500, UrlSigner("secret", 300, "downloads")),
+    (["checksum", "scan.pdf", "text/html"], 1500, UrlSigner("secret", 300, "downloads")),
+    (["checksum", "scan.pdf", None], 1500, UrlSigner("secret", 300, "downloads")),
+    (VALUES, 1800, UrlSigner("secret", 300, "downloads")),
+    (VALUES, 1500, UrlSigner("another secret", 300, "downloads")),
+    (VALUES, 1500, UrlSigner("secret", 300, "avatars"))
+])
+def test_tampered_urls_are_rejected(values, expires, signer):
+    signature = UrlSigner("secret", 300, "downloads").sign(VALUES, 1500)
+
+    assert not signer.verify(values, expires, signature, now=1000)
+
+
+@pytest.fixture
+def signed_url(run, seed_employees, tmp_path, monkeypatch):
+    """A signed URL for an employee's document stored under a temporary upload directory"""
+    monkeypatch.setattr(documents_router, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(files_router, "UPLOAD_DIR", tmp_path)
+    employee_id = run(seed_employees(1, 0))[0]
+
+    async def upload():
+        async with AsyncSessionLocal() as session:
+            return await DocumentService(tmp_path).upload_document(
+                session,
+                UploadFile(
+                    file=io.BytesIO(CONTENT),
+                    filename="scan.pdf",
+                    headers=Headers({"content-type": "application/pdf"})
+                ),
+                "resume",
+                employee_id
+            )
+
+    document = run(upload())
+    return document, DocumentService.signed_download_url(document.checksum, "scan.pdf", "application/pdf")
+
+
+def _with_params(url: str, **changes) -> str:
+    parts = urlsplit(url)
+    params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+    params.update(changes)
+    return f"{parts.path}?{urlencode(params)}"
+
+
+def _get_all(run, api_client, urls, **kwargs):
+    async def scenario():
+        # Any caller may follow a signed URL; the principal is never consulted
+        async with api_client(TokenPrincipal(id="anyone", role=UserRole.EMPLOYEE)) as client:
+            return [await client.get(url, **kwargs) for url in urls]
+
+    return run(scenario())
+
+
+def test_signed_url_serves_the_document(run, api_client, signed_url):
+    document, url = signed_url
+
+    response = _get_all(run, api_client, [url])[0]
+    expires = int(parse_qs(urlsplit(url).query)["expires"][0])
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["content-type"].startswith("application/pdf")
+    assert response.headers["etag"] == f'"{document.checksum}"'
+    cache_control = response.headers["cache-control"]
+    assert cache_control.startswith("private, max-age=")
+    assert 0 < int(cache_control.rsplit("=", 1)[1]) <= expires - int(time.time()) + 1
+
+    not_modified = _get_all(run, api_client, [url], headers={"If-None-Match": response.headers["etag"]})[0]
+    assert not_modified.status_code == 304
+
+
+def test_tampered_or_expired_signed_urls_are_forbidden(run, api_client, signed_url):
+    document, url = signed_url
+    past = int(time.time()) - 10
+    expired = _with_params(
+        url,
+        expires=str(past),
+        sig=files_router.download_url_signer.sign([document.checksum, "scan.pdf", "application/pdf"], past)
+    )
+    signature = parse_qs(urlsplit(url).query)["sig"][0]
+    other_checksum = url.replace(document.checksum, "0" * 64)
+    malformed_checksum = url.replace(document.checksum, document.checksum.upper())
+
+    responses = _get_all(run, api_client, [
+        _with_params(url, sig=("B" if signature[0] == "A" else "A") + signature[1:]),
+        _with_params(url, name="invoice.pdf"),
+        _with_params(url, type="text/html"),
+        _with_params(url, expires=str(past + 10 ** 6)),
+        expired,
+        other_checksum,
+        malformed_checksum
+    ])
+
+    assert [response.status_code for response in responses] == [403] * len(responses)
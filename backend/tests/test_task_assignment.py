@@ -0,0 +1,102 @@
+"""
+Assigning a task to one or many users
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlmodel import select
+
+from app.core.enums import TaskType, UserRole
+from app.database import AsyncSessionLocal
+from app.models.task import TaskModel, EmployeeTaskModel
+from app.models.user import UserModel
+from app.services.task_service import TaskService
+
+
+async def _create_task() -> str:
+    async with AsyncSessionLocal() as session:
+        task = TaskModel(title="Read the handbook", task_type=TaskType.READ)
+        session.add(task)
+        await session.commit()
+        return task.id
+
+
+async def _hr_id() -> str:
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(
+            select(UserModel.id).where(UserModel.role == UserRole.HR).limit(1)
+        )).scalar_one()
+
+
+async def _deactivate(user_id: str):
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(UserModel).where(UserModel.id == user_id).values(is_active=False))
+        await session.commit()
+
+
+async def _assign_one(task_id: str, employee_id: str, assigned_by: str) -> str:
+    async with AsyncSessionLocal() as session:
+        return await TaskService.assign_task_to_employee(session, employee_id, task_id, assigned_by)
+
+
+async def _assign_many(task_id: str, assigned_by: str, **targets):
+    async with AsyncSessionLocal() as session:
+        return await TaskService.assign_task_to_employees(session, task_id, assigned_by, **targets)
+
+
+async def _assignees(task_id: str):
+    async with AsyncSessionLocal() as session:
+        return set((await session.execute(
+            select(EmployeeTaskModel.employee_id).where(EmployeeTaskModel.task_id == task_id)
+        )).scalars().all())
+
+
+def test_single_assignment_keeps_the_baseline_rules(run, seed_employees):
+    employee_id = run(seed_employees(1, 0))[0]
+    hr_id = run(_hr_id())
+    task_id = run(_create_task())
+
+    assert run(_assign_one(task_id, employee_id, hr_id))
+    # Any account could always be given a task, not only employees
+    assert run(_assign_one(task_id, hr_id, hr_id))
+
+    with pytest.raises(HTTPException) as duplicate:
+        run(_assign_one(task_id, employee_id, hr_id))
+    assert duplicate.value.status_code == 400
+    with pytest.raises(HTTPException) as unknown:
+        run(_assign_one(task_id, "missing-id", hr_id))
+    assert unknown.value.status_code == 404
+
+    assert run(_assignees(task_id)) == {employee_id, hr_id}
+
+
+def test_bulk_assignment_reports_each_listed_id(run, seed_employees):
+    first_id, second_id = run(seed_employees(2, 0))
+    hr_id = run(_hr_id())
+    task_id = run(_create_task())
+    run(_assign_one(task_id, first_id, hr_id))
+
+    result = run(_assign_many(
+        task_id, hr_id, employee_ids=[first_id, second_id, hr_id, "missing-id", second_id]
+    ))
+
+    assert result["assigned"] == [second_id, hr_id]
+    assert result["already_assigned"] == [first_id]
+    assert result["not_found"] == ["missing-id"]
+    assert set(result["assignment_ids"]) == {second_id, hr_id}
+    assert run(_assignees(task_id)) == {first_id, second_id, hr_id}
+
+
+def test_bulk_assignment_to_all_active_skips_inactive_users_and_hr(run, seed_employees):
+    active_id, inactive_id = run(seed_employees(2, 0))
+    hr_id = run(_hr_id())
+    task_id = run(_create_task())
+    run(_deactivate(inactive_id))
+
+    result = run(_assign_many(task_id, hr_id, all_active=True))
+    again = run(_assign_many(task_id, hr_id, all_active=True))
+
+    assert result["assigned"] == [active_id]
+    assert again["assigned"] == []
+    assert again["already_assigned"] == [active_id]
+    assert run(_assignees(task_id)) == {active_id}
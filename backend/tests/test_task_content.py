@@ -0,0 +1,70 @@
+"""
+Heavy content columns: left out of lists, served by detail endpoints with an ETag
+"""
+import re
+
+from app.auth import TokenPrincipal
+from app.core.enums import TaskType, UserRole
+from app.database import AsyncSessionLocal
+from app.models.task import TaskModel
+from app.services.task_service import TaskService
+
+HR = TokenPrincipal(id="hr-1", role=UserRole.HR)
+CONTENT = "Handbook chapter. " * 5000
+CONTENT_COLUMN = re.compile(r"\.content\b")
+
+
+async def _create_task() -> str:
+    async with AsyncSessionLocal() as session:
+        task = TaskModel(title="Read the handbook", task_type=TaskType.READ, content=CONTENT)
+        session.add(task)
+        await session.commit()
+        return task.id
+
+
+def test_task_list_does_not_load_content(run, query_counter):
+    run(_create_task())
+
+    page, statements = run(query_counter.measure(lambda session: TaskService.get_all_tasks(session)))
+
+    assert "content" not in page["tasks"][0]
+    assert not [statement for statement in statements if CONTENT_COLUMN.search(statement)]
+
+
+def test_task_detail_answers_304_without_reading_content(run, api_client, query_counter):
+    task_id = run(_create_task())
+
+    async def scenario():
+        async with api_client(HR) as client:
+            query_counter.statements = []
+            first = await client.get(f"/api/tasks/{task_id}")
+            detail_statements = list(query_counter.statements)
+            etag = first.headers["etag"]
+            query_counter.statements = []
+            unchanged = await client.get(f"/api/tasks/{task_id}", headers={"If-None-Match": etag})
+            revalidation_statements = list(query_counter.statements)
+            await client.put(f"/api/tasks/{task_id}", json={"title": "Read the new handbook"})
+            changed = await client.get(f"/api/tasks/{task_id}", headers={"If-None-Match": etag})
+            return first, detail_statements, unchanged, revalidation_statements, changed
+
+    first, detail_statements, unchanged, revalidation_statements, changed = run(scenario())
+
+    assert first.status_code == 200
+    assert first.json()["content"] == CONTENT
+    assert [statement for statement in detail_statements if CONTENT_COLUMN.search(statement)]
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert revalidation_statements
+    assert not [statement for statement in revalidation_statements if CONTENT_COLUMN.search(statement)]
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+
+
+def test_task_detail_is_hidden_from_employees_it_is_not_assigned_to(run, api_client):
+    task_id = run(_create_task())
+
+    async def get_as_employee():
+        async with api_client(TokenPrincipal(id="employee-1", role=UserRole.EMPLOYEE)) as client:
+            return await client.get(f"/api/tasks/{task_id}")
+
+    assert run(get_as_employee()).status_code == 404
@@ -0,0 +1,48 @@
+"""
+Query-count regression tests for the employee task list
+"""
+import re
+
+from app.core.enums import TaskStatus, TaskType
+from app.services.task_service import TaskService
+
+# A task loaded on its own rather than joined into the assignment query
+PER_ROW_TASK_SELECT = re.compile(r"\bFROM tasks\b", re.IGNORECASE)
+
+FILTERS = {
+    "unfiltered": {},
+    "status": {"task_status": TaskStatus.PENDING},
+    "task_type": {"task_type": TaskType.READ},
+    "status_and_task_type": {"task_status": TaskStatus.COMPLETED, "task_type": TaskType.READ}
+}
+
+
+def test_employee_task_page_issues_a_fixed_number_of_queries(run, seed_employees, query_counter):
+    """A page of 5 or 50 assignments costs the same queries, with or without filters"""
+    counts = []
+    for tasks_per_employee in (5, 50):
+        employee_id = run(seed_employees(1, tasks_per_employee))[0]
+
+        page_counts = {}
+        for name, filters in FILTERS.items():
+            page, statements = run(query_counter.measure(
+                lambda session: TaskService.get_employee_tasks(
+                    session, employee_id, page_size=50, **filters
+                )
+            ))
+
+            assert not [st for st in statements if PER_ROW_TASK_SELECT.search(st)]
+            assert len(page["tasks"]) == page["total"]
+            if not filters:
+                assert page["total"] == tasks_per_employee
+            if "task_status" in filters:
+                assert {task["status"] for task in page["tasks"]} == {filters["task_status"].value}
+            if "task_type" in filters:
+                assert {task["task_type"] for task in page["tasks"]} == {filters["task_type"].value}
+            page_counts[name] = len(statements)
+
+        counts.append(page_counts)
+
+    assert counts[0] == counts[1]
+    # The page and its total come from one joined query
+    assert set(counts[0].values()) == {1}
@@ -0,0 +1,101 @@
+"""
+Verified JWT payload cache
+"""
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app import auth
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count real signature checks; start from an empty cache"""
+    calls = []
+    decode = auth.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    auth.token_cache.clear()
+    yield calls
+    auth.token_cache.clear()
+
+
+def test_hot_token_is_decoded_once(decode_calls):
+    token = auth.create_access_token(data={"sub": "user-1", "role": "hr"})
+
+    first = auth.verify_token(token)
+    second = auth.verify_token(token)
+
+    assert first == second
+    assert first["sub"] == "user-1"
+    assert decode_calls == [token]
+
+
+def test_tampered_and_expired_tokens_are_never_served_from_cache(decode_calls):
+    token = auth.create_access_token(data={"sub": "user-1", "role": "hr"})
+    auth.verify_token(token)
+    header, payload, signature = token.split(".")
+    tampered = ".".join([header, payload, signature[::-1]])
+    expired = auth.create_access_token(data={"sub": "user-1"}, expires_delta=timedelta(seconds=-5))
+
+    for bad_token in (tampered, expired, expired):
+        with pytest.raises(HTTPException) as rejected:
+            auth.verify_token(bad_token)
+        assert rejected.value.status_code == 401
+    # Each failed attempt was checked again, not answered from the cache
+    assert decode_calls == [token, tampered, expired, expired]
+
+
+def test_cached_payload_still_goes_through_revocation(decode_calls):
+    token = auth.create_access_token(data={"sub": "user-1", "role": "hr"})
+    payload = auth.verify_token(token)
+    assert auth._get_token_subject(payload) == "user-1"
+
+    auth.revocation_list.revoke_token(payload["jti"], payload["exp"])
+    with pytest.raises(HTTPException):
+        auth._get_token_subject(auth.verify_token(token))
+    assert len(decode_calls) == 1
+
+
+def test_entries_expire_with_the_shorter_of_cache_and_token_lifetime(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    ttl_cache = TTLCache(max_size=2, ttl_seconds=60)
+
+    ttl_cache.set("long-lived", 1, ttl_seconds=3600)
+    ttl_cache.set("short-lived", 2, ttl_seconds=5)
+    ttl_cache.set("already-expired", 3, ttl_seconds=-1)
+
+    clock.now += 10
+    assert ttl_cache.get("short-lived") is None
+    assert ttl_cache.get("long-lived") == 1
+    assert ttl_cache.get("already-expired") is None
+    clock.now += 60
+    assert ttl_cache.get("long-lived") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    ttl_cache = TTLCache(max_size=2, ttl_seconds=60)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.get("a")
+    ttl_cache.set("c", 3)
+
+    assert ttl_cache.get("b") is None
+    assert (ttl_cache.get("a"), ttl_cache.get("c")) == (1, 3)
+    assert ttl_cache.stats()["evictions"] == 1
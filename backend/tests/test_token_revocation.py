@@ -0,0 +1,71 @@
+"""
+User-wide token revocations must survive restarts and reach every worker
+"""
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import revocation_list
+from app.database import AsyncSessionLocal
+from app.models.user import UserModel
+from app.schemas.user import UserUpdateSchema
+from app.services.auth_service import AuthService
+from app.services.employee_service import EmployeeService
+
+
+async def _sync_as_fresh_worker():
+    # A new process starts with an empty list and loads everything from the database
+    revocation_list.load([], replace=True)
+    async with AsyncSessionLocal() as session:
+        await AuthService.sync_revoked_tokens(session)
+
+
+def test_deactivated_and_deleted_users_stay_revoked_after_sync(run, seed_employees):
+    deactivated_id, deleted_id, active_id = run(seed_employees(3, 1))
+    issued_before = int(time.time()) - 60
+
+    async def revoke():
+        async with AsyncSessionLocal() as session:
+            await EmployeeService.update_employee(
+                session, deactivated_id, UserUpdateSchema(is_active=False)
+            )
+        async with AsyncSessionLocal() as session:
+            await EmployeeService.delete_employees(session, [deleted_id])
+
+    run(revoke())
+    run(_sync_as_fresh_worker())
+
+    assert revocation_list.is_revoked({"sub": deactivated_id, "iat": issued_before})
+    assert revocation_list.is_revoked({"sub": deleted_id, "iat": issued_before})
+    assert not revocation_list.is_revoked({"sub": active_id, "iat": issued_before})
+    # Tokens issued after the revocation (e.g. once reactivated) are accepted
+    assert not revocation_list.is_revoked({"sub": deactivated_id, "iat": int(time.time()) + 5})
+
+
+def test_refresh_token_can_only_be_exchanged_once(run, seed_employees):
+    employee_id = run(seed_employees(1, 0))[0]
+
+    async def issue():
+        async with AsyncSessionLocal() as session:
+            return AuthService._issue_tokens(await session.get(UserModel, employee_id))
+
+    async def refresh(refresh_token):
+        async with AsyncSessionLocal() as session:
+            return await AuthService.refresh_tokens(session, refresh_token)
+
+    _, refresh_token = run(issue())
+    access_token, rotated_refresh_token = run(refresh(refresh_token))
+    assert access_token and rotated_refresh_token != refresh_token
+
+    with pytest.raises(HTTPException) as replay:
+        run(refresh(refresh_token))
+    assert replay.value.status_code == 401
+
+    # A worker that has not synced the revocation yet still finds it in the database
+    revocation_list.load([], replace=True)
+    with pytest.raises(HTTPException) as other_worker_replay:
+        run(refresh(refresh_token))
+    assert other_worker_replay.value.status_code == 401
+    # ... and the rotated token keeps working there
+    run(refresh(rotated_refresh_token))
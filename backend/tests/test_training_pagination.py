@@ -0,0 +1,74 @@
+"""
+Cursor pages over an employee's training modules sorted by progress
+"""
+from datetime import datetime
+
+import pytest
+
+from app.core.pagination import encode_cursor, seek_after
+from app.database import AsyncSessionLocal
+from app.models.training import TrainingModuleModel, EmployeeTrainingModel
+from app.services.training_service import TrainingService
+
+# Progress per extra module; None means not started (no progress row)
+PROGRESS = [50, None, 20, 50, None, 20, 50, 100, None, 50]
+
+
+async def _add_modules(employee_id: str):
+    created_at = datetime(2024, 1, 1)
+    async with AsyncSessionLocal() as session:
+        for n, progress in enumerate(PROGRESS):
+            # Pairs of modules share created_at, so ties go all the way down to the id
+            module = TrainingModuleModel(
+                title=f"Module {n}", content="...", created_at=created_at.replace(day=1 + n // 2)
+            )
+            session.add(module)
+            await session.flush()
+            if progress is not None:
+                session.add(EmployeeTrainingModel(
+                    employee_id=employee_id,
+                    training_module_id=module.id,
+                    progress_percentage=progress
+                ))
+        await session.commit()
+
+
+async def _all_pages(employee_id: str, page_size: int):
+    modules, cursor = [], None
+    async with AsyncSessionLocal() as session:
+        while True:
+            page = await TrainingService.get_all_training_modules(
+                session,
+                page_size=page_size,
+                employee_id=employee_id,
+                cursor=cursor,
+                sort_by="progress"
+            )
+            modules.extend(page["training_modules"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return modules, page["total"]
+
+
+@pytest.mark.parametrize("page_size", [1, 3, 4])
+def test_progress_pages_walk_tied_values_without_gaps_or_repeats(run, seed_employees, page_size):
+    employee_id = run(seed_employees(1, 0))[0]
+    run(_add_modules(employee_id))
+
+    modules, total = run(_all_pages(employee_id, page_size))
+    expected, _ = run(_all_pages(employee_id, 100))
+
+    # The fixture's module (progress 50) plus the extra ones
+    assert total == len(PROGRESS) + 1
+    assert len(expected) == total
+    assert [module["id"] for module in modules] == [module["id"] for module in expected]
+    assert len({module["id"] for module in modules}) == total
+    progress = [module["progress"]["progress_percentage"] for module in modules]
+    assert progress == sorted(progress)
+    assert progress.count(0) == 3
+
+
+def test_seek_after_rejects_descending_keys():
+    cursor = encode_cursor([1])
+    with pytest.raises(ValueError):
+        seek_after((TrainingModuleModel.created_at.desc(),), cursor)
@@ -0,0 +1,51 @@
+"""
+Training progress buffer flushes
+"""
+from sqlalchemy import update
+from sqlmodel import select
+
+from app.database import AsyncSessionLocal
+from app.models.training import TrainingModuleModel, EmployeeTrainingModel
+from app.services.training_progress_buffer import TrainingProgressBuffer
+
+
+def test_flush_drops_progress_for_deactivated_modules(run, seed_employees):
+    employee_id = run(seed_employees(1, 1))[0]
+    buffer = TrainingProgressBuffer(AsyncSessionLocal, flush_interval_seconds=60, max_pending=100)
+
+    async def create_modules():
+        async with AsyncSessionLocal() as session:
+            active = TrainingModuleModel(title="Active", content="...")
+            retired = TrainingModuleModel(title="Retired", content="...")
+            session.add_all([active, retired])
+            await session.commit()
+            return active.id, retired.id
+
+    async def deactivate(module_id):
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(TrainingModuleModel)
+                .where(TrainingModuleModel.id == module_id)
+                .values(is_active=False)
+            )
+            await session.commit()
+
+    async def stored_progress():
+        async with AsyncSessionLocal() as session:
+            rows = await session.execute(
+                select(EmployeeTrainingModel.training_module_id, EmployeeTrainingModel.progress_percentage)
+                .where(EmployeeTrainingModel.employee_id == employee_id)
+            )
+            return dict(rows.all())
+
+    active_id, retired_id = run(create_modules())
+    # Buffered while the module was still offered
+    run(buffer.record(employee_id, active_id, 40))
+    run(buffer.record(employee_id, retired_id, 40))
+    run(deactivate(retired_id))
+
+    assert run(buffer.flush()) == 1
+    assert buffer.rows_dropped == 1
+    progress = run(stored_progress())
+    assert progress[active_id] == 40
+    assert retired_id not in progress